@@ -0,0 +1,103 @@
+import time
+
+import math
+
+from raidensim.network.annulus import Annulus
+from raidensim.network.config import NetworkConfiguration
+from raidensim.network.dist import BetaDistribution, ConstantDistribution
+from raidensim.network.hyperbolic_disk import HyperbolicDisk
+from raidensim.network.lattice import WovenLattice
+from raidensim.network.network import Network
+from raidensim.strategy.creation.join_strategy import (
+    FullAnnulusJoinStrategy,
+    RaidenLatticeJoinStrategy,
+    HyperbolicDiskJoinStrategy
+)
+from raidensim.strategy.position_strategy import (
+    AnnulusPositionStrategy,
+    LatticePositionStrategy,
+    HyperbolicPositionStrategy
+)
+
+# =================================================================================================
+# Number of nodes joined by each build.
+NUM_NODES = 100000
+MAX_ID = 2**32
+# =================================================================================================
+
+# =================================================================================================
+# Smallest annulus and disk that fit NUM_NODES.
+ANNULUS_MAX_RING = next(r for r in range(2, 64) if 2 ** (r + 1) - 2 ** (r // 2) >= NUM_NODES)
+HYPERBOLIC_DISK_MAX_RING = next(r for r in range(64) if 2 ** (r + 1) - 1 >= NUM_NODES)
+HYPERBOLIC_DISK_RADIUS = 40
+WEAVE_BASE_FACTOR = 2
+# =================================================================================================
+
+
+def annulus_config() -> NetworkConfiguration:
+    annulus = Annulus(ANNULUS_MAX_RING)
+    return NetworkConfiguration(
+        num_nodes=NUM_NODES,
+        max_id=MAX_ID,
+        fullness_dist=ConstantDistribution(1),
+        position_strategy=AnnulusPositionStrategy(annulus),
+        join_strategy=FullAnnulusJoinStrategy(annulus)
+    )
+
+
+def lattice_config() -> NetworkConfiguration:
+    lattice = WovenLattice(
+        num_dims=2,
+        weave_base_factor=WEAVE_BASE_FACTOR,
+        min_order=1,
+        max_order=max(1, int(math.log(NUM_NODES, 2 * WEAVE_BASE_FACTOR)))
+    )
+    return NetworkConfiguration(
+        num_nodes=NUM_NODES,
+        max_id=MAX_ID,
+        fullness_dist=BetaDistribution(0.5, 2),
+        position_strategy=LatticePositionStrategy(lattice),
+        join_strategy=RaidenLatticeJoinStrategy(
+            lattice=lattice,
+            max_initiated_aux_channels=(8, 12),
+            max_accepted_aux_channels=(8, 12),
+            deposit=(10, 20)
+        )
+    )
+
+
+def hyperbolic_config() -> NetworkConfiguration:
+    disk = HyperbolicDisk((0, HYPERBOLIC_DISK_MAX_RING), HYPERBOLIC_DISK_RADIUS)
+    return NetworkConfiguration(
+        num_nodes=NUM_NODES,
+        max_id=MAX_ID,
+        fullness_dist=BetaDistribution(0.5, 2),
+        position_strategy=HyperbolicPositionStrategy(disk),
+        join_strategy=HyperbolicDiskJoinStrategy(disk, deposit=(10, 20))
+    )
+
+
+def run():
+    # Build name, configuration factory, bulk construction.
+    builds = [
+        ('annulus_full_bulk', annulus_config, True),
+        ('lattice', lattice_config, False),
+        ('hyperbolic_disk_bulk', hyperbolic_config, True)
+    ]
+
+    results = []
+    for name, config_factory, bulk in builds:
+        print('Building {}.'.format(name))
+        tic = time.time()
+        net = Network(config_factory(), bulk=bulk)
+        toc = time.time()
+        results.append((name, net.raw.number_of_nodes(), net.raw.number_of_edges() // 2, toc - tic))
+
+    print('Construction timings:')
+    print('{:<24}{:>12}{:>12}{:>12}'.format('build', 'nodes', 'channels', 'seconds'))
+    for name, num_nodes, num_channels, seconds in results:
+        print('{:<24}{:>12}{:>12}{:>12.2f}'.format(name, num_nodes, num_channels, seconds))
+
+
+if __name__ == '__main__':
+    run()
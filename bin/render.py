@@ -0,0 +1,15 @@
+import sys
+
+from raidensim.simulation.plots import render_results
+
+
+def run(dirpaths):
+    """
+    Renders the plots of headless simulation results, e.g. `bin/render.py out/*/scaling_*`.
+    """
+    for dirpath in dirpaths:
+        render_results(dirpath)
+
+
+if __name__ == '__main__':
+    run(sys.argv[1:])
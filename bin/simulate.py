@@ -1,21 +1,23 @@
 import datetime
 import os
-
-import random
+import subprocess
+import sys
 
 import math
 
 from raidensim.network.annulus import Annulus
+from raidensim.network.hyperbolic_disk import HyperbolicDisk
 from raidensim.network.network import Network
 
 from raidensim.network.config import NetworkConfiguration
-from raidensim.network.dist import BetaDistribution, MicroRaidenDistribution
+from raidensim.network.dist import BetaDistribution, MicroRaidenDistribution, Distribution
 from raidensim.network.lattice import WovenLattice
 from raidensim.strategy.fee_strategy import SigmoidNetBalanceFeeStrategy
 from raidensim.strategy.position_strategy import (
     LatticePositionStrategy,
     RingPositionStrategy,
-    AnnulusPositionStrategy
+    AnnulusPositionStrategy,
+    HyperbolicPositionStrategy
 )
 from raidensim.strategy.routing.global_routing_strategy import GlobalRoutingStrategy
 from raidensim.strategy.routing.next_hop.greedy_routing_strategy import GreedyRoutingStrategy
@@ -23,20 +25,32 @@ from raidensim.strategy.routing.next_hop.priority_strategy import (
     DistancePriorityStrategy,
     DistanceFeePriorityStrategy,
     AnnulusPriorityStrategy)
-from raidensim.simulation import simulate_routing, simulate_scaling
+from raidensim.network.channel_type import ChannelType
+from raidensim.simulation import (
+    simulate_routing,
+    simulate_scaling,
+    generate_trace,
+    ChurnScheduler,
+    UniformWorkload
+)
 
 from raidensim.strategy.creation.join_strategy import (
     RaidenLatticeJoinStrategy,
     RaidenKademliaJoinStrategy,
     MicroRaidenJoinStrategy,
     FullAnnulusJoinStrategy,
-    SmartAnnulusJoinStrategy
+    SmartAnnulusJoinStrategy,
+    HyperbolicDiskJoinStrategy
 )
 
 # =================================================================================================
 # Target directory for network renderings and statistics.
 SCRIPT_DIR = os.path.dirname(__file__)
 OUT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '../out'))
+# Headless runs only save results and skip the routing renderings. Their plots are rendered by
+# bin/render.py, optionally in a background process while the next simulations run.
+HEADLESS = False
+RENDER_IN_BACKGROUND = True
 # =================================================================================================
 
 # =================================================================================================
@@ -51,6 +65,8 @@ ANNULUS = Annulus(ANNULUS_MAX_RING)
 NUM_NODES = int(ANNULUS_MAX_NODES * 0.4)
 NODE_FAILURE_RATE = 0.1
 MAX_ID = 2**32
+# Fraction of active nodes going offline (and coming back) per 1000 transfers. 0 disables churn.
+CHURN_RATE = 0.0
 # =================================================================================================
 
 # =================================================================================================
@@ -65,6 +81,13 @@ LATTICE = WovenLattice(
 )
 # =================================================================================================
 
+# =================================================================================================
+# Useful HyperbolicDisk variables. Larger radii mean fewer channels per node.
+HYPERBOLIC_DISK_MAX_RING = ANNULUS_MAX_RING
+HYPERBOLIC_DISK_RADIUS = 12
+HYPERBOLIC_DISK = HyperbolicDisk((0, HYPERBOLIC_DISK_MAX_RING), HYPERBOLIC_DISK_RADIUS)
+# =================================================================================================
+
 # =================================================================================================
 # Annulus network configuration.
 ANNULUS_NETWORK_CONFIG = NetworkConfiguration(
@@ -77,6 +100,17 @@ ANNULUS_NETWORK_CONFIG = NetworkConfiguration(
 )
 # =================================================================================================
 
+# =================================================================================================
+# HyperbolicDisk network configuration.
+HYPERBOLIC_NETWORK_CONFIG = NetworkConfiguration(
+    num_nodes=NUM_NODES,
+    max_id=MAX_ID,
+    fullness_dist=BetaDistribution(0.5, 2),
+    position_strategy=HyperbolicPositionStrategy(HYPERBOLIC_DISK),
+    join_strategy=HyperbolicDiskJoinStrategy(HYPERBOLIC_DISK, deposit=(10, 20))
+)
+# =================================================================================================
+
 # =================================================================================================
 # WovenLattice network configuration.
 LATTICE_NETWORK_CONFIG = NetworkConfiguration(
@@ -164,33 +198,70 @@ def run():
     # =============================================================================================
 
     # =============================================================================================
-    # Create network and freeze failing nodes.
-    random.seed(0)
+    # Create network and freeze failing nodes. All randomness is derived from config.seed.
     net = Network(config)
     net.raw.freeze_random_nodes(int(NUM_NODES * NODE_FAILURE_RATE))
     # =============================================================================================
 
+    # =============================================================================================
+    # Transfer trace replayed by every routing model. Lattice endpoints need a lattice channel.
+    num_transfers = 2000
+    transfer_value = 1
+    # Trace values can also be drawn per transfer, e.g. ParetoDistribution(2, 1, 20).
+    trace_value = transfer_value
+    workload = UniformWorkload()
+    if isinstance(config.position_strategy, LatticePositionStrategy):
+        endpoint_channel_types = ChannelType.LATTICE
+    else:
+        endpoint_channel_types = ChannelType.ALL
+    trace = generate_trace(
+        net,
+        workload,
+        num_transfers,
+        trace_value,
+        os.path.join(dirpath, 'trace.npy'),
+        endpoint_channel_types
+    )
+    # =============================================================================================
+
     # =============================================================================================
     # Network scaling simulation.
+    # Every routing model starts from the same baseline. Reverting the fork only restores the
+    # channels touched by the previous run.
     if True:
+        fork = net.fork()
+        results = []
         for name, routing_strategy in routing_strategies:
-            simulate_scaling(
+            fork.revert()
+            churn = ChurnScheduler.balanced(net, CHURN_RATE) if CHURN_RATE else None
+            results_dir = simulate_scaling(
                 net,
                 dirpath,
-                num_transfers=2000,
-                transfer_value=1,
+                num_transfers=num_transfers,
+                transfer_value=transfer_value,
                 position_strategy=config.position_strategy,
                 routing_strategy=routing_strategy,
                 fee_strategy=fee_strategy,
                 name=name,
                 max_recorded_failures=1,
-                credit_transfers=True
+                credit_transfers=True,
+                churn=churn,
+                checkpoint_interval=100,
+                trace=trace,
+                index_capacities=isinstance(trace_value, Distribution),
+                reset=False,
+                headless=HEADLESS
             )
+            results.append(results_dir)
+        fork.close()
+
+        if HEADLESS and RENDER_IN_BACKGROUND:
+            subprocess.Popen([sys.executable, os.path.join(SCRIPT_DIR, 'render.py')] + results)
     # =============================================================================================
 
     # =============================================================================================
     # Detailed routing simulations.
-    if True:
+    if not HEADLESS:
         simulate_routing(
             net,
             dirpath,
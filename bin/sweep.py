@@ -0,0 +1,95 @@
+import datetime
+import os
+
+from raidensim.network.config import NetworkConfiguration
+from raidensim.network.dist import BetaDistribution
+from raidensim.network.network import Network
+from raidensim.simulation import run_sweep
+from raidensim.strategy.creation.join_strategy import RaidenKademliaJoinStrategy
+from raidensim.strategy.fee_strategy import SigmoidNetBalanceFeeStrategy
+from raidensim.strategy.position_strategy import RingPositionStrategy
+from raidensim.strategy.routing.global_routing_strategy import GlobalRoutingStrategy
+from raidensim.strategy.routing.next_hop.greedy_routing_strategy import GreedyRoutingStrategy
+from raidensim.strategy.routing.next_hop.priority_strategy import (
+    DistancePriorityStrategy,
+    DistanceFeePriorityStrategy
+)
+
+# =================================================================================================
+# Target directory for sweep results.
+SCRIPT_DIR = os.path.dirname(__file__)
+OUT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '../out'))
+MAX_ID = 2**32
+# =================================================================================================
+
+# =================================================================================================
+# Network grid. Every combination is built exactly once.
+NETWORK_PARAMETERS = {
+    'num_nodes': [1000, 5000],
+    'max_initiated_channels': [(1, 12), (4, 12)],
+    'node_failure_rate': [0.1]
+}
+
+# Simulation grid. Every combination is simulated on every network.
+SIMULATION_PARAMETERS = {
+    'routing': ['global', 'greedy_distance', 'greedy_fee_distance'],
+    'fee_weight': [0.1]
+}
+
+NUM_TRANSFERS = 2000
+TRANSFER_VALUE = 1
+# =================================================================================================
+
+
+def build_network(num_nodes: int, max_initiated_channels: tuple, node_failure_rate: float):
+    config = NetworkConfiguration(
+        num_nodes=num_nodes,
+        max_id=MAX_ID,
+        fullness_dist=BetaDistribution(0.5, 2),
+        position_strategy=RingPositionStrategy(MAX_ID),
+        join_strategy=RaidenKademliaJoinStrategy(
+            max_id=MAX_ID,
+            min_partner_deposit=0.2,
+            kademlia_bucket_limits=(25, 30),
+            max_initiated_channels=max_initiated_channels,
+            max_accepted_channels=(5, 20),
+            deposit=(5, 40)
+        )
+    )
+    net = Network(config)
+    net.raw.freeze_random_nodes(int(num_nodes * node_failure_rate))
+    return net
+
+
+def build_strategies(config: NetworkConfiguration, routing: str, fee_weight: float):
+    fee_strategy = SigmoidNetBalanceFeeStrategy()
+    if routing == 'global':
+        routing_strategy = GlobalRoutingStrategy(fee_strategy)
+    elif routing == 'greedy_distance':
+        routing_strategy = GreedyRoutingStrategy(
+            DistancePriorityStrategy(config.position_strategy)
+        )
+    else:
+        routing_strategy = GreedyRoutingStrategy(
+            DistanceFeePriorityStrategy(config.position_strategy, fee_strategy, (1.0, fee_weight))
+        )
+    return fee_strategy, routing_strategy
+
+
+def run():
+    now = datetime.datetime.now().replace(microsecond=0)
+    dirpath = os.path.join(OUT_DIR, 'sweep_{}'.format(now.isoformat()))
+    run_sweep(
+        build_network,
+        build_strategies,
+        NETWORK_PARAMETERS,
+        SIMULATION_PARAMETERS,
+        NUM_TRANSFERS,
+        TRANSFER_VALUE,
+        dirpath
+    )
+    print('Results written to {}.'.format(os.path.join(dirpath, 'results.csv')))
+
+
+if __name__ == '__main__':
+    run()
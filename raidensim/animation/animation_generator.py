@@ -1,7 +1,6 @@
 import time
 import json
 import os
-import random
 from collections import namedtuple
 from typing import List, Dict, Tuple
 
@@ -81,7 +80,6 @@ class AnimationGenerator(object):
 
     def generate_network(self):
         # Export final network configuration.
-        random.seed(0)
         self.net = Network(self.config.network, join_nodes=False)
         if not self.config.grow_network:
             self.net.join_nodes()
@@ -219,7 +217,7 @@ class AnimationGenerator(object):
 
     def create_transfer(self):
         for i in range(self.config.transfer_attempts_max):
-            source, target = random.sample(self.net.raw.nodes, 2)
+            source, target = self.net.raw.sample_node_pair(self.net.raw.active_nodes)
             path, _ = self.config.routing_model.route(
                 self.net.raw, source, target, self.config.transfer_value
             )
@@ -0,0 +1,59 @@
+from typing import Dict, Iterator, List, Tuple
+
+from raidensim.network.node import Node
+
+
+class CapacityIndex(object):
+    """
+    Outgoing channels of every node bucketed by capacity. Bucket b holds channels with capacities
+    in [2 ** (b - 1), 2 ** b), bucket 0 the depleted ones. Channels are moved between buckets
+    whenever the network updates their capacity, so iterating the channels that can carry a value
+    skips all buckets below it and only checks capacities within the value's own bucket.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.buckets = {}  # type: Dict[Node, List[Dict[Node, dict]]]
+        self.partner_buckets = {}  # type: Dict[Node, Dict[Node, int]]
+        for u, v, e in raw.edges(data=True):
+            self.update_channel(u, v, e)
+
+    def update_channel(self, u: Node, v: Node, e: dict):
+        bucket = int(e['capacity']).bit_length()
+        partner_buckets = self.partner_buckets.setdefault(u, {})
+        old_bucket = partner_buckets.get(v)
+        if bucket == old_bucket:
+            return
+        buckets = self.buckets.setdefault(u, [])
+        if old_bucket is not None:
+            del buckets[old_bucket][v]
+        while len(buckets) <= bucket:
+            buckets.append({})
+        buckets[bucket][v] = e
+        partner_buckets[v] = bucket
+
+    def remove_nodes(self, nodes: List[Node]):
+        """
+        Drops all channels of nodes that are about to be removed from the network.
+        """
+        raw = self.raw
+        for node in nodes:
+            if node not in raw:
+                continue
+            for u in raw.pred[node]:
+                bucket = self.partner_buckets[u].pop(node)
+                del self.buckets[u][bucket][node]
+            self.buckets.pop(node, None)
+            self.partner_buckets.pop(node, None)
+
+    def eligible_partners(self, u: Node, value: int) -> Iterator[Tuple[Node, dict]]:
+        """
+        Active outgoing channels of u with a capacity of at least `value`, largest buckets first.
+        """
+        frozen = self.raw.frozen_nodes
+        buckets = self.buckets.get(u, [])
+        value_bucket = int(value).bit_length()
+        for bucket in range(len(buckets) - 1, value_bucket - 1, -1):
+            for v, e in buckets[bucket].items():
+                if v not in frozen and (bucket > value_bucket or e['capacity'] >= value):
+                    yield v, e
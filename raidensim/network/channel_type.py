@@ -0,0 +1,21 @@
+class ChannelType(object):
+    """
+    Channel classes as bit flags. Connection strategies store the code of every channel they create
+    under the channel's 'type' attribute. Sets of classes are selected with bitwise masks, e.g.
+    `e['type'] & (ChannelType.LATTICE | ChannelType.AUX)`, instead of recomputing them from node
+    positions.
+    """
+    GENERIC = 1
+    LATTICE = 2
+    AUX = 4
+    KADEMLIA = 8
+    MICRORAIDEN = 16
+    ALL = GENERIC | LATTICE | AUX | KADEMLIA | MICRORAIDEN
+
+    NAMES = {
+        GENERIC: 'generic',
+        LATTICE: 'lattice',
+        AUX: 'aux',
+        KADEMLIA: 'kademlia',
+        MICRORAIDEN: 'microraiden'
+    }
@@ -10,10 +10,13 @@ class NetworkConfiguration(object):
             max_id: int,
             fullness_dist: Distribution,
             position_strategy: PositionStrategy,
-            join_strategy: JoinStrategy
+            join_strategy: JoinStrategy,
+            seed: int = 0
     ):
         self.num_nodes = num_nodes
         self.max_id = max_id
         self.fullness_dist = fullness_dist
         self.position_strategy = position_strategy
         self.join_strategy = join_strategy
+        # Root of all random streams used to build and simulate this network.
+        self.seed = seed
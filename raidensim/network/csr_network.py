@@ -0,0 +1,388 @@
+import heapq
+import os
+from typing import List, Tuple, Iterator, Callable, Optional, Union
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from raidensim.network.node import Node
+from raidensim.strategy.routing.routing_strategy import RoutingStrategy
+
+# Both directions of a channel share its uid, which counts channels in stream order.
+EDGE_DTYPE = np.dtype([
+    ('uid', np.int64),
+    ('source', np.int64),
+    ('target', np.int64),
+    ('deposit', np.int64)
+])
+
+
+def _concat_ranges(starts: np.array, ends: np.array) -> np.array:
+    """
+    Concatenation of all ranges [starts[k], ends[k]) without a Python loop.
+    """
+    counts = ends - starts
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + offsets
+
+
+class EdgeStreamWriter(object):
+    """
+    Appends unidirectional channels to chunked, memory-mapped edge files in a directory so that
+    networks of millions of nodes can be built without holding their edges in memory. Only one
+    chunk of `chunk_size` edges is resident at a time.
+
+    Both directions of a bidirectional channel are written next to each other, initiator direction
+    first, which `finalize` uses to link every edge to its reverse edge.
+    """
+    CHUNK_SIZE = 2 ** 20
+
+    def __init__(self, directory: str, chunk_size: int = CHUNK_SIZE):
+        if chunk_size % 2:
+            raise ValueError('Chunk size must be even to keep channel directions together.')
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.chunk_paths = []
+        self.chunk_lengths = []
+        self.chunk = None
+        self.num_edges = 0
+
+    def _next_chunk(self):
+        self._flush()
+        path = os.path.join(self.directory, 'edges_{:05d}.npy'.format(len(self.chunk_paths)))
+        self.chunk = open_memmap(path, mode='w+', dtype=EDGE_DTYPE, shape=(self.chunk_size,))
+        self.chunk_paths.append(path)
+        self.chunk_lengths.append(0)
+
+    def _flush(self):
+        if self.chunk is not None:
+            self.chunk.flush()
+            self.chunk = None
+
+    def append_channels(
+            self,
+            initiators: np.array,
+            partners: np.array,
+            deposits_a: np.array,
+            deposits_b: np.array
+    ):
+        """
+        Appends bidirectional channels between node indices initiators[k] and partners[k] with the
+        respective deposits of both sides.
+        """
+        edges = np.empty(2 * len(initiators), dtype=EDGE_DTYPE)
+        channel_uids = np.arange(self.num_edges // 2, self.num_edges // 2 + len(initiators))
+        edges['uid'][0::2] = channel_uids
+        edges['uid'][1::2] = channel_uids
+        edges['source'][0::2] = initiators
+        edges['target'][0::2] = partners
+        edges['deposit'][0::2] = deposits_a
+        edges['source'][1::2] = partners
+        edges['target'][1::2] = initiators
+        edges['deposit'][1::2] = deposits_b
+
+        written = 0
+        while written < len(edges):
+            if self.chunk is None or self.chunk_lengths[-1] == self.chunk_size:
+                self._next_chunk()
+            fill = self.chunk_lengths[-1]
+            num_written = min(self.chunk_size - fill, len(edges) - written)
+            self.chunk[fill:fill + num_written] = edges[written:written + num_written]
+            self.chunk_lengths[-1] += num_written
+            written += num_written
+        self.num_edges += len(edges)
+
+    def _chunks(self):
+        self._flush()
+        for path, length in zip(self.chunk_paths, self.chunk_lengths):
+            yield np.load(path, mmap_mode='r')[:length]
+
+    def finalize(self, uids: np.array, fullness: np.array) -> 'CsrNetwork':
+        """
+        Sorts the streamed edges into a CSR adjacency layout on disk (two passes over the chunks)
+        and returns a memory-mapped view of it. Within a node's row, edges keep their stream order.
+        The chunk files are removed afterwards.
+        """
+        num_nodes = len(uids)
+        print('Finalizing {} edges between {} nodes.'.format(self.num_edges, num_nodes))
+
+        def create(name: str, shape: Tuple[int]) -> np.array:
+            path = os.path.join(self.directory, name + '.npy')
+            return open_memmap(path, mode='w+', dtype=np.int64, shape=shape)
+
+        # First pass: out-degrees.
+        indptr = create('indptr', (num_nodes + 1,))
+        indptr[0] = 0
+        degrees = np.zeros(num_nodes, dtype=np.int64)
+        for chunk in self._chunks():
+            degrees += np.bincount(chunk['source'], minlength=num_nodes)
+        np.cumsum(degrees, out=indptr[1:])
+
+        # Second pass: scatter edges into their rows.
+        targets = create('targets', (self.num_edges,))
+        channel_uids = create('channel_uids', (self.num_edges,))
+        deposits = create('deposits', (self.num_edges,))
+        reverse = create('reverse', (self.num_edges,))
+        cursor = np.array(indptr[:-1])
+        for chunk in self._chunks():
+            sources = np.array(chunk['source'])
+            order = np.argsort(sources, kind='stable')
+            sorted_sources = sources[order]
+            ranks = np.arange(len(sources)) - np.searchsorted(sorted_sources, sorted_sources)
+            positions = np.empty(len(sources), dtype=np.int64)
+            positions[order] = cursor[sorted_sources] + ranks
+            cursor += np.bincount(sources, minlength=num_nodes)
+
+            targets[positions] = chunk['target']
+            channel_uids[positions] = chunk['uid']
+            deposits[positions] = chunk['deposit']
+            reverse[positions[0::2]] = positions[1::2]
+            reverse[positions[1::2]] = positions[0::2]
+
+        # Balances of a previous build in the same directory are stale.
+        balances = create('balances', (self.num_edges,))
+        balances[:] = 0
+
+        for array in [indptr, targets, channel_uids, deposits, reverse, balances]:
+            array.flush()
+        np.save(os.path.join(self.directory, 'uids.npy'), np.asarray(uids, dtype=np.int64))
+        np.save(os.path.join(self.directory, 'fullness.npy'), np.asarray(fullness, dtype=float))
+
+        for path in self.chunk_paths:
+            os.remove(path)
+        self.chunk_paths = []
+        self.chunk_lengths = []
+
+        return CsrNetwork(self.directory)
+
+
+class CsrNode(Node):
+    """
+    Node of a `CsrNetwork`, created on demand. Equal to the `Node` of the same uid.
+    """
+    def __init__(self, index: int, uid: int, fullness: float):
+        Node.__init__(self, uid, fullness)
+        self.index = index
+
+
+class CsrNetwork(object):
+    """
+    Read-only, memory-mapped CSR view of a network built by `EdgeStreamWriter`. Nodes are integer
+    indices. Only channel balances are writable and kept in their own memory-mapped file, so
+    transfers can be simulated without ever materializing a networkx graph.
+
+    Balances and capacities follow the same conventions as in `RawNetwork`.
+
+    Routing strategies run on the view through the subset of the `RawNetwork` interface they use
+    (`eligible_partners`, `get_edge_data`, `is_active`, `cheapest_path`, `do_transfer`). Nodes are
+    then `CsrNode` objects and edge data dicts are built per access. All nodes are active.
+    Priority strategies based on node coordinates (lattice, annulus, hyperbolic disk) are not
+    supported since streamed construction does not record coordinates.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+        def load(name: str) -> np.array:
+            return np.load(os.path.join(directory, name + '.npy'), mmap_mode='r')
+
+        self.indptr = load('indptr')
+        self.targets = load('targets')
+        self.channel_uids = load('channel_uids')
+        self.deposits = load('deposits')
+        self.reverse = load('reverse')
+        self.uids = load('uids')
+        self.fullness = load('fullness')
+
+        balances_path = os.path.join(directory, 'balances.npy')
+        if os.path.exists(balances_path):
+            self.balances = np.load(balances_path, mmap_mode='r+')
+            if len(self.balances) != len(self.targets):
+                raise ValueError('Balances of {} edges do not match the {} edges in {}.'.format(
+                    len(self.balances), len(self.targets), directory
+                ))
+        else:
+            self.balances = open_memmap(
+                balances_path, mode='w+', dtype=np.int64, shape=(len(self.targets),)
+            )
+
+        # Search state reused across path searches, one per search direction. Stamps avoid clearing
+        # the arrays for every search.
+        self._stamps = np.zeros((2, self.num_nodes), dtype=np.int64)
+        self._depths = np.zeros((2, self.num_nodes), dtype=np.int64)
+        self._parent_edges = np.zeros((2, self.num_nodes), dtype=np.int64)
+        self._stamp = 0
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def out_edges(self, node: int) -> np.array:
+        return np.arange(self.indptr[node], self.indptr[node + 1])
+
+    def edge_sources(self, edges: np.array) -> np.array:
+        return np.searchsorted(self.indptr, edges, side='right') - 1
+
+    def find_edge(self, u: int, v: int) -> int:
+        edges = self.out_edges(u)
+        return int(edges[np.flatnonzero(self.targets[edges] == v)[0]])
+
+    def capacities(self, edges: np.array) -> np.array:
+        return self.deposits[edges] - self.balances[edges] + self.balances[self.reverse[edges]]
+
+    def reset_channels(self):
+        self.balances[:] = 0
+
+    def find_path(self, source: int, target: int, value: int) -> List[int]:
+        """
+        Shortest path (in hops) over channels with a capacity of at least `value`. Runs a
+        bidirectional breadth-first search that always expands the smaller of both frontiers, one
+        whole frontier per NumPy pass. Returns an empty list if no such path exists.
+        """
+        self._stamp += 1
+        stamp = self._stamp
+        stamps, depths, parent_edges = self._stamps, self._depths, self._parent_edges
+        frontiers = [np.array([source]), np.array([target])]
+        for direction, node in enumerate([source, target]):
+            stamps[direction, node] = stamp
+            depths[direction, node] = 0
+
+        meet = -1
+        while meet < 0 and len(frontiers[0]) and len(frontiers[1]):
+            # Forward (0) follows outgoing channels, backward (1) incoming channels.
+            direction = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            frontier = frontiers[direction]
+            edges = _concat_ranges(self.indptr[frontier], self.indptr[frontier + 1])
+            nodes = self.targets[edges]
+            if direction == 1:
+                edges = self.reverse[edges]
+            sufficient = self.capacities(edges) >= value
+            edges, nodes = edges[sufficient], nodes[sufficient]
+
+            new = stamps[direction, nodes] != stamp
+            nodes, first = np.unique(nodes[new], return_index=True)
+            stamps[direction, nodes] = stamp
+            depths[direction, nodes] = depths[direction, frontier[0]] + 1
+            parent_edges[direction, nodes] = edges[new][first]
+            frontiers[direction] = nodes
+
+            met = nodes[stamps[1 - direction, nodes] == stamp]
+            if len(met):
+                meet = int(met[np.argmin(depths[1 - direction, met])])
+
+        if meet < 0:
+            return []
+        path = [meet]
+        while path[-1] != source:
+            path.append(int(self.edge_sources(parent_edges[0, path[-1]])))
+        path.reverse()
+        while path[-1] != target:
+            path.append(int(self.targets[parent_edges[1, path[-1]]]))
+        return path
+
+    def do_transfer(self, path: List[Union[int, CsrNode]], value: int):
+        path = [node.index if isinstance(node, CsrNode) else node for node in path]
+        for u, v in zip(path[:-1], path[1:]):
+            self.balances[self.find_edge(u, v)] += value
+
+    def node(self, index: int) -> CsrNode:
+        return CsrNode(index, int(self.uids[index]), float(self.fullness[index]))
+
+    def edge_data(self, edge: int) -> dict:
+        """
+        Channel attributes of an edge as in `RawNetwork` edge data. Copies, not views.
+        """
+        reverse = self.reverse[edge]
+        deposit = int(self.deposits[edge])
+        net_balance = int(self.balances[edge] - self.balances[reverse])
+        return {
+            'uid': int(self.channel_uids[edge]),
+            'deposit': deposit,
+            'balance': int(self.balances[edge]),
+            'net_balance': net_balance,
+            'capacity': deposit - net_balance,
+            'imbalance': int(self.deposits[reverse]) - deposit + 2 * net_balance
+        }
+
+    def is_active(self, node: CsrNode) -> bool:
+        return True
+
+    def get_edge_data(self, u: CsrNode, v: CsrNode) -> dict:
+        return self.edge_data(self.find_edge(u.index, v.index))
+
+    def eligible_partners(self, u: CsrNode, value: int) -> Iterator[Tuple[CsrNode, dict]]:
+        """
+        Outgoing channels of u that can carry `value`, in stream order.
+        """
+        edges = self.out_edges(u.index)
+        edges = edges[self.capacities(edges) >= value]
+        for edge, v in zip(edges.tolist(), self.targets[edges].tolist()):
+            yield self.node(v), self.edge_data(edge)
+
+    def cheapest_path(
+            self,
+            source: CsrNode,
+            target: CsrNode,
+            cost: Callable[[CsrNode, CsrNode, dict], Optional[float]]
+    ) -> List[CsrNode]:
+        """
+        Dijkstra search like `RawNetwork.cheapest_path`. Channels with a cost of None are skipped.
+        """
+        distances = {source.index: 0}
+        parents = {}
+        heap = [(0, source.index)]
+        while heap:
+            distance, u = heapq.heappop(heap)
+            if u == target.index:
+                path = [u]
+                while path[-1] != source.index:
+                    path.append(parents[path[-1]])
+                return [self.node(index) for index in reversed(path)]
+            if distance > distances[u]:
+                continue
+            u_node = self.node(u)
+            edges = self.out_edges(u)
+            for edge, v in zip(edges.tolist(), self.targets[edges].tolist()):
+                edge_cost = cost(u_node, self.node(v), self.edge_data(edge))
+                if edge_cost is None:
+                    continue
+                if distance + edge_cost < distances.get(v, np.inf):
+                    distances[v] = distance + edge_cost
+                    parents[v] = u
+                    heapq.heappush(heap, (distances[v], v))
+        return []
+
+    def sample_node_pair(self, rng: np.random.Generator) -> Tuple[int, int]:
+        i = int(rng.integers(self.num_nodes))
+        j = int(rng.integers(self.num_nodes - 1))
+        if j >= i:
+            j += 1
+        return i, j
+
+    def simulate_transfers(
+            self,
+            num_transfers: int,
+            value: int,
+            rng: np.random.Generator,
+            routing_strategy: RoutingStrategy = None
+    ) -> np.array:
+        """
+        Performs transfers between random node pairs along shortest sufficient paths or the paths
+        of a routing strategy. Returns the number of hops per transfer, -1 for failed transfers.
+        """
+        hops = np.full(num_transfers, -1, dtype=np.int64)
+        for i in range(num_transfers):
+            source, target = self.sample_node_pair(rng)
+            if routing_strategy is None:
+                path = self.find_path(source, target, value)
+            else:
+                path, _ = routing_strategy.route(self, self.node(source), self.node(target), value)
+            if path:
+                self.do_transfer(path, value)
+                hops[i] = len(path) - 1
+        return hops
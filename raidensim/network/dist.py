@@ -1,8 +1,6 @@
-import random
-
 import numpy as np
 
-from scipy.stats import semicircular, beta
+from raidensim.network.random_streams import Seed, child_seed
 
 
 class Distribution(object):
@@ -12,10 +10,61 @@ class Distribution(object):
     def random(self):
         raise NotImplementedError
 
+    def sample(self, n: int) -> np.array:
+        """
+        Draws n values at once. Distributions without a native implementation fall back to
+        calling `random` n times.
+        """
+        return np.array([self.random() for _ in range(n)])
+
+    def reseed(self, seed: Seed):
+        """
+        Replaces the seed of a random distribution and resets it. Ignored by distributions that
+        do not use a generator.
+        """
+        pass
+
     def get_pdf(self):
         raise NotImplementedError
 
 
+class GeneratorDistribution(Distribution):
+    """
+    Distribution sampled natively through its own NumPy Generator. Single values are served from a
+    buffer that is refilled by drawing BUFFER_SIZE values at once.
+
+    Note: `sample` draws directly from the generator and does not consume buffered values.
+    """
+    BUFFER_SIZE = 1024
+
+    def __init__(self, seed: Seed = 0):
+        self.seed = seed
+        self.rng = None
+        self.buffer = []
+        self.buffer_index = 0
+        self.reset()
+
+    def reset(self):
+        self.rng = np.random.default_rng(self.seed)
+        self.buffer = []
+        self.buffer_index = 0
+
+    def reseed(self, seed: Seed):
+        self.seed = seed
+        self.reset()
+
+    def random(self):
+        if self.buffer_index == len(self.buffer):
+            self.buffer = self.sample(self.BUFFER_SIZE).tolist()
+            self.buffer_index = 0
+        value = self.buffer[self.buffer_index]
+        self.buffer_index += 1
+        return value
+
+    def sample(self, n: int) -> np.array:
+        raise NotImplementedError
+
+
 class ConstantDistribution(Distribution):
     def __init__(self, value):
         self.value = value
@@ -27,21 +76,21 @@ class ConstantDistribution(Distribution):
         # Huehuehueh
         return self.value
 
+    def sample(self, n: int) -> np.array:
+        return np.full(n, self.value)
+
     def get_pdf(self):
         return lambda x: 1 if x == self.value else 0
 
 
-class UniformDistribution(Distribution):
-    def __init__(self, min_value=0, max_value=1):
+class UniformDistribution(GeneratorDistribution):
+    def __init__(self, min_value=0, max_value=1, seed: Seed = 0):
         self.min_value = min_value
         self.max_value = max_value
-        self.reset()
+        GeneratorDistribution.__init__(self, seed)
 
-    def reset(self):
-        random.seed(0)
-
-    def random(self):
-        return random.uniform(self.min_value, self.max_value)
+    def sample(self, n: int) -> np.array:
+        return self.rng.uniform(self.min_value, self.max_value, n)
 
     def _pdf(self, x):
         if self.min_value <= x <= self.max_value:
@@ -53,8 +102,8 @@ class UniformDistribution(Distribution):
         return self._pdf
 
 
-class ParetoDistribution(Distribution):
-    def __init__(self, a, min_value, max_value):
+class ParetoDistribution(GeneratorDistribution):
+    def __init__(self, a, min_value, max_value, seed: Seed = 0):
         """
         Pareto distribution according to
         https://docs.scipy.org/doc/numpy/reference/generated/numpy.random.pareto.html
@@ -68,37 +117,35 @@ class ParetoDistribution(Distribution):
         self.a = a
         self.min_value = min_value
         self.max_value = max_value
-        self.reset()
+        GeneratorDistribution.__init__(self, seed)
 
-    def reset(self):
-        np.random.seed(0)
-
-    def random(self):
-        return min(np.random.pareto(self.a) + self.min_value, self.max_value)
+    def sample(self, n: int) -> np.array:
+        return np.minimum(self.rng.pareto(self.a, n) + self.min_value, self.max_value)
 
 
-class CircleDistribution(Distribution):
-    def __init__(self, min_value=0, max_value=1):
+class CircleDistribution(GeneratorDistribution):
+    def __init__(self, min_value=0, max_value=1, seed: Seed = 0):
         """
         Quarter-circle distribution. Can also be used as the height of a point on the surface of a
         semisphere for an even surface distribution.
         """
         self.min_value = min_value
         self.max_value = max_value
-        self.reset()
-
-    def reset(self):
-        np.random.seed(0)
+        GeneratorDistribution.__init__(self, seed)
 
-    def random(self):
-        return (self.max_value - self.min_value) * abs(semicircular.rvs()) + self.min_value
+    def sample(self, n: int) -> np.array:
+        # A semicircular variable on [-1, 1] is 2 * Beta(1.5, 1.5) - 1.
+        semicircular_values = 2 * self.rng.beta(1.5, 1.5, n) - 1
+        return (self.max_value - self.min_value) * np.abs(semicircular_values) + self.min_value
 
     def get_pdf(self):
+        # scipy.stats takes about a second to import and is only needed for PDFs.
+        from scipy.stats import semicircular
         return lambda x: 2 * semicircular.pdf(x)
 
 
-class BetaDistribution(Distribution):
-    def __init__(self, a, b, min_value=0, max_value=1):
+class BetaDistribution(GeneratorDistribution):
+    def __init__(self, a, b, min_value=0, max_value=1, seed: Seed = 0):
         """
         Beta distribution. You can do pretty much anything with this. Produces values in [0,1].
         """
@@ -106,32 +153,37 @@ class BetaDistribution(Distribution):
         self.b = b
         self.min_value = min_value
         self.max_value = max_value
-        self.reset()
-
-    def reset(self):
-        np.random.seed(0)
+        GeneratorDistribution.__init__(self, seed)
 
-    def random(self):
-        return (self.max_value - self.min_value) * beta.rvs(self.a, self.b) + self.min_value
+    def sample(self, n: int) -> np.array:
+        return (self.max_value - self.min_value) * self.rng.beta(self.a, self.b, n) + \
+            self.min_value
 
     def get_pdf(self):
+        from scipy.stats import beta
         return lambda x: beta.pdf(x, self.a, self.b)
 
 
-class MicroRaidenDistribution(Distribution):
-    def __init__(self, client_fraction, server_fullness_dist):
+class MicroRaidenDistribution(GeneratorDistribution):
+    def __init__(self, client_fraction, server_fullness_dist, seed: Seed = 0):
         self.client_fraction = client_fraction
         self.server_fullness_dist = server_fullness_dist
+        GeneratorDistribution.__init__(self, seed)
+        self.server_fullness_dist.reseed(child_seed(seed, 0))
 
     def reset(self):
-        random.seed(0)
+        GeneratorDistribution.reset(self)
         self.server_fullness_dist.reset()
 
-    def random(self):
-        if random.uniform(0, 1) < self.client_fraction:
-            return 0
-        else:
-            return self.server_fullness_dist.random() / 2 + 0.5
+    def reseed(self, seed: Seed):
+        self.server_fullness_dist.reseed(child_seed(seed, 0))
+        GeneratorDistribution.reseed(self, seed)
+
+    def sample(self, n: int) -> np.array:
+        is_client = self.rng.uniform(0, 1, n) < self.client_fraction
+        values = self.server_fullness_dist.sample(n) / 2 + 0.5
+        values[is_client] = 0
+        return values
 
     def get_pdf(self):
         return self.server_fullness_dist.get_pdf()
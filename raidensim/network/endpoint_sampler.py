@@ -0,0 +1,88 @@
+from typing import Tuple, Set, Dict, Iterable
+
+from raidensim.network.channel_type import ChannelType
+from raidensim.network.indexed_set import IndexedSet
+from raidensim.network.node import Node
+
+
+class EndpointSampler(object):
+    """
+    Incrementally maintained set of valid transfer endpoints for a fixed transfer value and mask of
+    channel types: active nodes with at least one active outgoing channel of these types with a
+    capacity of at least `value`.
+
+    The same set serves sources and targets. A target was previously accepted if one of its
+    incoming channels satisfied `deposit - net_balance + imbalance >= value`, which is exactly the
+    capacity of the reverse channel, i.e. one of the target's own outgoing channels.
+
+    Channels are re-evaluated by the network whenever their capacity or the activity of one of
+    their nodes changes, so sampling a valid pair is O(1) instead of a rejection loop.
+    """
+
+    def __init__(self, raw, value: int, channel_types: int = ChannelType.ALL):
+        self.raw = raw
+        self.value = value
+        self.channel_types = channel_types
+        self.sufficient_channels = set()  # type: Set[Tuple[Node, Node]]
+        self.num_sufficient = {}  # type: Dict[Node, int]
+        self.nodes = IndexedSet()
+        for u, v, e in raw.active_edges():
+            self.update_channel(u, v, e)
+
+    def matches(self, raw, value: int, channel_types: int) -> bool:
+        return self.raw is raw and self.value == value and self.channel_types == channel_types
+
+    def update_channel(self, u: Node, v: Node, e: dict):
+        """
+        Re-evaluates the unidirectional channel u -> v.
+        """
+        raw = self.raw
+        sufficient = e['capacity'] >= self.value and e['type'] & self.channel_types and \
+            raw.is_active(u) and raw.is_active(v)
+        self._set_sufficient(u, v, sufficient)
+
+    def _set_sufficient(self, u: Node, v: Node, sufficient: bool):
+        channel = (u, v)
+        if sufficient == (channel in self.sufficient_channels):
+            return
+        if sufficient:
+            self.sufficient_channels.add(channel)
+            self.num_sufficient[u] = self.num_sufficient.get(u, 0) + 1
+            self.nodes.add(u)
+        else:
+            self.sufficient_channels.discard(channel)
+            self.num_sufficient[u] -= 1
+            if not self.num_sufficient[u]:
+                del self.num_sufficient[u]
+                self.nodes.discard(u)
+
+    def update_nodes(self, nodes: Iterable[Node]):
+        """
+        Re-evaluates all channels of the given nodes, e.g. after they were frozen or unfrozen.
+        """
+        raw = self.raw
+        for node in nodes:
+            if node not in raw:
+                continue
+            for v, e in raw[node].items():
+                self.update_channel(node, v, e)
+            for u, e in raw.pred[node].items():
+                self.update_channel(u, node, e)
+
+    def remove_nodes(self, nodes: Iterable[Node]):
+        """
+        Drops all channels of nodes that are about to be removed from the network.
+        """
+        raw = self.raw
+        for node in nodes:
+            if node not in raw:
+                continue
+            for v in raw[node]:
+                self._set_sufficient(node, v, False)
+            for u in raw.pred[node]:
+                self._set_sufficient(u, node, False)
+
+    def sample(self) -> Tuple[Node, Node]:
+        if len(self.nodes) < 2:
+            raise ValueError('Max attempts of finding transfer nodes reached.')
+        return self.raw.sample_node_pair(self.nodes.items)
@@ -1,5 +1,5 @@
 import math
-from typing import Iterator
+from typing import Iterator, Tuple
 
 import numpy as np
 
@@ -13,6 +13,9 @@ class HyperbolicDisk:
     out.
     """
 
+    # Tolerance for slots lying exactly on the partner radius.
+    COS_EPSILON = 1e-12
+
     def __init__(self, rings: IntRange, radius: float):
         self.rings = rings
         self.radius = radius
@@ -20,6 +23,16 @@ class HyperbolicDisk:
         self.node_to_coord = {}
         self.coord_to_node = {}
 
+        # Node index (into `index_to_node`) of every slot on every ring, -1 for empty slots.
+        self.index_to_node = []
+        self.slot_indices = [np.full(2 ** r, -1, dtype=int) for r in range(rings[1] + 1)]
+
+        # Per-ring lookup tables for the hyperbolic law of cosines.
+        ring_radii = np.arange(rings[1] + 1) / rings[1] * radius
+        self.ring_cosh = np.cosh(ring_radii)
+        self.ring_sinh = np.sinh(ring_radii)
+        self.cosh_radius = math.cosh(radius)
+
     @property
     def num_slots(self):
         return 2 ** (self.rings[1] + 1) - 2 ** self.rings[0]
@@ -28,6 +41,28 @@ class HyperbolicDisk:
         self.node_to_coord[node] = np.array(coord, dtype=int)
         coord_fixed = tuple(coord)
         self.coord_to_node[coord_fixed] = node
+        self.slot_indices[coord[0]][coord[1]] = len(self.index_to_node)
+        self.index_to_node.append(node)
+
+    def partner_indices(self, coord: DiskCoord) -> np.array:
+        """
+        Node indices of all present nodes within the disk radius of a coordinate, excluding the
+        coordinate's own slot. Rings are ordered inside out, slots by ascending unwrapped index
+        within the partner range.
+        """
+        r0, i0 = int(coord[0]), int(coord[1])
+        ring_range = np.arange(self.rings[0], self.rings[1] + 1)
+        los, his = self.partner_ranges(np.array([[r0, i0]]), ring_range)
+        partners = []
+        for r, lo, hi in zip(ring_range.tolist(), los[0].tolist(), his[0].tolist()):
+            if hi < lo:
+                continue
+            slots = np.arange(lo, hi + 1) % 2 ** r
+            if r == r0:
+                slots = slots[slots != i0]
+            indices = self.slot_indices[r][slots]
+            partners.append(indices[indices >= 0])
+        return np.concatenate(partners) if partners else np.empty(0, dtype=int)
 
     def node_distance(self, a: Node, b: Node):
         return self.coord_distance(self.node_to_coord[a], self.node_to_coord[b])
@@ -66,40 +101,81 @@ class HyperbolicDisk:
         return self.partner_coords(coord, (coord[0] + 1, self.rings[1]))
 
     def partner_coords(self, coord: DiskCoord, rings: IntRange):
-        r0, i0 = coord
-        for r in range(rings[0], rings[1] + 1):
-            ri0 = int(i0 * 2 ** (int(r - r0)))
+        """
+        Yields all slots on the given rings within the disk radius of a coordinate, excluding the
+        coordinate itself. On each ring, slots are ordered by stepping outward in both directions
+        from the slot closest to the coordinate.
+        """
+        r0, i0 = int(coord[0]), int(coord[1])
+        ring_range = np.arange(rings[0], rings[1] + 1)
+        los, his = self.partner_ranges(np.array([[r0, i0]]), ring_range)
+        for r, lo, hi in zip(ring_range.tolist(), los[0].tolist(), his[0].tolist()):
             num_ring_slots = 2 ** r
-            # Check nodes on each ring by stepping outward in both directions from the closest
-            # node.
-            for di in range(0, num_ring_slots // 2):
-                # Exclude the node itself.
-                if r == r0 and di == 0:
-                    continue
-
-                i1 = (ri0 + di) % num_ring_slots
-                i2 = (ri0 - di) % num_ring_slots
-
-                # Distances are no longer symmetric on lower rings, so check both individually.
-                num_new_nodes = 0
-                if self.coord_distance(coord, [r, i1]) <= self.radius:
-                    num_new_nodes += 1
-                    yield np.array([r, i1])
-                if di == 0:
-                    continue
-                if self.coord_distance(coord, [r, i2]) <= self.radius:
-                    num_new_nodes += 1
-                    yield np.array([r, i2])
-
-                if num_new_nodes < 2:
-                    # Distances only get bigger from here on.
-                    break
-            # Check the node on the exact opposite side only if all other nodes on this ring were
-            # in range. (Apparently 'else' after a for-loop is a thing.)
-            else:
-                i1 = (ri0 + num_ring_slots // 2) % num_ring_slots
-                if self.coord_distance(coord, [r, i1]) <= self.radius:
-                    yield np.array([r, i1])
+            ri0 = i0 * 2 ** (r - r0) if r >= r0 else i0 // 2 ** (r0 - r)
+            if hi - lo + 1 >= num_ring_slots:
+                # Full ring. Step through it so that the opposite slot comes last.
+                lo = ri0 - (num_ring_slots - 1) // 2
+                hi = ri0 + num_ring_slots // 2
+
+            if lo <= ri0 <= hi and r != r0:
+                yield np.array([r, ri0 % num_ring_slots])
+            di = 1
+            while ri0 + di <= hi or ri0 - di >= lo:
+                if ri0 + di <= hi:
+                    yield np.array([r, (ri0 + di) % num_ring_slots])
+                if ri0 - di >= lo:
+                    yield np.array([r, (ri0 - di) % num_ring_slots])
+                di += 1
+
+    def slot_half_widths(self, r0: np.array, r: np.array) -> np.array:
+        """
+        Closed-form half-width, in slots of ring r, of the arc of ring r that lies within the disk
+        radius of a coordinate on ring r0. Solves the hyperbolic law of cosines for the angle:
+        cos(dtheta) >= (cosh(r0) * cosh(r) - cosh(radius)) / (sinh(r0) * sinh(r))
+        Returns inf for rings that are entirely in range and -1 for rings entirely out of range.
+        """
+        sinh_product = self.ring_sinh[r0] * self.ring_sinh[r]
+        cosh_product = self.ring_cosh[r0] * self.ring_cosh[r]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            min_cos = (cosh_product - self.cosh_radius) / sinh_product - self.COS_EPSILON
+
+        # One of the coordinates is at the center, so the angle does not matter.
+        centered = sinh_product == 0
+        min_cos[centered] = np.where(
+            cosh_product[centered] <= self.cosh_radius * (1 + self.COS_EPSILON), -np.inf, np.inf
+        )
+
+        num_ring_slots = 2.0 ** r
+        half_widths = np.arccos(np.clip(min_cos, -1, 1)) / (2 * math.pi) * num_ring_slots
+        half_widths[min_cos <= -1] = np.inf
+        half_widths[min_cos > 1] = -1
+        return half_widths
+
+    def partner_ranges(self, coords: np.array, rings: np.array) -> Tuple[np.array, np.array]:
+        """
+        Batch partner query. For each coordinate and each of the given rings returns the inclusive
+        slot range [lo, hi] within the disk radius. Ranges are not reduced modulo the number of
+        ring slots and span at most one full ring. Empty ranges have hi < lo. On a coordinate's own
+        ring the range includes the coordinate itself.
+        """
+        coords = np.atleast_2d(coords)
+        r0 = coords[:, 0, None]
+        i0 = coords[:, 1, None]
+        r = np.asarray(rings)[None, :]
+
+        # Position of the coordinate in slot units of ring r.
+        x0 = i0 * 2.0 ** (r - r0)
+        half_widths = self.slot_half_widths(
+            np.broadcast_to(r0, x0.shape), np.broadcast_to(r, x0.shape)
+        )
+
+        num_ring_slots = np.broadcast_to(2 ** r, x0.shape)
+        full = half_widths * 2 >= num_ring_slots
+        with np.errstate(invalid='ignore'):
+            lo = np.where(full, 0, np.ceil(x0 - half_widths)).astype(int)
+            hi = np.where(full, num_ring_slots - 1, np.floor(x0 + half_widths)).astype(int)
+        hi = np.minimum(hi, lo + num_ring_slots - 1)
+        return lo, hi
 
     @staticmethod
     def polar_distance(a: PolarCoord, b: PolarCoord):
@@ -0,0 +1,65 @@
+from typing import Iterable, Iterator, Hashable
+
+import numpy as np
+
+
+class IndexedSet(object):
+    """
+    Set that also keeps its items in a list, allowing O(1) insertion, removal and uniform random
+    sampling. Removal moves the last item into the gap, so the item order is arbitrary.
+    """
+
+    def __init__(self, items: Iterable[Hashable] = ()):
+        self.items = []
+        self.positions = {}
+        self.update(items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.positions
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.items)
+
+    def __getitem__(self, position: int) -> Hashable:
+        return self.items[position]
+
+    def add(self, item: Hashable):
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item: Hashable):
+        position = self.positions.pop(item, None)
+        if position is None:
+            return
+        last = self.items.pop()
+        if position < len(self.items):
+            self.items[position] = last
+            self.positions[last] = position
+
+    def update(self, items: Iterable[Hashable]):
+        for item in items:
+            self.add(item)
+
+    def difference_update(self, items: Iterable[Hashable]):
+        for item in items:
+            self.discard(item)
+
+    def clear(self):
+        self.items = []
+        self.positions = {}
+
+    def copy(self) -> 'IndexedSet':
+        """
+        Copy with the same item order.
+        """
+        copy = IndexedSet()
+        copy.items = list(self.items)
+        copy.positions = self.positions.copy()
+        return copy
+
+    def sample(self, rng: np.random.Generator) -> Hashable:
+        return self.items[int(rng.integers(len(self.items)))]
@@ -1,4 +1,5 @@
-from typing import Iterator, Union, Iterable
+from collections import deque
+from typing import Iterator, Union, Iterable, List
 
 import numpy as np
 
@@ -6,6 +7,74 @@ from raidensim.network.node import Node
 from raidensim.types import Coord
 
 
+class FreeBox(object):
+    """
+    Axis-aligned box of lattice slots that was exposed by a resize. Slots are handed out in
+    row-major order (dimension 0 fastest) using a cursor that never moves backward, since slots
+    never become free again once occupied.
+    """
+    def __init__(self, min_: Coord, max_: Coord):
+        self.min = [int(x) for x in min_]
+        self.max = [int(x) for x in max_]
+        self.cursor = list(self.min)
+
+    @property
+    def num_slots(self) -> int:
+        return int(np.prod([hi - lo + 1 for lo, hi in zip(self.min, self.max)]))
+
+    def next_row(self) -> bool:
+        """
+        Moves the cursor to the start of the next row. Returns False if the box is exhausted.
+        """
+        self.cursor[0] = self.min[0]
+        for dim_i in range(1, len(self.cursor)):
+            if self.cursor[dim_i] < self.max[dim_i]:
+                self.cursor[dim_i] += 1
+                return True
+            self.cursor[dim_i] = self.min[dim_i]
+        return False
+
+    def coords(self) -> Iterator[tuple]:
+        """
+        All slots from the cursor onward, occupied or not.
+        """
+        cursor = list(self.cursor)
+        while True:
+            for x in range(cursor[0], self.max[0] + 1):
+                yield (x,) + tuple(cursor[1:])
+            cursor[0] = self.min[0]
+            for dim_i in range(1, len(cursor)):
+                if cursor[dim_i] < self.max[dim_i]:
+                    cursor[dim_i] += 1
+                    break
+                cursor[dim_i] = self.min[dim_i]
+            else:
+                return
+
+
+class LatticeGaps(object):
+    """
+    Read-only set-like view of all unoccupied slots that were exposed by resizing the lattice.
+    """
+    def __init__(self, lattice: 'Lattice'):
+        self.lattice = lattice
+
+    def __len__(self):
+        return self.lattice.num_gaps
+
+    def __bool__(self):
+        return self.lattice.num_gaps > 0
+
+    def __contains__(self, coord) -> bool:
+        return self.lattice.is_gap(coord)
+
+    def __iter__(self) -> Iterator[tuple]:
+        for box in self.lattice.free_boxes:
+            for coord in box.coords():
+                if not self.lattice.is_occupied(coord):
+                    yield coord
+
+
 class Lattice(object):
     def __init__(self, num_dims=2):
         self.num_dims = num_dims
@@ -14,50 +83,149 @@ class Lattice(object):
         self.coord_to_node = {}
         self.min = np.zeros(num_dims, dtype=int)
         self.max = np.zeros(num_dims, dtype=int)
-        self.gaps = set()
+
+        # Free space is tracked as a queue of boxes exposed by resizing plus one occupancy bitmap
+        # per row along dimension 0, stored as (origin, bits). Both grow with the number of
+        # nodes, not with the lattice content.
+        self.free_boxes = deque()
+        self.row_bitmaps = {}
+        self.num_gaps = 0
+
+        # Dense row-major index over a growable box starting at `grid_origin`. Each cell holds the
+        # index of its node in `index_to_node` or -1. Capacity doubles on growth, so linearized
+        # coordinates are only stable between resizes.
+        self.index_to_node = []
+        self.grid_origin = np.zeros(num_dims, dtype=int)
+        self.grid = np.full([1] * num_dims, -1, dtype=int)
+        self.neighbor_offsets = (
+            np.eye(num_dims, dtype=int)[:, None, :] * [[1], [-1]]
+        ).reshape(-1, num_dims)
+
+    @property
+    def gaps(self) -> LatticeGaps:
+        return LatticeGaps(self)
 
     def resize(self, min_: Coord, max_: Coord):
         for dim_i in self.dims:
-            # Expand resized dimension in appropriate direction by adding gaps for all remaining
-            # dimensions in the expanded region.
-            expand_from = None
-            expand_to = None
+            # Expand resized dimension in appropriate direction by adding a free box spanning all
+            # remaining dimensions in the expanded region.
             if min_[dim_i] < self.min[dim_i]:
-                expand_from = min_[dim_i]
-                expand_to = self.min[dim_i] - 1
+                self._expose(dim_i, min_[dim_i], self.min[dim_i] - 1)
                 self.min[dim_i] = min_[dim_i]
 
             if max_[dim_i] > self.max[dim_i]:
-                expand_from = self.max[dim_i] + 1
-                expand_to = max_[dim_i]
+                self._expose(dim_i, self.max[dim_i] + 1, max_[dim_i])
                 self.max[dim_i] = max_[dim_i]
 
-            if expand_from is not None:
-                dim_gaps = []
-                for dim_j in self.dims:
-                    if dim_i == dim_j:
-                        dim_gaps.append([x for x in range(expand_from, expand_to + 1)])
-                    else:
-                        dim_gaps.append([x for x in range(self.min[dim_j], self.max[dim_j] + 1)])
+    def _expose(self, dim_i: int, expand_from: int, expand_to: int):
+        box_min = self.min.copy()
+        box_max = self.max.copy()
+        box_min[dim_i] = expand_from
+        box_max[dim_i] = expand_to
+        box = FreeBox(box_min, box_max)
+        self.free_boxes.append(box)
+        self.num_gaps += box.num_slots
 
-                self.gaps |= set(tuple(gap) for gap in self._cartesian_product(*dim_gaps))
+    def is_occupied(self, coord) -> bool:
+        row = self.row_bitmaps.get(tuple(int(x) for x in coord[1:]))
+        if row is None:
+            return False
+        origin, bits = row
+        offset = int(coord[0]) - origin
+        return offset >= 0 and bool(bits >> offset & 1)
 
-    @staticmethod
-    def _cartesian_product(*arrays):
-        la = len(arrays)
-        arr = np.empty([len(a) for a in arrays] + [la], dtype=int)
-        for i, a in enumerate(np.ix_(*arrays)):
-            arr[..., i] = a
-        return arr.reshape(-1, la)
+    def is_gap(self, coord) -> bool:
+        # The origin is part of the initial bounds and is never exposed as a gap.
+        return not self.is_occupied(coord) and \
+            any(coord[dim_i] != 0 for dim_i in self.dims) and \
+            all(self.min[dim_i] <= coord[dim_i] <= self.max[dim_i] for dim_i in self.dims)
+
+    def _occupy(self, coord: tuple):
+        key = coord[1:]
+        x = coord[0]
+        origin, bits = self.row_bitmaps.get(key, (x, 0))
+        if x < origin:
+            bits <<= origin - x
+            origin = x
+        self.row_bitmaps[key] = (origin, bits | 1 << (x - origin))
+
+    def _next_free_in_row(self, coord: List[int]) -> int:
+        """
+        Returns the first unoccupied x >= coord[0] in the row of the given coordinate.
+        """
+        x = coord[0]
+        row = self.row_bitmaps.get(tuple(coord[1:]))
+        if row is None:
+            return x
+        origin, bits = row
+        if x < origin:
+            return x
+        free = ~(bits >> (x - origin))
+        return x + (free & -free).bit_length() - 1
 
     def add_node(self, node: Node, coord: Coord):
         self.resize(np.minimum(self.min, coord), np.maximum(self.max, coord))
         self.node_to_coord[node] = np.array(coord, dtype=int)
-        coord_fixed = tuple(coord)
+        coord_fixed = tuple(int(x) for x in coord)
         self.coord_to_node[coord_fixed] = node
 
-        if coord_fixed in self.gaps:
-            self.gaps.remove(coord_fixed)
+        if self.is_gap(coord_fixed):
+            self.num_gaps -= 1
+        self._occupy(coord_fixed)
+
+        self._grow_grid()
+        self.grid[tuple(np.array(coord_fixed) - self.grid_origin)] = len(self.index_to_node)
+        self.index_to_node.append(node)
+
+    def _grow_grid(self):
+        grid_max = self.grid_origin + self.grid.shape - 1
+        if np.all(self.min >= self.grid_origin) and np.all(self.max <= grid_max):
+            return
+
+        # Double the extent of each dimension that overflows, growing toward the overflow.
+        shape = np.array(self.grid.shape)
+        origin = self.grid_origin.copy()
+        for dim_i in self.dims:
+            while self.min[dim_i] < origin[dim_i]:
+                origin[dim_i] -= shape[dim_i]
+                shape[dim_i] *= 2
+            while self.max[dim_i] > origin[dim_i] + shape[dim_i] - 1:
+                shape[dim_i] *= 2
+
+        grid = np.full(shape, -1, dtype=int)
+        offset = self.grid_origin - origin
+        grid[tuple(slice(o, o + n) for o, n in zip(offset, self.grid.shape))] = self.grid
+        self.grid = grid
+        self.grid_origin = origin
+
+    def linearize(self, coords: np.array) -> np.array:
+        """
+        Encodes an array of coordinates as row-major offsets into the current grid. Coordinates
+        outside the grid are encoded as -1.
+        """
+        rel = np.atleast_2d(coords) - self.grid_origin
+        inside = ((rel >= 0) & (rel < self.grid.shape)).all(axis=1)
+        linear = rel @ (np.array(self.grid.strides) // self.grid.itemsize)
+        linear[~inside] = -1
+        return linear
+
+    def lookup(self, coords: np.array) -> np.array:
+        """
+        Returns the node index (into `index_to_node`) for each coordinate or -1 for free slots.
+        """
+        linear = self.linearize(coords)
+        indices = self.grid.ravel()[linear]
+        indices[linear < 0] = -1
+        return indices
+
+    def neighbor_indices(self, coords: np.array) -> np.array:
+        """
+        Node indices of the lattice neighbors of each coordinate, -1 where there is none. Row k
+        lists the neighbors of coords[k] in the order of `neighbor_coords`.
+        """
+        coords = np.atleast_2d(coords)
+        probes = coords[:, None, :] + self.neighbor_offsets[None, :, :]
+        return self.lookup(probes.reshape(-1, self.num_dims)).reshape(len(coords), -1)
 
     @property
     def content(self):
@@ -79,8 +247,8 @@ class Lattice(object):
 
     def coord_neighbors(self, coord: Coord) -> Iterator[Node]:
         return (
-            self.coord_to_node[tuple(coord)] for coord in self.neighbor_coords(coord)
-            if tuple(coord) in self.coord_to_node
+            self.index_to_node[index] for index in self.neighbor_indices(coord)[0].tolist()
+            if index >= 0
         )
 
     def neighbor_coords(self, coord: Coord) -> Iterator[np.array]:
@@ -99,8 +267,14 @@ class Lattice(object):
         return sum(abs(a[dim_i] - b[dim_i]) for dim_i in self.dims)
 
     def get_free_coord(self) -> Coord:
-        if self.gaps:
-            return np.array(next(iter(self.gaps)))
+        while self.free_boxes:
+            box = self.free_boxes[0]
+            x = self._next_free_in_row(box.cursor)
+            if x <= box.max[0]:
+                box.cursor[0] = x
+                return np.array(box.cursor, dtype=int)
+            if not box.next_row():
+                self.free_boxes.popleft()
 
         if not self.node_to_coord:
             return np.zeros(self.num_dims, dtype=int)
@@ -147,6 +321,11 @@ class WovenLattice(Lattice):
         self.min_order = min_order
         self.max_order = max_order
 
+        # Additional long-range hops, alternating positive and negative for each order.
+        order_base = max(2, self.num_dims) * self.weave_base_factor
+        distances = order_base ** np.arange(self.min_order, self.max_order + 1)
+        self.aux_hops = np.stack([distances, -distances], axis=1).ravel()
+
     def aux_node_neighbors(self, node: Node) -> Iterator[Node]:
         node_pos = self.node_to_coord.get(node)
         if node_pos is None:
@@ -154,15 +333,22 @@ class WovenLattice(Lattice):
         return self.aux_coord_neighbors(node_pos)
 
     def aux_coord_neighbors(self, coord: Coord) -> Iterator[Node]:
-        # Additional long-range hops.
-        hop_dim = sum(coord) % self.num_dims
-        order_base = max(2, self.num_dims) * self.weave_base_factor
-        for order in range(self.min_order, self.max_order + 1):
-            distance = order_base**order
-            tcoord = coord.copy()
-            tcoord[hop_dim] += distance
-            if tuple(tcoord) in self.coord_to_node:
-                yield self.coord_to_node[tuple(tcoord)]
-            tcoord[hop_dim] -= 2 * distance
-            if tuple(tcoord) in self.coord_to_node:
-                yield self.coord_to_node[tuple(tcoord)]
+        return (
+            self.index_to_node[index] for index in self.aux_neighbor_indices(coord)[0].tolist()
+            if index >= 0
+        )
+
+    def aux_neighbor_indices(self, coords: np.array) -> np.array:
+        """
+        Node indices of the long-range aux neighbors of each coordinate, -1 where there is none.
+        Row k holds the positive and negative hop for each order on the hop dimension of
+        coords[k].
+        """
+        coords = np.atleast_2d(coords)
+        num_coords = len(coords)
+        num_probes = len(self.aux_hops)
+        hop_dims = coords.sum(axis=1) % self.num_dims
+        probes = np.repeat(coords[:, None, :], num_probes, axis=1)
+        probes[np.arange(num_coords)[:, None], np.arange(num_probes), hop_dims[:, None]] += \
+            self.aux_hops
+        return self.lookup(probes.reshape(-1, self.num_dims)).reshape(num_coords, num_probes)
@@ -0,0 +1,140 @@
+import math
+from collections import Counter
+from typing import Iterable, Iterator, Tuple
+
+from raidensim.network.node import Node
+
+
+class LiveNetworkStats(object):
+    """
+    Channel statistics of the active network that are kept up to date while the network changes.
+    The network reports every channel before and after a change of its balance or of the activity
+    of one of its nodes, so each transfer costs O(hops) and reading the stats costs nothing.
+
+    Capacities are counted per unidirectional channel, absolute net balances and imbalances per
+    bidirectional channel. Standard deviations match those of the former full-scan statistics.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.capacities = Counter()
+        self.net_balances = Counter()
+        self.imbalances = Counter()
+        self.num_channels_uni = 0
+        self.net_balance_sum_squares = 0
+        self.imbalance_sum_squares = 0
+        for u, v, uv in raw.active_bi_edges:
+            self.add_channel(uv, raw[v][u])
+
+    def _apply(self, uv: dict, vu: dict, sign: int):
+        capacities = self.capacities
+        for capacity in [uv['capacity'], vu['capacity']]:
+            capacities[capacity] += sign
+            if not capacities[capacity]:
+                del capacities[capacity]
+        self.num_channels_uni += 2 * sign
+
+        net_balance = abs(uv['net_balance'])
+        self.net_balances[net_balance] += sign
+        if not self.net_balances[net_balance]:
+            del self.net_balances[net_balance]
+        self.net_balance_sum_squares += sign * net_balance ** 2
+
+        imbalance = abs(uv['imbalance'])
+        self.imbalances[imbalance] += sign
+        if not self.imbalances[imbalance]:
+            del self.imbalances[imbalance]
+        self.imbalance_sum_squares += sign * imbalance ** 2
+
+    def add_channel(self, uv: dict, vu: dict):
+        self._apply(uv, vu, 1)
+
+    def remove_channel(self, uv: dict, vu: dict):
+        self._apply(uv, vu, -1)
+
+    def active_channels_of(self, nodes: Iterable[Node]) -> Iterator[Tuple[dict, dict]]:
+        """
+        Active bidirectional channels touching any of the given nodes, each reported once.
+        """
+        raw = self.raw
+        seen = set()
+        for node in nodes:
+            if node not in raw or not raw.is_active(node):
+                continue
+            seen.add(node)
+            for v, uv in raw.active_partners(node):
+                if v not in seen and 'imbalance' in uv:
+                    yield uv, raw[v][node]
+
+    @property
+    def max_capacity(self) -> int:
+        return max(self.capacities.keys())
+
+    @property
+    def max_net_balance(self) -> int:
+        return max(self.net_balances.keys())
+
+    @property
+    def max_imbalance(self) -> int:
+        return max(self.imbalances.keys())
+
+    @property
+    def num_depleted_channels(self) -> int:
+        return self.capacities[0]
+
+    @property
+    def net_balance_stdev(self) -> float:
+        return math.sqrt(self.net_balance_sum_squares / len(self.net_balances))
+
+    @property
+    def net_balance_channel_stdev(self) -> float:
+        """
+        Root mean square of the absolute net balance per bidirectional channel. Unlike
+        `net_balance_stdev`, which keeps the former per-value denominator for the plots, this is
+        comparable across networks of different sizes. NaN without active channels.
+        """
+        num_channels_bi = self.num_channels_uni // 2
+        if not num_channels_bi:
+            return math.nan
+        return math.sqrt(self.net_balance_sum_squares / num_channels_bi)
+
+    @property
+    def imbalance_stdev(self) -> float:
+        return math.sqrt(self.imbalance_sum_squares / len(self.imbalances))
+
+    def to_dict(self) -> dict:
+        """
+        JSON-serializable copy of the statistics. Counters are stored as [value, count] pairs.
+        """
+        return {
+            'capacities': sorted(self.capacities.items()),
+            'net_balances': sorted(self.net_balances.items()),
+            'imbalances': sorted(self.imbalances.items()),
+            'num_channels_uni': self.num_channels_uni,
+            'net_balance_sum_squares': self.net_balance_sum_squares,
+            'imbalance_sum_squares': self.imbalance_sum_squares
+        }
+
+    @staticmethod
+    def from_dict(values: dict) -> 'LiveNetworkStats':
+        """
+        Detached statistics restored from `to_dict`, like a snapshot.
+        """
+        stats = LiveNetworkStats.__new__(LiveNetworkStats)
+        stats.__dict__.update(values)
+        stats.raw = None
+        for name in ['capacities', 'net_balances', 'imbalances']:
+            setattr(stats, name, Counter({value: count for value, count in values[name]}))
+        return stats
+
+    def snapshot(self) -> 'LiveNetworkStats':
+        """
+        Frozen copy of the current statistics that is not updated anymore.
+        """
+        snapshot = LiveNetworkStats.__new__(LiveNetworkStats)
+        snapshot.__dict__.update(self.__dict__)
+        snapshot.raw = None
+        snapshot.capacities = Counter(self.capacities)
+        snapshot.net_balances = Counter(self.net_balances)
+        snapshot.imbalances = Counter(self.imbalances)
+        return snapshot
@@ -1,31 +1,83 @@
-import random
 import time
 from itertools import cycle
 from typing import List, Tuple, Callable, Union
 
-import imageio
-import matplotlib.pyplot as plt
 import networkx as nx
 import os
 import numpy as np
 
 from raidensim.network.config import NetworkConfiguration
+from raidensim.network.csr_network import EdgeStreamWriter, CsrNetwork
+from raidensim.network.fork import NetworkFork
+from raidensim.network.random_streams import RandomStreams
 from raidensim.network.raw_network import RawNetwork
 from raidensim.network.node import Node
 from raidensim.types import Path
 
 
 class Network(object):
-    def __init__(self, config: NetworkConfiguration, join_nodes: bool = True):
+    def __init__(self, config: NetworkConfiguration, join_nodes: bool = True, bulk: bool = False):
         self.config = config
 
-        random.seed(0)
-        self.raw = RawNetwork()
+        self.streams = RandomStreams(config.seed)
+        self.config.fullness_dist.reseed(self.streams.seed_sequence('fullness'))
+        self.raw = RawNetwork(self.streams)
         self.cached_render_pos = None
         if join_nodes:
-            self.join_nodes()
+            if bulk:
+                self.join_nodes_bulk()
+            else:
+                self.join_nodes()
             self.raw.remove_isolated()
 
+    def join_nodes_bulk(self):
+        """
+        Joins all nodes in a single call to the join strategy's bulk construction. Nodes are
+        created exactly as in `join_nodes`.
+        """
+        print('Joining nodes in bulk.')
+        tic = time.time()
+        nodes = []
+        existing = set()
+        for i in range(self.config.num_nodes):
+            node = self._create_node(existing)
+            existing.add(node)
+            nodes.append(node)
+
+        self.raw.add_nodes_from(nodes)
+        self.config.join_strategy.build_bulk(self.raw, nodes)
+        print('Joined {} nodes in {:.2f} seconds.'.format(len(nodes), time.time() - tic))
+
+    def join_nodes_out_of_core(
+            self, directory: str, chunk_size: int = EdgeStreamWriter.CHUNK_SIZE
+    ) -> CsrNetwork:
+        """
+        Streams all channels to chunked, memory-mapped edge files in `directory` and returns the
+        finalized CSR view. Node values are drawn exactly as in `join_nodes_bulk`, but neither node
+        objects nor the networkx graph are created. Requires a join strategy with `build_stream`.
+        """
+        print('Joining nodes out of core.')
+        tic = time.time()
+        num_nodes = self.config.num_nodes
+        uids = np.empty(num_nodes, dtype=np.int64)
+        fullness = np.empty(num_nodes)
+        existing = set()
+        for i in range(num_nodes):
+            while True:
+                uid = int(self.streams.uid.integers(self.config.max_id))
+                node_fullness = self.config.fullness_dist.random()
+                if uid not in existing:
+                    break
+            existing.add(uid)
+            uids[i] = uid
+            fullness[i] = node_fullness
+
+        writer = EdgeStreamWriter(directory, chunk_size)
+        self.config.join_strategy.build_stream(writer, fullness)
+        csr = writer.finalize(uids, fullness)
+        print('Joined {} nodes in {:.2f} seconds.'.format(num_nodes, time.time() - tic))
+        return csr
+
     def join_nodes(self):
         print('Joining nodes.')
         tic = time.time()
@@ -35,22 +87,32 @@ class Network(object):
                 tic = toc
                 print('Joining node {}/{}'.format(i, self.config.num_nodes))
             self.join_single_node()
+        self.config.join_strategy.print_stats()
 
-    def join_single_node(self) -> Node:
+    def _create_node(self, existing) -> Node:
         while True:
-            uid = random.randrange(self.config.max_id)
+            uid = int(self.streams.uid.integers(self.config.max_id))
             fullness = self.config.fullness_dist.random()
             node = Node(uid, fullness)
-            if node not in self.raw:
-                break
+            if node not in existing:
+                return node
 
+    def join_single_node(self) -> Node:
+        node = self._create_node(self.raw)
         self.raw.add_node(node)
         self.config.join_strategy.join(self.raw, node)
         return node
 
+    def fork(self) -> NetworkFork:
+        """
+        Baseline of the current channel balances, frozen nodes and random streams that can be
+        restored with `revert` in O(touched channels). Only one fork should be open at a time.
+        """
+        return NetworkFork(self)
+
     def reset(self):
         print('Resetting network.')
-        random.seed(0)
+        self.streams.reset('transfer', 'churn')
         self.raw.reset_channels()
 
     def _calc_sector_angles(self, center, width):
@@ -70,6 +132,9 @@ class Network(object):
             labeling_strategy: Callable[[Node], str]=None,
             filepath: str=None
     ) -> bool:
+        # Imported on first use so that simulations without renderings never load matplotlib.
+        import matplotlib.pyplot as plt
+
         if not self.cached_render_pos or len(self.cached_render_pos) != self.raw.number_of_nodes():
             self.cached_render_pos = self.config.position_strategy.map(self.raw.nodes)
         first_pos = next(iter(self.cached_render_pos.values()))
@@ -94,11 +159,17 @@ class Network(object):
 
         channel_colors = ['lightgrey', 'r', 'g', 'b', 'c']
 
+        # Frozen nodes and their channels are not drawn.
+        if nodes is None:
+            nodes = self.raw.active_nodes
+        if channels is None:
+            channels = [(u, v) for u, v, e in self.raw.active_edges()]
+
         if isinstance(node_color, Callable):
-            node_color = [node_colors[node_color(u) % len(node_colors)] for u in self.raw.nodes]
+            node_color = [node_colors[node_color(u) % len(node_colors)] for u in nodes]
         if isinstance(channel_color, Callable):
             channel_color = [
-                channel_colors[channel_color(u, v) % len(channel_colors)] for u,v in self.raw.edges
+                channel_colors[channel_color(u, v) % len(channel_colors)] for u, v in channels
             ]
 
         nx.draw_networkx_nodes(
@@ -162,6 +233,8 @@ class Network(object):
             dirpath: str,
             channel_color: Union[Callable[[Node, Node], int], str] = 'lightgrey',
     ):
+        import imageio
+
         visited = {source}
         gif_filenames = []
 
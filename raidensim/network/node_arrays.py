@@ -0,0 +1,135 @@
+from typing import Dict, List, Iterable, Callable, Optional
+
+import numpy as np
+
+from raidensim.network.node import Node
+from raidensim.types import Fullness
+
+FullnessMapping = Callable[[Fullness], float]
+
+
+class NodeArrays(object):
+    """
+    Per-node NumPy columns indexed by the order in which nodes were first added to a network.
+    Mirrors the node attributes read by filters so that whole candidate arrays can be checked in a
+    single pass instead of one Python call per node.
+
+    Channel counters are kept in sync by the connection strategies via `increment`.
+
+    Strategies can also register fullness mappings (deposits, channel limits) through `mapped`.
+    Mapped values are resolved once per node when it is added instead of on every filter check.
+    """
+    COLUMNS = [
+        ('uid', np.int64),
+        ('fullness', float),
+        ('present', bool),
+        ('active', bool),
+        ('num_initiated_channels', np.int64),
+        ('num_accepted_channels', np.int64),
+        ('num_incoming_channels', np.int64),
+        ('num_outgoing_channels', np.int64)
+    ]
+    COUNTERS = [name for name, _ in COLUMNS if name.startswith('num_')]
+
+    def __init__(self, capacity: int = 1024):
+        self.index = {}  # type: Dict[Node, int]
+        self.nodes = []  # type: List[Node]
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.COLUMNS}
+        # Columns of registered mappings. Allocated on the first value to infer their dtype.
+        self.mapped_columns = {}  # type: Dict[FullnessMapping, Optional[np.array]]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getitem__(self, name: str) -> np.array:
+        return self.columns[name][:len(self.nodes)]
+
+    def _reserve(self, size: int):
+        capacity = len(self.columns['uid'])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for columns in [self.columns, self.mapped_columns]:
+            for name, column in columns.items():
+                if column is not None:
+                    grown = np.zeros(capacity, dtype=column.dtype)
+                    grown[:len(self.nodes)] = column[:len(self.nodes)]
+                    columns[name] = grown
+
+    def add(self, nodes: Iterable[Node]):
+        """
+        Registers nodes not seen before and marks all given nodes as present.
+        """
+        for node in nodes:
+            index = self.index.get(node)
+            if index is None:
+                index = len(self.nodes)
+                self._reserve(index + 1)
+                self.index[node] = index
+                self.nodes.append(node)
+                self.columns['uid'][index] = node.uid
+                self.columns['fullness'][index] = node.fullness
+                self.columns['active'][index] = True
+                for name in self.COUNTERS:
+                    self.columns[name][index] = node.get(name, 0)
+                for mapping in self.mapped_columns:
+                    self._set_mapped(mapping, index, [mapping(node.fullness)])
+            self.columns['present'][index] = True
+
+    def remove(self, nodes: Iterable[Node]):
+        """
+        Marks nodes as absent. Their index and counters are retained.
+        """
+        for node in nodes:
+            index = self.index.get(node)
+            if index is not None:
+                self.columns['present'][index] = False
+
+    def _set_mapped(self, mapping: FullnessMapping, start: int, values: List[float]):
+        column = self.mapped_columns[mapping]
+        if column is None:
+            values = np.array(values)
+            column = np.zeros(len(self.columns['uid']), dtype=values.dtype)
+            self.mapped_columns[mapping] = column
+        column[start:start + len(values)] = values
+
+    def mapped(self, mapping: FullnessMapping) -> np.array:
+        """
+        Values of a fullness mapping for all nodes. The mapping is registered on first use and
+        from then on evaluated exactly once for every added node.
+        """
+        if mapping not in self.mapped_columns:
+            self.mapped_columns[mapping] = None
+            if self.nodes:
+                self._set_mapped(mapping, 0, [mapping(node.fullness) for node in self.nodes])
+        column = self.mapped_columns[mapping]
+        if column is None:
+            return np.zeros(0)
+        return column[:len(self.nodes)]
+
+    def value(self, mapping: FullnessMapping, node: Node):
+        """
+        Mapped value of a single node as a Python scalar.
+        """
+        return self.mapped(mapping)[self.index[node]].item()
+
+    def indices(self, nodes: Iterable[Node]) -> np.array:
+        nodes = list(nodes)
+        return np.fromiter((self.index[node] for node in nodes), dtype=np.int64, count=len(nodes))
+
+    def present_indices(self) -> np.array:
+        return np.flatnonzero(self['present'])
+
+    def active_indices(self) -> np.array:
+        """
+        Indices of present nodes that are not frozen.
+        """
+        return np.flatnonzero(self['present'] & self['active'])
+
+    def increment(self, node: Node, name: str, value: int = 1):
+        """
+        Increments a channel counter on both the node dict and the corresponding column.
+        """
+        node[name] += value
+        self.columns[name][self.index[node]] += value
@@ -0,0 +1,48 @@
+from typing import Union
+
+import numpy as np
+
+Seed = Union[int, np.random.SeedSequence]
+
+
+def child_seed(seed: Seed, index: int) -> np.random.SeedSequence:
+    """
+    Derives the index-th independent child of a seed without mutating any spawn counters.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (index,))
+
+
+class RandomStreams(object):
+    """
+    Independent random number generators for the components of a simulation, all derived from a
+    single seed through a SeedSequence hierarchy. A component's stream only depends on the seed,
+    not on how much randomness other components consume, so networks and transfer sequences can be
+    reproduced exactly in other processes.
+
+    The fullness distribution owns its generator and is seeded with `seed_sequence('fullness')`.
+    All other components are available as generator attributes, e.g. `streams.transfer`.
+    """
+    COMPONENTS = ['fullness', 'uid', 'join', 'freeze', 'transfer', 'churn', 'workload']
+    GENERATORS = ['uid', 'join', 'freeze', 'transfer', 'churn', 'workload']
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self.uid = None
+        self.join = None
+        self.freeze = None
+        self.transfer = None
+        self.churn = None
+        self.workload = None
+        self.reset()
+
+    def seed_sequence(self, component: str) -> np.random.SeedSequence:
+        return child_seed(self.seed, self.COMPONENTS.index(component))
+
+    def reset(self, *components: str):
+        """
+        Restarts the streams of the given components, or of all components if none are given.
+        """
+        for component in components or self.GENERATORS:
+            setattr(self, component, np.random.default_rng(self.seed_sequence(component)))
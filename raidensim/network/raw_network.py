@@ -1,11 +1,18 @@
-import random
-from typing import Tuple, Callable, Iterator
+from typing import Tuple, Iterator, List, Iterable, Dict, Callable, Optional
 
 import networkx as nx
+import numpy as np
 import time
 
 from raidensim.types import Path
+from raidensim.network.capacity_index import CapacityIndex
+from raidensim.network.channel_type import ChannelType
+from raidensim.network.endpoint_sampler import EndpointSampler
+from raidensim.network.indexed_set import IndexedSet
+from raidensim.network.live_stats import LiveNetworkStats
 from raidensim.network.node import Node
+from raidensim.network.node_arrays import NodeArrays
+from raidensim.network.random_streams import RandomStreams
 
 
 class RawNetwork(nx.DiGraph):
@@ -23,16 +30,138 @@ class RawNetwork(nx.DiGraph):
         * "Imbalance" is the difference in capacities. On equal deposits this is the same as the
           net balance. Newly created channels always have a net balance of 0 but depending on their
           deposits differ in imbalance.
+        * Frozen nodes stay in the graph but are inactive. Channels are active if both of their
+          nodes are. Routing, transfer node sampling and stats only consider active elements.
+        * Every channel stores a `ChannelType` code under 'type', set by the connection strategy.
     """
 
-    def __init__(self):
+    def __init__(self, streams: RandomStreams = None):
         nx.DiGraph.__init__(self)
-        self.frozen_edges = []
+        self.frozen_nodes = IndexedSet()
+        # Present, active nodes. Allows O(1) sampling and updates under churn.
+        self.active_node_set = IndexedSet()
+        self.streams = streams if streams is not None else RandomStreams()
+        self.node_arrays = NodeArrays()
+        # Endpoint sampler of the most recent transfer value and channel filter.
+        self.endpoint_sampler = None  # type: EndpointSampler
+        # Channel statistics, only maintained once requested through `track_stats`.
+        self.live_stats = None  # type: LiveNetworkStats
+        # Channels bucketed by capacity, only maintained once requested through `index_capacities`.
+        self.capacity_index = None  # type: CapacityIndex
+        # Channel state before its first change, journaled while a `NetworkFork` is open.
+        self.balance_journal = None  # type: Dict[Tuple[Node, Node], Tuple[int, int]]
+
+    def add_node(self, node: Node, **attr):
+        nx.DiGraph.add_node(self, node, **attr)
+        self.node_arrays.add([node])
+        if node not in self.frozen_nodes:
+            self.active_node_set.add(node)
+
+    def add_nodes_from(self, nodes: Iterator[Node], **attr):
+        # networkx itself passes (node, data) tuples, e.g. when copying.
+        nodes = list(nodes)
+        nx.DiGraph.add_nodes_from(self, nodes, **attr)
+        nodes = [node[0] if isinstance(node, tuple) else node for node in nodes]
+        self.node_arrays.add(nodes)
+        self.active_node_set.update(node for node in nodes if node not in self.frozen_nodes)
+
+    def remove_node(self, node: Node):
+        self._remove_tracked_channels([node])
+        nx.DiGraph.remove_node(self, node)
+        self.node_arrays.remove([node])
+        self.active_node_set.discard(node)
+        self.frozen_nodes.discard(node)
+
+    def remove_nodes_from(self, nodes: Iterator[Node]):
+        nodes = list(nodes)
+        self._remove_tracked_channels(nodes)
+        nx.DiGraph.remove_nodes_from(self, nodes)
+        self.node_arrays.remove(nodes)
+        self.active_node_set.difference_update(nodes)
+        self.frozen_nodes.difference_update(nodes)
+
+    def _remove_tracked_channels(self, nodes: List[Node]):
+        if self.endpoint_sampler is not None:
+            self.endpoint_sampler.remove_nodes(nodes)
+        if self.capacity_index is not None:
+            self.capacity_index.remove_nodes(nodes)
+        if self.live_stats is not None:
+            for uv, vu in list(self.live_stats.active_channels_of(nodes)):
+                self.live_stats.remove_channel(uv, vu)
+
+    def track_stats(self) -> LiveNetworkStats:
+        """
+        Live channel statistics of the active network. Built with one pass over all channels on
+        the first call and kept up to date afterwards.
+        """
+        if self.live_stats is None:
+            self.live_stats = LiveNetworkStats(self)
+        return self.live_stats
+
+    def index_capacities(self) -> CapacityIndex:
+        """
+        Capacity index used by `eligible_partners`. Built with one pass over all channels on the
+        first call and kept up to date afterwards.
+        """
+        if self.capacity_index is None:
+            self.capacity_index = CapacityIndex(self)
+        return self.capacity_index
 
     @property
     def bi_edges(self) -> Iterator[Tuple[Node, Node, dict]]:
         return ((u, v, uv) for u, v, uv in self.edges(data=True) if u.uid < v.uid)
 
+    def is_active(self, node: Node) -> bool:
+        return node not in self.frozen_nodes
+
+    @property
+    def active_nodes(self) -> List[Node]:
+        nodes = self.node_arrays.nodes
+        return [nodes[i] for i in self.node_arrays.active_indices().tolist()]
+
+    def active_edges(
+            self, channel_types: int = ChannelType.ALL
+    ) -> Iterator[Tuple[Node, Node, dict]]:
+        """
+        Active channels, optionally restricted to a mask of channel types.
+        """
+        edges = self.edges(data=True)
+        if channel_types != ChannelType.ALL:
+            edges = ((u, v, e) for u, v, e in edges if e['type'] & channel_types)
+        if not self.frozen_nodes:
+            return iter(edges)
+        frozen = self.frozen_nodes
+        return ((u, v, e) for u, v, e in edges if u not in frozen and v not in frozen)
+
+    @property
+    def active_bi_edges(self) -> Iterator[Tuple[Node, Node, dict]]:
+        return ((u, v, uv) for u, v, uv in self.active_edges() if u.uid < v.uid)
+
+    def active_partners(self, u: Node) -> Iterator[Tuple[Node, dict]]:
+        """
+        Active outgoing channels of u as (partner, channel) pairs.
+        """
+        if not self.frozen_nodes:
+            return iter(self[u].items())
+        frozen = self.frozen_nodes
+        return ((v, e) for v, e in self[u].items() if v not in frozen)
+
+    def eligible_partners(self, u: Node, value: int) -> Iterator[Tuple[Node, dict]]:
+        """
+        Active outgoing channels of u that can carry `value`. Served from the capacity index if
+        enabled, largest capacities first. Otherwise in adjacency order.
+        """
+        if self.capacity_index is not None:
+            return self.capacity_index.eligible_partners(u, value)
+        return ((v, e) for v, e in self.active_partners(u) if e['capacity'] >= value)
+
+    def active_in_partners(self, v: Node) -> Iterator[Tuple[Node, dict]]:
+        """
+        Active incoming channels of v as (partner, channel) pairs.
+        """
+        frozen = self.frozen_nodes
+        return ((u, e) for u, e in self.pred[v].items() if u not in frozen)
+
     def remove_isolated(self):
         connected_nodes = {node for edge in self.edges for node in edge}
         isolated_nodes = [node for node in self.nodes if node not in connected_nodes]
@@ -40,20 +169,73 @@ class RawNetwork(nx.DiGraph):
             print('Removing {} isolated nodes: {}'.format(len(isolated_nodes), isolated_nodes))
             self.remove_nodes_from(isolated_nodes)
 
-    def setup_channel(self, u: Node, v: Node, deposit: int) -> None:
+    def setup_channel(
+            self, u: Node, v: Node, deposit: int, channel_type: int = ChannelType.GENERIC
+    ) -> None:
         e = {
             'deposit': deposit,
             'balance': 0,
             'capacity': deposit,
-            'num_transfers': 0
+            'num_transfers': 0,
+            'type': channel_type
         }
         self.add_edge(u, v, **e)
         self.update_channel_cache(u, v)
 
+    def setup_channels_bulk(
+            self,
+            nodes: List[Node],
+            initiators: np.array,
+            partners: np.array,
+            deposits: np.array,
+            channel_type: int = ChannelType.GENERIC
+    ) -> None:
+        """
+        Sets up bidirectional channels between nodes[initiators[k]] and nodes[partners[k]] in one
+        pass. Equivalent to calling `setup_channel` for both directions of each channel in order,
+        initiator direction first.
+        """
+        self.endpoint_sampler = None
+        self.live_stats = None
+        self.capacity_index = None
+        deposits_a = deposits[initiators]
+        deposits_b = deposits[partners]
+        imbalances = deposits_b - deposits_a
+
+        def edges():
+            for a, b, deposit_a, deposit_b, imbalance in zip(
+                    initiators.tolist(),
+                    partners.tolist(),
+                    deposits_a.tolist(),
+                    deposits_b.tolist(),
+                    imbalances.tolist()
+            ):
+                yield nodes[a], nodes[b], {
+                    'deposit': deposit_a,
+                    'balance': 0,
+                    'capacity': deposit_a,
+                    'num_transfers': 0,
+                    'net_balance': 0,
+                    'imbalance': imbalance,
+                    'type': channel_type
+                }
+                yield nodes[b], nodes[a], {
+                    'deposit': deposit_b,
+                    'balance': 0,
+                    'capacity': deposit_b,
+                    'num_transfers': 0,
+                    'net_balance': 0,
+                    'imbalance': -imbalance,
+                    'type': channel_type
+                }
+
+        self.add_edges_from(edges())
+
     def close_channel(self, other: Node) -> None:
         self.remove_edge(self, other)
 
     def reset_channels(self):
+        self.endpoint_sampler = None
         num_bi_channels = len(self.edges) // 2
         tic = time.time()
         for i, (u, v, uv) in enumerate(self.bi_edges):
@@ -63,50 +245,93 @@ class RawNetwork(nx.DiGraph):
                 print('Resetting channel {}/{}'.format(i, num_bi_channels))
 
             vu = self[v][u]
+            if self.balance_journal is not None:
+                self._journal(u, v, uv)
+                self._journal(v, u, vu)
             uv['balance'] = 0
             vu['balance'] = 0
             self.update_channel_cache(u, v, uv, vu)
 
+    def _journal(self, u: Node, v: Node, e: dict):
+        if (u, v) not in self.balance_journal:
+            self.balance_journal[(u, v)] = (e['balance'], e['num_transfers'])
+
     def freeze_random_nodes(self, num_nodes: int):
         """
-        Freeze all incoming edges of a set of random nodes.
+        Freeze a set of random nodes, replacing previously frozen nodes.
         """
         print('Freezing {} nodes.'.format(num_nodes))
         self.unfreeze_nodes()
-        freeze_nodes = random.sample(self.nodes, num_nodes)
-        self.frozen_edges += [
-            edge for node in freeze_nodes for edge in self.out_edges(node, data=True)
-        ]
-        self.frozen_edges += [
-            edge for node in freeze_nodes for edge in self.in_edges(node, data=True)
-        ]
-        self.remove_edges_from(self.frozen_edges)
-        self.remove_nodes_from(freeze_nodes)
-
-    def unfreeze_nodes(self):
-        self.add_edges_from(self.frozen_edges)
-        self.frozen_edges = []
+        candidates = self.node_arrays.present_indices()
+        indices = candidates[self.streams.freeze.choice(len(candidates), num_nodes, replace=False)]
+        self.freeze_nodes([self.node_arrays.nodes[i] for i in indices.tolist()])
+
+    def freeze_nodes(self, nodes: Iterable[Node]):
+        """
+        Deactivates nodes and all of their channels. Channels keep their state.
+        """
+        nodes = list(nodes)
+        if self.live_stats is not None:
+            for uv, vu in list(self.live_stats.active_channels_of(nodes)):
+                self.live_stats.remove_channel(uv, vu)
+        self.frozen_nodes.update(nodes)
+        self.active_node_set.difference_update(nodes)
+        self.node_arrays.columns['active'][self.node_arrays.indices(nodes)] = False
+        if self.endpoint_sampler is not None:
+            self.endpoint_sampler.update_nodes(nodes)
+
+    def unfreeze_nodes(self, nodes: Iterable[Node] = None):
+        """
+        Reactivates the given nodes or all frozen nodes.
+        """
+        if nodes is None:
+            nodes = list(self.frozen_nodes)
+        else:
+            nodes = [node for node in nodes if node in self.frozen_nodes]
+        self.frozen_nodes.difference_update(nodes)
+        self.active_node_set.update(nodes)
+        self.node_arrays.columns['active'][self.node_arrays.indices(nodes)] = True
+        if self.endpoint_sampler is not None:
+            self.endpoint_sampler.update_nodes(nodes)
+        if self.live_stats is not None:
+            for uv, vu in self.live_stats.active_channels_of(nodes):
+                self.live_stats.add_channel(uv, vu)
 
     def get_available_nodes(
-            self, transfer_value: int, channel_filter: Callable[[Node, Node, dict], bool]=None
+            self, transfer_value: int, channel_types: int = ChannelType.ALL
     ) -> Tuple[Node, Node]:
-        for i in range(1000):
-            source, target = random.sample(self.nodes, 2)
-            if any(
-                True for u, v, e in self.out_edges(source, data=True) if channel_filter(u, v, e)
-            ) and any(
-                e['capacity'] >= transfer_value
-                for u, v, e in self.out_edges(source, data=True)
-                if not channel_filter or channel_filter(u, v, e)
-            ) and any(
-                True for u, v, e in self.in_edges(target, data=True) if channel_filter(u, v, e)
-            ) and any(
-                e['deposit'] - e['net_balance'] + e['imbalance'] >= transfer_value
-                for u, v, e in self.in_edges(target, data=True)
-                if not channel_filter or channel_filter(u, v, e)
-            ):
-                return source, target
-        raise ValueError('Max attempts of finding transfer nodes reached.')
+        """
+        Draws two distinct active nodes that both have an active outgoing channel of one of the
+        given types with a capacity of at least `transfer_value`.
+
+        Valid endpoints are kept in an `EndpointSampler` that is updated on every channel change.
+        It is rebuilt only when the transfer value or channel types change.
+        """
+        return self.endpoints(transfer_value, channel_types).sample()
+
+    def endpoints(
+            self, transfer_value: int, channel_types: int = ChannelType.ALL
+    ) -> EndpointSampler:
+        """
+        The cached `EndpointSampler` of the given transfer value and channel types, built if
+        necessary. Does not draw from any random stream.
+        """
+        sampler = self.endpoint_sampler
+        if sampler is None or not sampler.matches(self, transfer_value, channel_types):
+            sampler = EndpointSampler(self, transfer_value, channel_types)
+            self.endpoint_sampler = sampler
+        return sampler
+
+    def sample_node_pair(self, nodes: List[Node]) -> Tuple[Node, Node]:
+        """
+        Draws two distinct nodes uniformly from the transfer stream.
+        """
+        rng = self.streams.transfer
+        i = int(rng.integers(len(nodes)))
+        j = int(rng.integers(len(nodes) - 1))
+        if j >= i:
+            j += 1
+        return nodes[i], nodes[j]
 
     def update_channel_cache(self, u: Node, v: Node, uv: dict=None, vu: dict=None):
         if uv is None:
@@ -114,6 +339,10 @@ class RawNetwork(nx.DiGraph):
         if vu is None:
             vu = self[v].get(u)
         if uv is not None and vu is not None:
+            stats = self.live_stats
+            tracked = stats is not None and self.is_active(u) and self.is_active(v)
+            if tracked and 'imbalance' in uv:
+                stats.remove_channel(uv, vu)
             net_balance = uv['balance'] - vu['balance']
             uv['net_balance'] = net_balance
             vu['net_balance'] = -net_balance
@@ -124,6 +353,26 @@ class RawNetwork(nx.DiGraph):
             imbalance = deposit_b - deposit_a + 2 * net_balance
             uv['imbalance'] = imbalance
             vu['imbalance'] = -imbalance
+            if tracked:
+                stats.add_channel(uv, vu)
+            if self.capacity_index is not None:
+                self.capacity_index.update_channel(u, v, uv)
+                self.capacity_index.update_channel(v, u, vu)
+            if self.endpoint_sampler is not None:
+                self.endpoint_sampler.update_channel(u, v, uv)
+                self.endpoint_sampler.update_channel(v, u, vu)
+
+    def cheapest_path(
+            self, source: Node, target: Node, cost: Callable[[Node, Node, dict], Optional[float]]
+    ) -> Path:
+        """
+        Path of the lowest total cost. Channels with a cost of None are skipped. Returns an empty
+        path if the target cannot be reached.
+        """
+        try:
+            return nx.dijkstra_path(self, source, target, weight=cost)
+        except nx.NetworkXNoPath:
+            return []
 
     def do_transfer(self, path: Path, value: int):
         for i in range(len(path) - 1):
@@ -133,6 +382,9 @@ class RawNetwork(nx.DiGraph):
             vu = self[v][u]
             if uv['capacity'] < value:
                 print('Warning: Transfer ({} -> {}: {}) exceeds capacity.'.format(u, v, value))
+            if self.balance_journal is not None:
+                self._journal(u, v, uv)
+                self._journal(v, u, vu)
             uv['balance'] += value
             uv['num_transfers'] += 1
             vu['num_transfers'] += 1
@@ -1,7 +1,29 @@
 from .scaling import simulate_scaling
 from .routing import simulate_routing
+from .churn import ChurnScheduler
+from .sweep import run_sweep, grid
+from .replication import replicate, ReplicationStats
+from .workload import (
+    generate_trace,
+    load_trace,
+    UniformWorkload,
+    ZipfWorkload,
+    LocalityWorkload,
+    BurstyWorkload
+)
 
 __all__ = [
     'simulate_scaling',
-    'simulate_routing'
+    'simulate_routing',
+    'ChurnScheduler',
+    'run_sweep',
+    'grid',
+    'replicate',
+    'ReplicationStats',
+    'generate_trace',
+    'load_trace',
+    'UniformWorkload',
+    'ZipfWorkload',
+    'LocalityWorkload',
+    'BurstyWorkload'
 ]
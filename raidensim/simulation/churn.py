@@ -0,0 +1,91 @@
+import numpy as np
+
+from raidensim.network.network import Network
+
+
+class ChurnScheduler(object):
+    """
+    Random node churn during transfer simulations. Rates are expected numbers of events per
+    transfer step: active nodes going offline, offline nodes coming back online and new nodes
+    joining through the configured join strategy. Event counts are Poisson distributed and drawn
+    in batches from the network's churn stream.
+
+    Offline nodes are frozen, so their channels are kept and restored when they come back. All
+    changes go through the incremental indexes of the network (activity mask, active node set and
+    node arrays), so a step never rebuilds or scans the whole network.
+
+    Note: churn permanently changes the network. Joined nodes stay and offline nodes stay frozen
+    after the simulation. A `NetworkFork` can revert the latter but not the former.
+    """
+    BATCH_SIZE = 1024
+
+    def __init__(
+            self,
+            net: Network,
+            offline_rate: float = 0.0,
+            online_rate: float = 0.0,
+            join_rate: float = 0.0
+    ):
+        self.net = net
+        self.rates = np.array([offline_rate, online_rate, join_rate])
+        self.events = np.zeros((0, 3), dtype=np.int64)
+        self.event_index = 0
+        self.num_offline = 0
+        self.num_online = 0
+        self.num_joined = 0
+
+    @classmethod
+    def balanced(
+            cls, net: Network, churn: float, num_transfers: int = 1000, join_fraction: float = 0.0
+    ) -> 'ChurnScheduler':
+        """
+        Scheduler under which the given fraction of active nodes churns every `num_transfers`
+        transfers. Nodes go offline and come back at the same rate. Additionally, the active node
+        count grows by `join_fraction` over the same interval.
+        """
+        num_active = len(net.raw.active_node_set)
+        rate = churn * num_active / num_transfers
+        return cls(net, rate, rate, join_fraction * num_active / num_transfers)
+
+    def step(self):
+        """
+        Applies the churn events of one transfer step.
+        """
+        if not self.rates.any():
+            return
+        if self.event_index == len(self.events):
+            self.events = self.net.streams.churn.poisson(self.rates, (self.BATCH_SIZE, 3))
+            self.event_index = 0
+        num_offline, num_online, num_joins = self.events[self.event_index].tolist()
+        self.event_index += 1
+
+        raw = self.net.raw
+        if num_offline:
+            nodes = self._sample(raw.active_node_set, num_offline)
+            raw.freeze_nodes(nodes)
+            self.num_offline += len(nodes)
+        if num_online:
+            nodes = self._sample(raw.frozen_nodes, num_online)
+            raw.unfreeze_nodes(nodes)
+            self.num_online += len(nodes)
+        for _ in range(num_joins):
+            self.net.join_single_node()
+            self.num_joined += 1
+
+    def _sample(self, nodes, n: int) -> list:
+        """
+        n distinct random nodes of an indexed set. Positions are drawn with rejection of duplicates,
+        so the cost depends on n rather than on the size of the set.
+        """
+        n = min(n, len(nodes))
+        rng = self.net.streams.churn
+        positions = {}
+        while len(positions) < n:
+            for position in rng.integers(len(nodes), size=n - len(positions)).tolist():
+                positions.setdefault(position)
+        return [nodes[position] for position in positions]
+
+    def print_stats(self):
+        print('Churn: {} nodes went offline, {} came back online, {} joined.'.format(
+            self.num_offline, self.num_online, self.num_joined
+        ))
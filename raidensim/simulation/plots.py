@@ -0,0 +1,346 @@
+import math
+import os
+from itertools import cycle
+from typing import List, Dict, Union
+
+import imageio
+import matplotlib.pyplot as plt
+import matplotlib.ticker as mtick
+from matplotlib.collections import LineCollection
+import numpy as np
+
+from raidensim.network.channel_type import ChannelType
+from raidensim.network.live_stats import LiveNetworkStats
+from raidensim.network.network import Network
+from raidensim.network.node import Node
+from raidensim.simulation.scaling import ConstantNetworkStats, SimulationStats, load_results
+from raidensim.types import Path
+
+
+def plot_stats(
+        stats: ConstantNetworkStats,
+        pre_stats: LiveNetworkStats,
+        post_stats: LiveNetworkStats,
+        sim_stats: SimulationStats,
+        dirpath: str
+):
+    print('Plotting stats.')
+
+    records = sim_stats.records
+    success = records['success']
+    transfer_ids = np.arange(len(records))
+
+    max_capacity = max(pre_stats.max_capacity, post_stats.max_capacity)
+    max_net_balance = max(pre_stats.max_net_balance, post_stats.max_net_balance)
+    max_imbalance = max(pre_stats.max_imbalance, post_stats.max_imbalance)
+
+    # Plots.
+    fig, axs = plt.subplots(3, 5)
+    fig.set_size_inches(22, 10)
+
+    def add_labels(ax, labels: List[str], align='right'):
+        x = 0.97 if align == 'right' else 0.03
+        for line, label in enumerate(labels):
+            ax.text(
+                x, 0.93 - line * 0.07, label, transform=ax.transAxes, horizontalalignment=align
+            )
+
+    formatter = mtick.EngFormatter()
+
+    ax = axs[0][0]
+    ax.set_title('Channel capacity before')
+    x, y = zip(*pre_stats.capacities.items())
+    ax.bar(x, y, ec='k')
+    add_labels(ax, ['Depleted: {}'.format(pre_stats.num_depleted_channels)])
+    ax.set_xlim(-1, max_capacity + 1)
+    ax.yaxis.set_major_formatter(formatter)
+    ax.xaxis.set_ticks(range(0, max_capacity + 1, 5))
+    ax.xaxis.set_ticks(range(0, max_capacity + 1, 1), minor=True)
+
+    ax = axs[1][0]
+    ax.set_title('Channel capacity after')
+    x, y = zip(*post_stats.capacities.items())
+    ax.bar(x, y, ec='k')
+    add_labels(ax, ['Depleted: {}'.format(post_stats.num_depleted_channels)])
+    ax.set_xlim(-1, max_capacity + 1)
+    ax.xaxis.set_ticks(range(0, max_capacity + 1, 5))
+    ax.xaxis.set_ticks(range(0, max_capacity + 1, 1), minor=True)
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax = axs[0][1]
+    ax.set_title('Abs. channel net balance before')
+    x, y = zip(*pre_stats.net_balances.items())
+    ax.bar(x, y, ec='k')
+    add_labels(ax, ['SD: {:.2f}'.format(pre_stats.net_balance_stdev)])
+    ax.set_xlim(-1, max_net_balance + 1)
+    ax.xaxis.set_ticks(range(0, max_net_balance + 1, 5))
+    ax.xaxis.set_ticks(range(0, max_net_balance + 1, 1), minor=True)
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax = axs[1][1]
+    ax.set_title('Abs. channel net balance after')
+    x, y = zip(*post_stats.net_balances.items())
+    ax.bar(x, y, ec='k')
+    add_labels(ax, ['SD: {:.2f}'.format(post_stats.net_balance_stdev)])
+    ax.set_xlim(-1, max_net_balance + 1)
+    ax.xaxis.set_ticks(range(0, max_net_balance + 1, 5))
+    ax.xaxis.set_ticks(range(0, max_net_balance + 1, 1), minor=True)
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax = axs[0][2]
+    ax.set_title('Channel imbalance before')
+    x, y = zip(*pre_stats.imbalances.items())
+    ax.bar(x, y, ec='k')
+    add_labels(ax, ['SD: {:.2f}'.format(pre_stats.imbalance_stdev)])
+    ax.set_xlim(-1, max_imbalance + 1)
+    ax.xaxis.set_ticks(range(0, max_imbalance + 1, 5))
+    ax.xaxis.set_ticks(range(0, max_imbalance + 1, 1), minor=True)
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax = axs[1][2]
+    ax.set_title('Channel imbalance after')
+    x, y = zip(*post_stats.imbalances.items())
+    ax.bar(x, y, ec='k')
+    add_labels(ax, ['SD: {:.2f}'.format(post_stats.imbalance_stdev)])
+    ax.set_xlim(-1, max_imbalance + 1)
+    ax.xaxis.set_ticks(range(0, max_imbalance + 1, 5))
+    ax.xaxis.set_ticks(range(0, max_imbalance + 1, 1), minor=True)
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax = axs[0][3]
+    ax.set_title('Channel count per node')
+    log_count = int(math.log2(stats.max_channel_count)) + 1
+    x, y = zip(*stats.channel_counts.items())
+    ax.bar(x, y, width=np.array(x) / 4, ec='k')
+    add_labels(ax, ['Mean: {:.2f}'.format(stats.avg_channel_count)])
+    ax.set_xscale('log', basex=2)
+    ax.xaxis.set_ticks([2 ** exp for exp in range(log_count + 1)])
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax = axs[0][4]
+    ax.set_title('Channel distances > 1')
+    log_min_distance = int(math.log2(stats.min_distance))
+    log_max_distance = int(math.log2(stats.max_distance)) + 1
+    x, y = zip(*stats.channel_distances.items())
+    ax.bar(x, y, width=np.array(x) / 4, ec='k')
+    ax.set_xscale('log', basex=2)
+    ax.xaxis.set_ticks([2 ** exp for exp in range(log_min_distance, log_max_distance + 1)])
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax = axs[1][3]
+    ax.set_title('Failed transfers over time')
+    ax.hist(
+        transfer_ids[~success], bins=80, range=[0, sim_stats.num_transfers], ec='k'
+    )
+    add_labels(ax, ['Total: {}'.format(sim_stats.num_failed)])
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax = axs[2][0]
+    ax.set_title('Fees over time')
+    bin_scale = sim_stats.num_transfers / 80
+    ax.hist(transfer_ids[success], bins=80, weights=records['fee'][success] / bin_scale, ec='k')
+    add_labels(ax, ['Mean: {:.2f}'.format(sim_stats.avg_fee)])
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax = axs[2][1]
+    ax.set_title('Fee per distance')
+    ax.scatter(records['distance'][success], records['fee'][success], s=1, marker='+')
+    add_labels(ax, ['Mean fee per distance: {:.2f}'.format(sim_stats.avg_fee_per_distance)])
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax = axs[2][2]
+    ax.set_title('Hops per transfer')
+    ax.hist(
+        records['hops'][success],
+        bins=range(sim_stats.max_transfer_hops + 2),
+        range=[0, sim_stats.max_transfer_hops],
+        align='left',
+        ec='k'
+    )
+    add_labels(ax, ['Mean: {:.2f}'.format(sim_stats.avg_transfer_hops)])
+    ax.xaxis.set_ticks(range(0, sim_stats.max_transfer_hops + 1, 5))
+    ax.xaxis.set_ticks(range(0, sim_stats.max_transfer_hops + 1, 1), minor=True)
+    ax.yaxis.set_major_formatter(formatter)
+
+    # Stats plot (labels only).
+    ax = axs[1][4]
+    labels = [
+        'Simulation name: {}'.format(sim_stats.name),
+        '',
+        'Nodes: {}'.format(stats.num_nodes),
+        'Channels (unidirectional): {}'.format(pre_stats.num_channels_uni),
+        'Required channels/node: {}'.format(stats.num_required_channels),
+        'Transfers: {}'.format(sim_stats.num_transfers),
+        'Channel types: {}'.format(', '.join(
+            '{} {}'.format(count, ChannelType.NAMES[channel_type])
+            for channel_type, count in sorted(stats.channel_type_counts.items())
+        )),
+        '',
+        'Average nodes contacted: {:.2f}'.format(sim_stats.avg_contacted)
+    ]
+    for line, label in enumerate(labels):
+        ax.text(0, 0.95 - line * 0.07, label)
+
+    axs[1][4].axis('off')
+    axs[2][3].axis('off')
+    axs[2][4].axis('off')
+
+    fig.savefig(os.path.join(dirpath, 'stats'), bbox_inches='tight')
+
+
+def plot_checkpoints(checkpoints: np.array, dirpath: str):
+    print('Plotting checkpoints.')
+    fields = [
+        ('depleted_fraction', 'Depleted channel fraction'),
+        ('net_balance_stdev', 'Net balance SD'),
+        ('failure_rate', 'Failure rate'),
+        ('mean_hops', 'Mean hops'),
+        ('mean_contacted', 'Mean nodes contacted')
+    ]
+    fig, axs = plt.subplots(1, len(fields))
+    fig.set_size_inches(22, 4)
+    for ax, (field, title) in zip(axs, fields):
+        ax.set_title(title)
+        ax.plot(checkpoints['transfer'], checkpoints[field], marker='.')
+        ax.set_xlabel('Transfers')
+        ax.xaxis.set_major_formatter(mtick.EngFormatter())
+
+    fig.savefig(os.path.join(dirpath, 'checkpoints'), bbox_inches='tight')
+
+
+def plot_depleted_channels(net: Network, transfer_value: int, dirpath: str):
+    print('Rendering depleted channels.')
+    channels = [(u, v) for u, v, e in net.raw.active_edges() if e['capacity'] < transfer_value]
+    net.draw(
+        channels=channels, filepath=os.path.join(dirpath, 'depleted_channels'), channel_color='r'
+    )
+
+
+def plot_transfer_failures(
+        net: Network, failure_recordings: List[Dict[str, Union[Node, List[Path]]]], dirpath: str
+):
+    if failure_recordings:
+        print('Rendering transfer failures.')
+    for i, fail_history in enumerate(failure_recordings):
+        source = fail_history['source']
+        target = fail_history['target']
+        dirpath = os.path.join(dirpath, 'fail_{}_{}'.format(source.uid, target.uid))
+        net.draw_gif(source, target, fail_history['path_history'], 100, dirpath)
+        dirpath = os.path.dirname(dirpath)
+
+
+def draw_layout(
+        layout: Dict[str, np.array],
+        filepath: str,
+        channels: np.array = None,
+        channel_color: str = 'lightgrey',
+        paths: List[List[int]] = None,
+        highlighted_nodes: List[List[int]] = None
+):
+    """
+    Draws a network saved by `save_results` like `Network.draw`. Nodes are node array indices and
+    channels are index pairs, all active channels by default.
+    """
+    positions = layout['positions']
+    if channels is None:
+        channels = layout['channels']
+
+    plt.clf()
+    fig = plt.gcf()
+    fig.set_size_inches(12, 12)
+    ax = fig.add_subplot(111)
+    ax.axis('off')
+    xlim, ylim = layout['plot_limits']
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+
+    active_positions = positions[layout['active_nodes']]
+    ax.scatter(active_positions[:, 0], active_positions[:, 1], s=1, c='grey')
+    ax.add_collection(LineCollection(positions[channels], colors=channel_color, linewidths=1))
+
+    if paths:
+        edges = [(path[i], path[i + 1]) for path in paths for i in range(len(path) - 1)]
+        edges = np.array(edges, dtype=np.int64).reshape(-1, 2)
+        ax.add_collection(LineCollection(positions[edges], colors='b', linewidths=1))
+
+    if highlighted_nodes:
+        for nodes, color in zip(highlighted_nodes, cycle(['grey', 'r', 'g', 'b', 'c'])):
+            node_positions = positions[list(nodes)]
+            ax.scatter(node_positions[:, 0], node_positions[:, 1], s=8, c=color)
+
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    fig.savefig(filepath)
+
+
+def draw_layout_gif(
+        layout: Dict[str, np.array],
+        source: int,
+        target: int,
+        path_history: List[List[int]],
+        max_frames: int,
+        dirpath: str
+):
+    visited = {source}
+    filenames = []
+    os.makedirs(dirpath, exist_ok=True)
+    for isp, subpath in enumerate(path_history[:max_frames]):
+        visited |= set(subpath)
+        filename = os.path.join(dirpath, 'step_{:04d}.png'.format(isp))
+        filenames.append(filename)
+        draw_layout(
+            layout,
+            filename,
+            channels=np.zeros((0, 2), dtype=np.int64),
+            paths=[subpath],
+            highlighted_nodes=[visited, [source, target]]
+        )
+
+    with imageio.get_writer(os.path.join(dirpath, 'animation.gif'), mode='I', fps=3) as writer:
+        for filename in filenames:
+            writer.append_data(imageio.imread(filename))
+
+
+def render_results(dirpath: str):
+    """
+    Renders all plots of a headless simulation from the results saved in `dirpath`.
+    """
+    print('Rendering results in {}.'.format(dirpath))
+    results = load_results(dirpath)
+    plot_stats(
+        results['stats'],
+        results['pre_stats'],
+        results['post_stats'],
+        results['sim_stats'],
+        dirpath
+    )
+    if results['checkpoints'] is not None:
+        plot_checkpoints(results['checkpoints'], dirpath)
+
+    layout = results['layout']
+    if layout is None:
+        print('No network layout saved. Skipping network renderings.')
+        return
+    print('Rendering network.')
+    draw_layout(layout, os.path.join(dirpath, 'network'))
+    print('Rendering depleted channels.')
+    depleted = layout['capacities'] < results['transfer_value']
+    draw_layout(
+        layout,
+        os.path.join(dirpath, 'depleted_channels'),
+        channels=layout['channels'][depleted],
+        channel_color='r'
+    )
+    if results['failures']:
+        print('Rendering transfer failures.')
+    for failure in results['failures']:
+        source = failure['source']
+        target = failure['target']
+        uids = layout['uids']
+        draw_layout_gif(
+            layout,
+            source,
+            target,
+            failure['path_history'],
+            100,
+            os.path.join(dirpath, 'fail_{}_{}'.format(uids[source], uids[target]))
+        )
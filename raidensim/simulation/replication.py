@@ -0,0 +1,264 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from statistics import NormalDist
+from typing import Callable, Dict, List, Tuple, Any
+
+import numpy as np
+
+from raidensim.network.network import Network
+from raidensim.simulation.scaling import simulate_transfers
+from raidensim.strategy.fee_strategy import FeeStrategy
+from raidensim.strategy.routing.routing_strategy import RoutingStrategy
+
+SeededNetworkFactory = Callable[[int], Network]
+SimulationFactory = Callable[..., Tuple[FeeStrategy, RoutingStrategy]]
+
+
+class RunningMean(object):
+    """
+    Streaming mean and variance (Welford). Batches of values are merged with the parallel update of
+    Chan et al., so values never need to be kept.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, values: np.array):
+        values = np.asarray(values, dtype=float)
+        if len(values):
+            self.merge(len(values), values.mean(), ((values - values.mean()) ** 2).sum())
+
+    def merge(self, count: int, mean: float, m2: float):
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else math.inf
+
+    def half_width(self, quantile: float) -> float:
+        """
+        Half width of the confidence interval of the mean for the given normal or t quantile.
+        """
+        if self.count < 2:
+            return math.inf
+        return quantile * math.sqrt(self.variance / self.count)
+
+
+def wilson_interval(successes: int, count: int, z: float) -> Tuple[float, float]:
+    """
+    Wilson score interval of a success rate. Unlike the normal approximation it stays within [0, 1]
+    and does not collapse for rates close to 0 or 1.
+    """
+    if not count:
+        return 0.0, 1.0
+    rate = successes / count
+    denominator = 1 + z ** 2 / count
+    center = (rate + z ** 2 / (2 * count)) / denominator
+    spread = z * math.sqrt(rate * (1 - rate) / count + z ** 2 / (4 * count ** 2)) / denominator
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+
+def t_quantile(confidence: float, dof: int) -> float:
+    """
+    Two-sided Student t quantile, e.g. 2.776 for 95% and 4 degrees of freedom. Exact closed forms
+    for 1 and 2 degrees of freedom. Otherwise the Cornish-Fisher expansion around the normal
+    quantile, which is accurate to about 1% for 3 or more degrees of freedom and avoids importing
+    scipy.
+    """
+    p = 0.5 + confidence / 2
+    if dof < 1:
+        return math.inf
+    if dof == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if dof == 2:
+        a = 2 * p - 1
+        return a * math.sqrt(2 / (1 - a ** 2))
+    z = NormalDist().inv_cdf(p)
+    return z + (z ** 3 + z) / (4 * dof) + \
+        (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * dof ** 2) + \
+        (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * dof ** 3)
+
+
+class ReplicationStats(object):
+    """
+    Outcomes aggregated over replications. Transfers of one replication share a network and its
+    balance history, so each replication is a single sample: its success rate and the mean hops of
+    its successful transfers. Confidence intervals of both are Student t intervals over these
+    samples (Welford mean and variance).
+
+    The Wilson interval of all transfers pooled over replications is reported as well. It ignores
+    the variance between replications and is not used for stopping.
+    """
+
+    def __init__(self, confidence: float = 0.95):
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.confidence = confidence
+        self.num_replications = 0
+        self.num_transfers = 0
+        self.num_successful = 0
+        self.success_rates = RunningMean()
+        self.hops = RunningMean()
+
+    def add(self, outcome: Dict[str, Any]):
+        self.num_replications += 1
+        self.num_transfers += outcome['num_transfers']
+        self.num_successful += outcome['num_successful']
+        self.success_rates.add([outcome['success_rate']])
+        # Replications without a successful transfer have no mean hops.
+        if outcome['num_successful']:
+            self.hops.add([outcome['mean_hops']])
+
+    def _half_width(self, mean: RunningMean) -> float:
+        return mean.half_width(t_quantile(self.confidence, mean.count - 1))
+
+    @property
+    def success_half_width(self) -> float:
+        return self._half_width(self.success_rates)
+
+    @property
+    def success_interval(self) -> Tuple[float, float]:
+        half_width = self.success_half_width
+        mean = self.success_rates.mean
+        return max(0.0, mean - half_width), min(1.0, mean + half_width)
+
+    @property
+    def hops_half_width(self) -> float:
+        return self._half_width(self.hops)
+
+    @property
+    def pooled_success_interval(self) -> Tuple[float, float]:
+        return wilson_interval(self.num_successful, self.num_transfers, self.z)
+
+    def is_precise(self, success_precision: float, hops_precision: float) -> bool:
+        return self.success_half_width <= success_precision and \
+            self.hops_half_width <= hops_precision
+
+    def summary(self) -> Dict[str, float]:
+        low, high = self.success_interval
+        pooled_low, pooled_high = self.pooled_success_interval
+        return {
+            'num_replications': self.num_replications,
+            'num_transfers': self.num_transfers,
+            'confidence': self.confidence,
+            'success_rate': self.success_rates.mean,
+            'success_rate_low': low,
+            'success_rate_high': high,
+            'mean_hops': self.hops.mean,
+            'mean_hops_half_width': self.hops_half_width,
+            'pooled_success_rate_low': pooled_low,
+            'pooled_success_rate_high': pooled_high
+        }
+
+
+def run_replication(
+        network_factory: SeededNetworkFactory,
+        simulation_factory: SimulationFactory,
+        seed: int,
+        num_transfers: int,
+        transfer_value: int
+) -> Dict[str, Any]:
+    """
+    Builds the network of one seed, simulates random transfers on it and reduces the outcomes to
+    the per-replication samples aggregated by `ReplicationStats`.
+    """
+    net = network_factory(seed)
+    fee_strategy, routing_strategy = simulation_factory(net.config)
+    stats = simulate_transfers(
+        net.raw,
+        num_transfers,
+        transfer_value,
+        net.config.position_strategy,
+        routing_strategy,
+        fee_strategy,
+        True,
+        0,
+        'replication_{}'.format(seed)
+    )
+    hops = stats.records['hops'][stats.records['success']]
+    return {
+        'seed': seed,
+        'num_transfers': stats.num_transfers,
+        'num_successful': len(hops),
+        'success_rate': len(hops) / stats.num_transfers if stats.num_transfers else 0.0,
+        'mean_hops': float(hops.mean()) if len(hops) else math.nan
+    }
+
+
+def replicate(
+        network_factory: SeededNetworkFactory,
+        simulation_factory: SimulationFactory,
+        num_transfers: int,
+        transfer_value: int,
+        success_precision: float = 0.01,
+        hops_precision: float = 0.05,
+        confidence: float = 0.95,
+        min_replications: int = 4,
+        max_replications: int = 100,
+        max_workers: int = None,
+        first_seed: int = 0
+) -> Tuple[ReplicationStats, List[Dict[str, Any]]]:
+    """
+    Runs independent replications of a simulation until the confidence intervals of the success
+    rate and of the mean hops across replications are narrower than the requested half widths, or
+    `max_replications` is reached. At least `min_replications` replications are run so that the
+    variance between them can be estimated.
+
+    `network_factory(seed)` builds a network whose `NetworkConfiguration` uses the given seed.
+    `simulation_factory(config)` returns the fee and routing strategies. Both must be picklable.
+
+    Replications run on a process pool in seed order. Outcomes are aggregated as they complete;
+    once the precision is reached, pending replications are cancelled and finished ones beyond it
+    are still included. Returns the aggregate and the outcome of every replication.
+    """
+    max_workers = max_workers or os.cpu_count()
+    stats = ReplicationStats(confidence)
+    outcomes = []
+    next_seed = first_seed
+    last_seed = first_seed + max_replications
+    running = set()
+
+    def done() -> bool:
+        return stats.num_replications >= min_replications and \
+            stats.is_precise(success_precision, hops_precision)
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        while running or (next_seed < last_seed and not done()):
+            while next_seed < last_seed and len(running) < max_workers and not done():
+                running.add(executor.submit(
+                    run_replication,
+                    network_factory,
+                    simulation_factory,
+                    next_seed,
+                    num_transfers,
+                    transfer_value
+                ))
+                next_seed += 1
+
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                outcome = future.result()
+                outcomes.append(outcome)
+                stats.add(outcome)
+            print('{} replications: success rate {:.4f} +- {:.4f}, hops {:.3f} +- {:.3f}'.format(
+                stats.num_replications,
+                stats.success_rates.mean,
+                stats.success_half_width,
+                stats.hops.mean,
+                stats.hops_half_width
+            ))
+
+            if done():
+                # Replications that already started cannot be cancelled and are still included.
+                running = {future for future in running if not future.cancel()}
+
+    outcomes.sort(key=lambda outcome: outcome['seed'])
+    return stats, outcomes
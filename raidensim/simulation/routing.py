@@ -1,5 +1,4 @@
-import random
-from typing import List, Tuple, Callable
+from typing import List, Tuple
 
 import shutil
 
@@ -7,6 +6,7 @@ import os
 
 import math
 
+from raidensim.network.channel_type import ChannelType
 from raidensim.network.network import Network
 from raidensim.network.node import Node
 from raidensim.strategy.position_strategy import LatticePositionStrategy
@@ -27,17 +27,22 @@ def simulate_routing(
     shutil.rmtree(dirpath, ignore_errors=True)
     os.makedirs(dirpath, exist_ok=True)
 
+    # Transfer endpoints in lattice networks need a lattice channel.
     if isinstance(net.config.position_strategy, LatticePositionStrategy):
-        def channel_filter(u: Node, v: Node, e: dict) -> bool:
-            return net.config.position_strategy.distance(u, v) == 1
+        endpoint_channel_types = ChannelType.LATTICE
     else:
-        def channel_filter(u: Node, v: Node, e: dict) -> bool:
-            return True
+        endpoint_channel_types = ChannelType.ALL
 
     plot_network(net, dirpath)
     plot_sample_nodes(net, num_sample_nodes, dirpath)
     plot_sample_routes(
-        net, num_paths, channel_filter, routing_strategies, transfer_value, max_gif_frames, dirpath
+        net,
+        num_paths,
+        endpoint_channel_types,
+        routing_strategies,
+        transfer_value,
+        max_gif_frames,
+        dirpath
     )
 
 
@@ -63,7 +68,9 @@ def plot_sample_nodes(net: Network, num_nodes: int, dirpath: str):
 
     print('Plotting connectivity of {} random sample nodes.'.format(num_nodes))
 
-    for i, node in enumerate(random.sample(net.raw.nodes, num_nodes)):
+    nodes = net.raw.active_nodes
+    sample_indices = net.streams.transfer.choice(len(nodes), num_nodes, replace=False)
+    for i, node in enumerate(nodes[i] for i in sample_indices):
         channels = list(net.raw.out_edges(node))
 
         def node_color(color_node: Node):
@@ -81,7 +88,7 @@ def plot_sample_nodes(net: Network, num_nodes: int, dirpath: str):
 def plot_sample_routes(
         net: Network,
         num_paths: int,
-        end_node_channel_filter: Callable[[Node, Node, dict], bool],
+        endpoint_channel_types: int,
         routing_strategies: List[Tuple[str, RoutingStrategy]],
         transfer_value: int,
         max_gif_frames: int,
@@ -92,7 +99,7 @@ def plot_sample_routes(
         dirpath = os.path.join(dirpath, 'nodes_{}'.format(ip))
         os.makedirs(dirpath, exist_ok=True)
 
-        source, target = net.raw.get_available_nodes(transfer_value, end_node_channel_filter)
+        source, target = net.raw.get_available_nodes(transfer_value, endpoint_channel_types)
         net.draw(
             channels=[],
             highlighted_nodes=[[], [source, target]],
@@ -1,16 +1,17 @@
-import math
+import json
 import os
 import time
-from typing import List, Dict, Union
+from typing import Dict, Union
 from collections import Counter
 
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mtick
 import numpy as np
 
+from raidensim.network.channel_type import ChannelType
+from raidensim.network.live_stats import LiveNetworkStats
 from raidensim.network.network import Network
-from raidensim.network.node import Node
 from raidensim.network.raw_network import RawNetwork
+from raidensim.simulation.churn import ChurnScheduler
+from raidensim.simulation.transfer_log import TransferLog, TRANSFER_DTYPE
 from raidensim.strategy.fee_strategy import FeeStrategy
 from raidensim.strategy.position_strategy import PositionStrategy, LatticePositionStrategy
 from raidensim.strategy.routing.routing_strategy import RoutingStrategy
@@ -18,13 +19,18 @@ from raidensim.types import Path
 
 
 class ConstantNetworkStats:
+    COUNTERS = ['channel_counts', 'channel_distances', 'channel_type_counts']
+
     def __init__(self, net: Network):
         print('Collecting constant network stats.')
 
         raw = net.raw
-        self.num_nodes = raw.number_of_nodes()
+        active_nodes = raw.active_nodes
+        self.num_nodes = len(active_nodes)
         self.num_required_channels = net.config.join_strategy.num_required_channels
-        self.channel_counts = Counter(num_channels for node, num_channels in raw.out_degree)
+        self.channel_counts = Counter(
+            sum(1 for _ in raw.active_partners(node)) for node in active_nodes
+        )
         self.max_channel_count = max(self.channel_counts.keys())
         self.avg_channel_count = sum(
             num_channels * count for num_channels, count in self.channel_counts.items()
@@ -32,54 +38,110 @@ class ConstantNetworkStats:
 
         # Note: channel distance evaluation can be disabled for some performance gains.
         self.channel_distances = Counter(
-            net.config.position_strategy.distance(u, v) for u, v, e in raw.bi_edges
+            net.config.position_strategy.distance(u, v) for u, v, e in raw.active_bi_edges
         )
         self.max_distance = max(self.channel_distances.keys())
         self.min_distance = min(self.channel_distances.keys())
 
+        self.channel_type_counts = Counter(e['type'] for u, v, e in raw.active_bi_edges)
 
-class MutableNetworkStats:
-    BALANCE_BIN_SIZE = 1
-
-    def __init__(self, net: Network):
-        print('Collecting mutable network stats.')
-
-        raw = net.raw
-        self.capacities = Counter(e['capacity'] for u, v, e in raw.edges(data=True))
-        self.max_capacity = max(self.capacities.keys())
+    def to_dict(self) -> dict:
+        """
+        JSON-serializable copy of the statistics. Counters are stored as [value, count] pairs.
+        """
+        values = dict(self.__dict__)
+        for name in self.COUNTERS:
+            values[name] = sorted(values[name].items())
+        return values
 
-        self.net_balances = Counter(abs(e['net_balance']) for u, v, e in raw.bi_edges)
-        self.max_net_balance = max(self.net_balances.keys())
+    @classmethod
+    def from_dict(cls, values: dict) -> 'ConstantNetworkStats':
+        stats = cls.__new__(cls)
+        stats.__dict__.update(values)
+        for name in cls.COUNTERS:
+            setattr(stats, name, Counter({value: count for value, count in values[name]}))
+        return stats
 
-        self.imbalances = Counter(abs(e['imbalance']) for u, v, e in raw.bi_edges)
-        self.max_imbalance = max(self.imbalances)
 
-        self.num_channels_uni = raw.number_of_edges()
-        self.num_depleted_channels = sum(1 for e in raw.edges.values() if e['capacity'] == 0)
+# Networks with more nodes are neither rendered nor saved for rendering.
+MAX_RENDERED_NODES = 50000
 
-        self.net_balance_stdev = math.sqrt(
-            sum(count * x ** 2 for x, count in self.net_balances.items()) / len(self.net_balances)
-        )
-        self.imbalance_stdev = math.sqrt(
-            sum(count * x ** 2 for x, count in self.imbalances.items()) / len(self.imbalances)
-        )
+# Aggregates over the transfers since the previous checkpoint and the channel state at the end.
+CHECKPOINT_DTYPE = np.dtype([
+    ('transfer', np.int64),
+    ('depleted_fraction', float),
+    ('net_balance_stdev', float),
+    ('failure_rate', float),
+    ('mean_hops', float),
+    ('mean_contacted', float)
+])
 
 
 class SimulationStats:
+    """
+    Per-transfer records of a simulation. Aggregates are computed from the record columns by
+    `finalize`.
+    """
     name = ''
     num_transfers = 0
+    num_skipped = 0
+    num_failed = 0
     avg_transfer_hops = 0
     max_transfer_hops = 0
     avg_contacted = 0
     avg_fee = 0
     avg_fee_per_distance = 0
 
-    def __init__(self):
-        self.transfer_hops = []
-        self.failed = []
+    def __init__(self, log: TransferLog = None):
+        self.log = log if log is not None else TransferLog()
+        self.records = np.zeros(0, dtype=TRANSFER_DTYPE)
         self.failure_recordings = []
-        self.fees = []
-        self.fees_per_distance = []
+        self.checkpoints = np.zeros(0, dtype=CHECKPOINT_DTYPE)
+
+    @classmethod
+    def from_records(cls, records: np.array, name: str = '') -> 'SimulationStats':
+        """
+        Stats of previously logged records, e.g. loaded through `TransferLog.load`.
+        """
+        stats = cls()
+        stats.name = name
+        stats.log.chunks.append(records)
+        stats.finalize()
+        return stats
+
+    def finalize(self):
+        records = self.log.records()
+        self.records = records
+        self.num_transfers = len(records)
+        success = records['success']
+        hops = records['hops'][success]
+        self.num_skipped = int(np.count_nonzero(records['skipped']))
+        self.num_failed = self.num_transfers - self.num_skipped - len(hops)
+        if len(hops):
+            fees = records['fee'][success]
+            self.avg_fee = fees.mean()
+            self.avg_fee_per_distance = (fees / records['distance'][success]).mean()
+            self.avg_transfer_hops = hops.mean()
+            self.max_transfer_hops = int(hops.max())
+            self.avg_contacted = records['contacted'][success].mean()
+
+    def summary(self) -> Dict[str, Union[str, int, float]]:
+        """
+        Aggregates as plain Python values, e.g. for results tables or JSON.
+        """
+        num_attempted = self.num_transfers - self.num_skipped
+        return {
+            'name': self.name,
+            'num_transfers': self.num_transfers,
+            'num_skipped': self.num_skipped,
+            'num_failed': self.num_failed,
+            'failure_rate': self.num_failed / num_attempted if num_attempted else 0.0,
+            'avg_transfer_hops': float(self.avg_transfer_hops),
+            'max_transfer_hops': self.max_transfer_hops,
+            'avg_contacted': float(self.avg_contacted),
+            'avg_fee': float(self.avg_fee),
+            'avg_fee_per_distance': float(self.avg_fee_per_distance)
+        }
 
 
 def simulate_scaling(
@@ -92,16 +154,43 @@ def simulate_scaling(
         routing_strategy: RoutingStrategy,
         name: str,
         max_recorded_failures: int,
-        credit_transfers=True
-):
+        credit_transfers=True,
+        churn: ChurnScheduler = None,
+        checkpoint_interval: int = 0,
+        trace: np.array = None,
+        index_capacities: bool = False,
+        reset: bool = True,
+        headless: bool = False
+) -> str:
     """
-    Simulates network transfers under the given fee model and plots some statistics.
+    Simulates network transfers under the given fee model and plots some statistics. An optional
+    churn scheduler takes nodes offline, brings them back and joins new nodes between transfers.
+
+    With a checkpoint interval, aggregates are recorded every `checkpoint_interval` transfers,
+    saved to `checkpoints.npy` and plotted over time.
+
+    Per-transfer records are streamed to `transfers.bin` (see `TRANSFER_DTYPE`). If a trace (see
+    `generate_trace`) is given, its transfers are replayed instead of sampling random ones.
+    Traces with large or varying transfer values benefit from `index_capacities`.
+
+    The network is reset before the simulation unless `reset` is False, e.g. because the caller
+    reverts a `NetworkFork` instead.
+
+    Headless runs do not plot anything. They save the results (see `save_results`) instead, which
+    can be rendered later by `render_results`. Returns the results directory.
     """
-    net.reset()
+    if reset:
+        net.reset()
+
+    dirpath = os.path.join(out_dir, 'scaling_{}_{}_{}'.format(
+        net.config.num_nodes, num_transfers, name
+    ))
+    os.makedirs(dirpath, exist_ok=True)
 
     # Baseline data.
     stats = ConstantNetworkStats(net)
-    pre_stats = MutableNetworkStats(net)
+    live_stats = net.raw.track_stats()
+    pre_stats = live_stats.snapshot()
 
     # Simulation.
     sim_stats = simulate_transfers(
@@ -113,27 +202,129 @@ def simulate_scaling(
         fee_strategy,
         credit_transfers,
         max_recorded_failures,
-        name
+        name,
+        churn,
+        checkpoint_interval,
+        os.path.join(dirpath, 'transfers.bin'),
+        trace,
+        index_capacities
     )
 
     # Post-simulation evaluation.
-    post_stats = MutableNetworkStats(net)
+    post_stats = live_stats.snapshot()
 
-    dirpath = os.path.join(out_dir, 'scaling_{}_{}_{}'.format(
-        net.config.num_nodes, num_transfers, name
-    ))
-    os.makedirs(dirpath, exist_ok=True)
+    if len(sim_stats.checkpoints):
+        np.save(os.path.join(dirpath, 'checkpoints.npy'), sim_stats.checkpoints)
+
+    if headless:
+        save_results(net, dirpath, stats, pre_stats, post_stats, sim_stats, transfer_value)
+        return dirpath
+
+    # Imported here so that headless runs never load matplotlib.
+    from raidensim.simulation.plots import (
+        plot_stats,
+        plot_checkpoints,
+        plot_depleted_channels,
+        plot_transfer_failures
+    )
 
     # Plot stuff.
     plot_stats(stats, pre_stats, post_stats, sim_stats, dirpath)
+    if len(sim_stats.checkpoints):
+        plot_checkpoints(sim_stats.checkpoints, dirpath)
 
-    if net.config.num_nodes < 50000:
+    if net.config.num_nodes < MAX_RENDERED_NODES:
         print('Rendering network.')
         net.draw(filepath=os.path.join(dirpath, 'network'))
     else:
         print('Too many nodes to reasonably render. Skipping.')
     plot_depleted_channels(net, transfer_value, dirpath)
     plot_transfer_failures(net, sim_stats.failure_recordings, dirpath)
+    return dirpath
+
+
+def save_results(
+        net: Network,
+        dirpath: str,
+        stats: ConstantNetworkStats,
+        pre_stats: LiveNetworkStats,
+        post_stats: LiveNetworkStats,
+        sim_stats: SimulationStats,
+        transfer_value: int
+):
+    """
+    Writes everything `render_results` needs to plot a simulation later, next to the transfer log:
+    `summary.json` with all statistics and recorded failures and, for networks small enough to be
+    rendered, `layout.npz` with node positions and channels.
+
+    Nodes are referenced by their node array index, like in the transfer log.
+    """
+    print('Saving results.')
+    raw = net.raw
+    node_index = raw.node_arrays.index
+    failures = [{
+        'source': node_index[failure['source']],
+        'target': node_index[failure['target']],
+        'path_history': [
+            [node_index[node] for node in subpath] for subpath in failure['path_history']
+        ]
+    } for failure in sim_stats.failure_recordings]
+
+    summary = {
+        'transfer_value': transfer_value,
+        'simulation': sim_stats.summary(),
+        'network': stats.to_dict(),
+        'pre_stats': pre_stats.to_dict(),
+        'post_stats': post_stats.to_dict(),
+        'failures': failures
+    }
+    with open(os.path.join(dirpath, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    if net.config.num_nodes >= MAX_RENDERED_NODES:
+        return
+    position_strategy = net.config.position_strategy
+    nodes = raw.node_arrays.nodes
+    positions = [np.atleast_1d(position_strategy.map(node)) for node in nodes]
+    if positions and len(positions[0]) > 2:
+        print('Warning: Cannot draw networks with rank higher than 2.')
+        return
+    positions = np.array([np.append(pos, [0] * (2 - len(pos))) for pos in positions])
+    channels = np.array(
+        [(node_index[u], node_index[v], e['capacity']) for u, v, e in raw.active_edges()],
+        dtype=np.int64
+    ).reshape(-1, 3)
+    np.savez(
+        os.path.join(dirpath, 'layout.npz'),
+        positions=positions,
+        uids=raw.node_arrays['uid'],
+        active_nodes=raw.node_arrays.active_indices(),
+        channels=channels[:, :2],
+        capacities=channels[:, 2],
+        plot_limits=np.array(position_strategy.plot_limits, dtype=float)
+    )
+
+
+def load_results(dirpath: str) -> dict:
+    """
+    Results of a simulation saved by `save_results`. Statistics are restored as their respective
+    objects, the layout is None if the network was not saved.
+    """
+    with open(os.path.join(dirpath, 'summary.json')) as f:
+        summary = json.load(f)
+    records = TransferLog.load(os.path.join(dirpath, 'transfers.bin'))
+    checkpoints_path = os.path.join(dirpath, 'checkpoints.npy')
+    layout_path = os.path.join(dirpath, 'layout.npz')
+    return {
+        'transfer_value': summary['transfer_value'],
+        'stats': ConstantNetworkStats.from_dict(summary['network']),
+        'pre_stats': LiveNetworkStats.from_dict(summary['pre_stats']),
+        'post_stats': LiveNetworkStats.from_dict(summary['post_stats']),
+        'sim_stats': SimulationStats.from_records(records, summary['simulation']['name']),
+        'checkpoints': np.load(checkpoints_path) if os.path.exists(checkpoints_path) else None,
+        'layout': dict(np.load(layout_path)) if os.path.exists(layout_path) else None,
+        'failures': summary['failures']
+    }
 
 
 def simulate_transfers(
@@ -145,24 +336,62 @@ def simulate_transfers(
         fee_strategy: FeeStrategy,
         credit_transfers: bool,
         max_recorded_failures: int,
-        name: str
+        name: str,
+        churn: ChurnScheduler = None,
+        checkpoint_interval: int = 0,
+        log_path: str = None,
+        trace: np.array = None,
+        index_capacities: bool = False
 ) -> SimulationStats:
     """
-    Perform transfers between random nodes.
+    Perform transfers between random nodes. Every `checkpoint_interval` transfers, the
+    `CHECKPOINT_DTYPE` aggregates are recorded in O(1) from the network's live statistics.
+
+    Transfers are recorded in a `TransferLog`, written to `log_path` if given.
+
+    With a trace, its first `num_transfers` transfers are replayed, including their values, so that
+    different strategies see identical workloads. Trace transfers from or to inactive nodes, or
+    from sources without a channel that can carry the value, are recorded as skipped. They do not
+    count as failures.
+
+    With `index_capacities`, routing strategies only iterate channels that can carry the value of
+    each transfer (see `CapacityIndex`). This can change how ties between partners are broken.
     """
-    num_channels_uni = raw.number_of_edges()
+    live_stats = raw.track_stats()
+    if index_capacities:
+        raw.index_capacities()
+    num_channels_uni = live_stats.num_channels_uni
     print('Simulating {} transfers between {} nodes over {} bidirectional channels.'.format(
-        num_transfers, raw.number_of_nodes(), num_channels_uni // 2
+        num_transfers, len(raw.active_nodes), num_channels_uni // 2
     ))
 
+    # Transfer endpoints in lattice networks need a lattice channel.
     if isinstance(position_strategy, LatticePositionStrategy):
-        def channel_filter(u: Node, v: Node, e: dict) -> bool:
-            return position_strategy.distance(u, v) == 1
+        endpoint_channel_types = ChannelType.LATTICE
     else:
-        def channel_filter(u: Node, v: Node, e: dict) -> bool:
-            return True
+        endpoint_channel_types = ChannelType.ALL
+
+    if trace is not None:
+        if num_transfers > len(trace):
+            raise ValueError('Trace only contains {} transfers.'.format(len(trace)))
+        trace_sources = trace['source']
+        trace_targets = trace['target']
+        trace_values = trace['value']
+
+    stats = SimulationStats(TransferLog(log_path))
+    stats.name = name
+    nodes = raw.node_arrays.nodes
+    node_index = raw.node_arrays.index
+    num_failed = 0
+    num_skipped = 0
+    if checkpoint_interval:
+        stats.checkpoints = np.zeros(num_transfers // checkpoint_interval, dtype=CHECKPOINT_DTYPE)
+    num_checkpoints = 0
+    window_failed = 0
+    window_skipped = 0
+    window_hops = 0
+    window_contacted = 0
 
-    stats = SimulationStats()
     tic = time.time()
     subtic = tic
     for i in range(num_transfers):
@@ -172,46 +401,97 @@ def simulate_transfers(
             subtic = toc
             print('Transfer {}/{}'.format(i + 1, num_transfers))
 
-        source, target = raw.get_available_nodes(transfer_value, channel_filter)
-
-        path, path_history = routing_strategy.route(raw, source, target, transfer_value)
-        if path:
-            fee = get_path_fee(raw, path, fee_strategy, transfer_value)
-            stats.avg_fee += fee
-            stats.fees.append((i, fee))
+        if churn:
+            churn.step()
+        if trace is None:
+            value = transfer_value
+            source, target = raw.get_available_nodes(value, endpoint_channel_types)
+        else:
+            value = int(trace_values[i])
+            source = nodes[trace_sources[i]]
+            target = nodes[trace_targets[i]]
 
-            distance = position_strategy.distance(source, target)
-            fee_per_distance = fee / distance
-            stats.avg_fee_per_distance += fee_per_distance
-            stats.fees_per_distance.append((distance, fee))
+        skipped = trace is not None and not (
+            raw.is_active(source) and raw.is_active(target) and
+            next(raw.eligible_partners(source, value), None) is not None
+        )
+        route_tic = time.perf_counter()
+        if skipped:
+            path, path_history = [], []
+        else:
+            path, path_history = routing_strategy.route(raw, source, target, value)
+        route_time = time.perf_counter() - route_tic
+        distance = position_strategy.distance(source, target)
+        if skipped:
+            fee = 0
+            hops = 0
+            contacted = 0
+            num_skipped += 1
+            window_skipped += 1
+        elif path:
+            fee = get_path_fee(raw, path, fee_strategy, value)
             if credit_transfers:
-                raw.do_transfer(path, transfer_value)
+                raw.do_transfer(path, value)
 
-            stats.transfer_hops.append(len(path) - 1)
-            stats.avg_transfer_hops += len(path) - 1
-            stats.avg_contacted += len({node for subpath in path_history for node in subpath})
+            hops = len(path) - 1
+            contacted = len({node for subpath in path_history for node in subpath})
+            window_hops += hops
+            window_contacted += contacted
         else:
             print('No Path found from {} to {} that could sustain {} token(s).'.format(
-                source, target, transfer_value
+                source, target, value
             ))
-            stats.failed.append(i)
+            fee = 0
+            hops = 0
+            contacted = 0
+            num_failed += 1
+            window_failed += 1
             if len(stats.failure_recordings) < max_recorded_failures:
                 stats.failure_recordings.append({
                     'source': source,
                     'target': target,
                     'path_history': path_history
                 })
+        stats.log.append(
+            node_index[source],
+            node_index[target],
+            bool(path),
+            skipped,
+            hops,
+            fee,
+            distance,
+            contacted,
+            route_time
+        )
+
+        if checkpoint_interval and (i + 1) % checkpoint_interval == 0:
+            window_attempted = checkpoint_interval - window_skipped
+            window_success = window_attempted - window_failed
+            num_channels_uni = live_stats.num_channels_uni
+            depleted_fraction = np.nan
+            if num_channels_uni:
+                depleted_fraction = live_stats.num_depleted_channels / num_channels_uni
+            stats.checkpoints[num_checkpoints] = (
+                i + 1,
+                depleted_fraction,
+                live_stats.net_balance_channel_stdev,
+                window_failed / window_attempted if window_attempted else np.nan,
+                window_hops / window_success if window_success else np.nan,
+                window_contacted / window_success if window_success else np.nan
+            )
+            num_checkpoints += 1
+            window_failed = 0
+            window_skipped = 0
+            window_hops = 0
+            window_contacted = 0
 
     toc = time.time()
-    num_success = num_transfers - len(stats.failed)
-    stats.num_transfers = num_transfers
-    stats.name = name
-    stats.avg_fee /= num_success
-    stats.avg_fee_per_distance /= num_success
-    stats.avg_transfer_hops /= num_success
-    stats.max_transfer_hops = max(stats.transfer_hops)
-    stats.avg_contacted /= num_success
-    print('Finished after {} seconds. {} transfers failed.'.format(toc - tic, len(stats.failed)))
+    stats.finalize()
+    print('Finished after {} seconds. {} transfers failed, {} skipped.'.format(
+        toc - tic, num_failed, num_skipped
+    ))
+    if churn:
+        churn.print_stats()
     return stats
 
 
@@ -225,190 +505,3 @@ def get_path_fee(
         e = raw.get_edge_data(u, v)
         fee += fee_strategy.get_fee(u, v, e, transfer_value)
     return fee
-
-
-def plot_stats(
-        stats: ConstantNetworkStats,
-        pre_stats: MutableNetworkStats,
-        post_stats: MutableNetworkStats,
-        sim_stats: SimulationStats,
-        dirpath: str
-):
-    print('Plotting stats.')
-
-    max_capacity = max(pre_stats.max_capacity, post_stats.max_capacity)
-    max_net_balance = max(pre_stats.max_net_balance, post_stats.max_net_balance)
-    max_imbalance = max(pre_stats.max_imbalance, post_stats.max_imbalance)
-
-    # Plots.
-    fig, axs = plt.subplots(3, 5)
-    fig.set_size_inches(22, 10)
-
-    def add_labels(ax, labels: List[str], align='right'):
-        x = 0.97 if align == 'right' else 0.03
-        for line, label in enumerate(labels):
-            ax.text(
-                x, 0.93 - line * 0.07, label, transform=ax.transAxes, horizontalalignment=align
-            )
-
-    formatter = mtick.EngFormatter()
-
-    ax = axs[0][0]
-    ax.set_title('Channel capacity before')
-    x, y = zip(*pre_stats.capacities.items())
-    ax.bar(x, y, ec='k')
-    add_labels(ax, ['Depleted: {}'.format(pre_stats.num_depleted_channels)])
-    ax.set_xlim(-1, max_capacity + 1)
-    ax.yaxis.set_major_formatter(formatter)
-    ax.xaxis.set_ticks(range(0, max_capacity + 1, 5))
-    ax.xaxis.set_ticks(range(0, max_capacity + 1, 1), minor=True)
-
-    ax = axs[1][0]
-    ax.set_title('Channel capacity after')
-    x, y = zip(*post_stats.capacities.items())
-    ax.bar(x, y, ec='k')
-    add_labels(ax, ['Depleted: {}'.format(post_stats.num_depleted_channels)])
-    ax.set_xlim(-1, max_capacity + 1)
-    ax.xaxis.set_ticks(range(0, max_capacity + 1, 5))
-    ax.xaxis.set_ticks(range(0, max_capacity + 1, 1), minor=True)
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax = axs[0][1]
-    ax.set_title('Abs. channel net balance before')
-    x, y = zip(*pre_stats.net_balances.items())
-    ax.bar(x, y, ec='k')
-    add_labels(ax, ['SD: {:.2f}'.format(pre_stats.net_balance_stdev)])
-    ax.set_xlim(-1, max_net_balance + 1)
-    ax.xaxis.set_ticks(range(0, max_net_balance + 1, 5))
-    ax.xaxis.set_ticks(range(0, max_net_balance + 1, 1), minor=True)
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax = axs[1][1]
-    ax.set_title('Abs. channel net balance after')
-    x, y = zip(*post_stats.net_balances.items())
-    ax.bar(x, y, ec='k')
-    add_labels(ax, ['SD: {:.2f}'.format(post_stats.net_balance_stdev)])
-    ax.set_xlim(-1, max_net_balance + 1)
-    ax.xaxis.set_ticks(range(0, max_net_balance + 1, 5))
-    ax.xaxis.set_ticks(range(0, max_net_balance + 1, 1), minor=True)
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax = axs[0][2]
-    ax.set_title('Channel imbalance before')
-    x, y = zip(*pre_stats.imbalances.items())
-    ax.bar(x, y, ec='k')
-    add_labels(ax, ['SD: {:.2f}'.format(pre_stats.imbalance_stdev)])
-    ax.set_xlim(-1, max_imbalance + 1)
-    ax.xaxis.set_ticks(range(0, max_imbalance + 1, 5))
-    ax.xaxis.set_ticks(range(0, max_imbalance + 1, 1), minor=True)
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax = axs[1][2]
-    ax.set_title('Channel imbalance after')
-    x, y = zip(*post_stats.imbalances.items())
-    ax.bar(x, y, ec='k')
-    add_labels(ax, ['SD: {:.2f}'.format(post_stats.imbalance_stdev)])
-    ax.set_xlim(-1, max_imbalance + 1)
-    ax.xaxis.set_ticks(range(0, max_imbalance + 1, 5))
-    ax.xaxis.set_ticks(range(0, max_imbalance + 1, 1), minor=True)
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax = axs[0][3]
-    ax.set_title('Channel count per node')
-    log_count = int(math.log2(stats.max_channel_count)) + 1
-    x, y = zip(*stats.channel_counts.items())
-    ax.bar(x, y, width=np.array(x) / 4, ec='k')
-    add_labels(ax, ['Mean: {:.2f}'.format(stats.avg_channel_count)])
-    ax.set_xscale('log', basex=2)
-    ax.xaxis.set_ticks([2 ** exp for exp in range(log_count + 1)])
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax = axs[0][4]
-    ax.set_title('Channel distances > 1')
-    log_min_distance = int(math.log2(stats.min_distance))
-    log_max_distance = int(math.log2(stats.max_distance)) + 1
-    x, y = zip(*stats.channel_distances.items())
-    ax.bar(x, y, width=np.array(x) / 4, ec='k')
-    ax.set_xscale('log', basex=2)
-    ax.xaxis.set_ticks([2 ** exp for exp in range(log_min_distance, log_max_distance + 1)])
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax = axs[1][3]
-    ax.set_title('Failed transfers over time')
-    ax.hist(
-        sim_stats.failed, bins=80, range=[0, sim_stats.num_transfers], ec='k'
-    )
-    add_labels(ax, ['Total: {}'.format(len(sim_stats.failed))])
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax = axs[2][0]
-    ax.set_title('Fees over time')
-    transfer_ids, fees = zip(*sim_stats.fees)
-    bin_scale = sim_stats.num_transfers / 80
-    fees = [fee / bin_scale for fee in fees]
-    ax.hist(transfer_ids, bins=80, weights=fees, ec='k')
-    add_labels(ax, ['Mean: {:.2f}'.format(sim_stats.avg_fee)])
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax = axs[2][1]
-    ax.set_title('Fee per distance')
-    distances, fees = zip(*sim_stats.fees_per_distance)
-    ax.scatter(distances, fees, s=1, marker='+')
-    add_labels(ax, ['Mean fee per distance: {:.2f}'.format(sim_stats.avg_fee_per_distance)])
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax = axs[2][2]
-    ax.set_title('Hops per transfer')
-    ax.hist(
-        sim_stats.transfer_hops,
-        bins=range(sim_stats.max_transfer_hops + 2),
-        range=[0, sim_stats.max_transfer_hops],
-        align='left',
-        ec='k'
-    )
-    add_labels(ax, ['Mean: {:.2f}'.format(sim_stats.avg_transfer_hops)])
-    ax.xaxis.set_ticks(range(0, sim_stats.max_transfer_hops + 1, 5))
-    ax.xaxis.set_ticks(range(0, sim_stats.max_transfer_hops + 1, 1), minor=True)
-    ax.yaxis.set_major_formatter(formatter)
-
-    # Stats plot (labels only).
-    ax = axs[1][4]
-    labels = [
-        'Simulation name: {}'.format(sim_stats.name),
-        '',
-        'Nodes: {}'.format(stats.num_nodes),
-        'Channels (unidirectional): {}'.format(pre_stats.num_channels_uni),
-        'Required channels/node: {}'.format(stats.num_required_channels),
-        'Transfers: {}'.format(sim_stats.num_transfers),
-        '',
-        'Average nodes contacted: {:.2f}'.format(sim_stats.avg_contacted)
-    ]
-    for line, label in enumerate(labels):
-        ax.text(0, 0.95 - line * 0.07, label)
-
-    axs[1][4].axis('off')
-    axs[2][3].axis('off')
-    axs[2][4].axis('off')
-
-    fig.savefig(os.path.join(dirpath, 'stats'), bbox_inches='tight')
-
-
-def plot_depleted_channels(net: Network, transfer_value: int, dirpath: str):
-    print('Rendering depleted channels.')
-    channels = [(u, v) for (u, v), e in net.raw.edges.items() if e['capacity'] < transfer_value]
-    net.draw(
-        channels=channels, filepath=os.path.join(dirpath, 'depleted_channels'), channel_color='r'
-    )
-
-
-def plot_transfer_failures(
-        net: Network, failure_recordings: List[Dict[str, Union[Node, List[Path]]]], dirpath: str
-):
-    if failure_recordings:
-        print('Rendering transfer failures.')
-    for i, fail_history in enumerate(failure_recordings):
-        source = fail_history['source']
-        target = fail_history['target']
-        dirpath = os.path.join(dirpath, 'fail_{}_{}'.format(source.uid, target.uid))
-        net.draw_gif(source, target, fail_history['path_history'], 100, dirpath)
-        dirpath = os.path.dirname(dirpath)
@@ -0,0 +1,193 @@
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Any, Tuple
+
+from raidensim.network.channel_type import ChannelType
+from raidensim.network.network import Network
+from raidensim.simulation.scaling import simulate_transfers
+from raidensim.simulation.workload import generate_trace, UniformWorkload, Workload
+from raidensim.strategy.fee_strategy import FeeStrategy
+from raidensim.strategy.position_strategy import LatticePositionStrategy
+from raidensim.strategy.routing.routing_strategy import RoutingStrategy
+
+Params = Dict[str, Any]
+NetworkFactory = Callable[..., Network]
+SimulationFactory = Callable[..., Tuple[FeeStrategy, RoutingStrategy]]
+
+# Peak memory per node of a sweep job, including channels, indexes and the trace. Measured with
+# tracemalloc for the Kademlia networks of bin/sweep.py, about 7 directed channels per node:
+# 8.9 kB at 1000 nodes and 6.4 kB at 5000 nodes, rounded up. Excludes the fixed interpreter
+# overhead of each worker process. Denser networks should pass their own `memory_estimate`.
+BYTES_PER_NODE = 10000
+
+
+def grid(parameters: Dict[str, List[Any]]) -> List[Params]:
+    """
+    Cartesian product of parameter values, e.g. {'a': [1, 2], 'b': [3]} -> [{'a': 1, 'b': 3}, ...].
+    """
+    names = sorted(parameters)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(parameters[name] for name in names))
+    ]
+
+
+def estimate_memory(network_params: Params) -> int:
+    """
+    Default memory estimate of a network job, based on `BYTES_PER_NODE`. Uses the 'num_nodes'
+    parameter if present.
+    """
+    return network_params.get('num_nodes', 10000) * BYTES_PER_NODE
+
+
+def available_memory() -> int:
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_AVPHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return 2 ** 34
+
+
+def run_network_job(
+        network_factory: NetworkFactory,
+        simulation_factory: SimulationFactory,
+        network_params: Params,
+        simulation_grid: List[Params],
+        num_transfers: int,
+        transfer_value: int,
+        workload: Workload,
+        trace_path: str
+) -> List[Params]:
+    """
+    Builds one network and runs all simulation grid points on it. Every point replays the same
+    trace from the same baseline, restored through a `NetworkFork`.
+    """
+    tic = time.time()
+    net = network_factory(**network_params)
+    build_time = time.time() - tic
+
+    # Lattice endpoints need a lattice channel.
+    if isinstance(net.config.position_strategy, LatticePositionStrategy):
+        endpoint_channel_types = ChannelType.LATTICE
+    else:
+        endpoint_channel_types = ChannelType.ALL
+    trace = generate_trace(
+        net, workload, num_transfers, transfer_value, trace_path, endpoint_channel_types
+    )
+    fork = net.fork()
+    rows = []
+    for simulation_params in simulation_grid:
+        fork.revert()
+        fee_strategy, routing_strategy = simulation_factory(net.config, **simulation_params)
+        tic = time.time()
+        stats = simulate_transfers(
+            net.raw,
+            num_transfers,
+            transfer_value,
+            net.config.position_strategy,
+            routing_strategy,
+            fee_strategy,
+            True,
+            0,
+            'sweep',
+            trace=trace
+        )
+        row = dict(network_params)
+        row.update(simulation_params)
+        summary = stats.summary()
+        del summary['name']
+        row.update(summary)
+        row['build_time'] = build_time
+        row['simulation_time'] = time.time() - tic
+        rows.append(row)
+    fork.close()
+    return rows
+
+
+def run_sweep(
+        network_factory: NetworkFactory,
+        simulation_factory: SimulationFactory,
+        network_parameters: Dict[str, List[Any]],
+        simulation_parameters: Dict[str, List[Any]],
+        num_transfers: int,
+        transfer_value: int,
+        out_dir: str,
+        workload: Workload = None,
+        max_workers: int = None,
+        memory_estimate: Callable[[Params], int] = estimate_memory,
+        memory_budget: int = None
+) -> List[Params]:
+    """
+    Runs every combination of network and simulation parameters and writes one results table
+    (`results.csv` in `out_dir`) with a row per combination.
+
+    `network_factory(**network_params)` builds a network. Grid points sharing network parameters
+    share a single build, i.e. each network is a job on a process pool that then runs all
+    simulation points through `simulation_factory(config, **simulation_params)`, which returns the
+    fee and routing strategies. Both factories must be picklable, e.g. module-level functions.
+
+    Jobs are only started while the memory estimates of all running jobs fit into the memory
+    budget, which defaults to 80% of the currently available memory. At least one job always runs.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workload = workload if workload is not None else UniformWorkload()
+    max_workers = max_workers or os.cpu_count()
+    if memory_budget is None:
+        memory_budget = int(0.8 * available_memory())
+
+    network_grid = grid(network_parameters)
+    simulation_grid = grid(simulation_parameters)
+    print('Sweeping {} networks x {} simulations.'.format(
+        len(network_grid), len(simulation_grid)
+    ))
+
+    # Largest jobs first so that small jobs fill the remaining memory.
+    pending = sorted(
+        enumerate(network_grid), key=lambda job: memory_estimate(job[1]), reverse=True
+    )
+    running = {}
+    results = {}
+    with ProcessPoolExecutor(max_workers) as executor:
+        while pending or running:
+            used_memory = sum(memory for _, memory in running.values())
+            while pending and len(running) < max_workers:
+                index, network_params = pending[0]
+                memory = memory_estimate(network_params)
+                if running and used_memory + memory > memory_budget:
+                    break
+                pending.pop(0)
+                future = executor.submit(
+                    run_network_job,
+                    network_factory,
+                    simulation_factory,
+                    network_params,
+                    simulation_grid,
+                    num_transfers,
+                    transfer_value,
+                    workload,
+                    os.path.join(out_dir, 'trace_{}.npy'.format(index))
+                )
+                running[future] = (index, memory)
+                used_memory += memory
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, _ = running.pop(future)
+                results[index] = future.result()
+                print('Finished network {}/{}.'.format(len(results), len(network_grid)))
+
+    rows = [row for index in sorted(results) for row in results[index]]
+    write_results(rows, os.path.join(out_dir, 'results.csv'))
+    return rows
+
+
+def write_results(rows: List[Params], path: str):
+    columns = []
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, columns)
+        writer.writeheader()
+        writer.writerows(rows)
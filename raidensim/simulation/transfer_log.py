@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+
+# One record per transfer. Source and target are node array indices. Fee, hops and contacted
+# nodes are zero for failed transfers. Skipped transfers are replayed trace transfers that could
+# not be attempted, i.e. neither succeeded nor failed.
+TRANSFER_DTYPE = np.dtype([
+    ('source', np.int64),
+    ('target', np.int64),
+    ('success', bool),
+    ('skipped', bool),
+    ('hops', np.int32),
+    ('fee', float),
+    ('distance', float),
+    ('contacted', np.int32),
+    ('route_time', float)
+])
+
+
+class TransferLog(object):
+    """
+    Columnar per-transfer record. Transfers are appended to a fixed-size buffer that is flushed in
+    chunks, either to a raw binary file of `TRANSFER_DTYPE` records or to in-memory chunks if no
+    path is given. Memory use during a simulation is bounded by the chunk size when writing to a
+    file.
+    """
+    CHUNK_SIZE = 2 ** 16
+
+    def __init__(self, path: str = None, chunk_size: int = CHUNK_SIZE):
+        self.path = path
+        self.buffer = np.zeros(chunk_size, dtype=TRANSFER_DTYPE)
+        self.num_buffered = 0
+        self.num_flushed = 0
+        self.chunks = []
+        if path is not None:
+            open(path, 'wb').close()
+
+    def __len__(self):
+        return self.num_flushed + self.num_buffered
+
+    def append(
+            self,
+            source: int,
+            target: int,
+            success: bool,
+            skipped: bool,
+            hops: int,
+            fee: float,
+            distance: float,
+            contacted: int,
+            route_time: float
+    ):
+        self.buffer[self.num_buffered] = (
+            source, target, success, skipped, hops, fee, distance, contacted, route_time
+        )
+        self.num_buffered += 1
+        if self.num_buffered == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        if not self.num_buffered:
+            return
+        chunk = self.buffer[:self.num_buffered]
+        if self.path is None:
+            self.chunks.append(chunk.copy())
+        else:
+            with open(self.path, 'ab') as f:
+                chunk.tofile(f)
+        self.num_flushed += self.num_buffered
+        self.num_buffered = 0
+
+    def records(self) -> np.array:
+        """
+        All records so far. Memory-mapped read-only if the log is written to a file.
+        """
+        self.flush()
+        if self.path is None:
+            return np.concatenate(self.chunks or [np.zeros(0, dtype=TRANSFER_DTYPE)])
+        return TransferLog.load(self.path)
+
+    @staticmethod
+    def load(path: str) -> np.array:
+        if not os.path.getsize(path):
+            return np.zeros(0, dtype=TRANSFER_DTYPE)
+        return np.memmap(path, dtype=TRANSFER_DTYPE, mode='r')
@@ -0,0 +1,200 @@
+import os
+from typing import Tuple, Union
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from raidensim.network.channel_type import ChannelType
+from raidensim.network.dist import Distribution
+from raidensim.network.network import Network
+from raidensim.network.random_streams import child_seed
+
+# Source and target are node array indices. Timestamps are in arbitrary time units.
+TRACE_DTYPE = np.dtype([
+    ('source', np.int64),
+    ('target', np.int64),
+    ('value', np.int64),
+    ('timestamp', float)
+])
+
+
+class Workload(object):
+    """
+    Strategy pattern generating transfer endpoints and arrival times for a trace. All draws are
+    vectorized over the whole trace.
+
+    Endpoints are drawn as positions into the array of candidate nodes. Arrivals default to a
+    Poisson process with the given rate.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        self.rate = rate
+
+    def endpoints(
+            self, uids: np.array, num_transfers: int, rng: np.random.Generator
+    ) -> Tuple[np.array, np.array]:
+        raise NotImplementedError
+
+    def timestamps(self, num_transfers: int, rng: np.random.Generator) -> np.array:
+        return np.cumsum(rng.exponential(1 / self.rate, num_transfers))
+
+
+def _distinct_targets(
+        sources: np.array, num_candidates: int, rng: np.random.Generator
+) -> np.array:
+    """
+    Uniform targets that differ from their sources.
+    """
+    targets = rng.integers(num_candidates - 1, size=len(sources))
+    targets[targets >= sources] += 1
+    return targets
+
+
+class UniformWorkload(Workload):
+    """
+    Sources and distinct targets drawn uniformly from all candidates.
+    """
+
+    def endpoints(
+            self, uids: np.array, num_transfers: int, rng: np.random.Generator
+    ) -> Tuple[np.array, np.array]:
+        sources = rng.integers(len(uids), size=num_transfers)
+        return sources, _distinct_targets(sources, len(uids), rng)
+
+
+class ZipfWorkload(Workload):
+    """
+    Hotspot workload. Candidates are ranked randomly and chosen with probability proportional to
+    rank ** -exponent, independently as sources and targets.
+    """
+
+    def __init__(self, exponent: float = 1.0, rate: float = 1.0):
+        Workload.__init__(self, rate)
+        self.exponent = exponent
+
+    def endpoints(
+            self, uids: np.array, num_transfers: int, rng: np.random.Generator
+    ) -> Tuple[np.array, np.array]:
+        num_candidates = len(uids)
+        weights = np.arange(1, num_candidates + 1, dtype=float) ** -self.exponent
+        p = np.empty(num_candidates)
+        p[rng.permutation(num_candidates)] = weights / weights.sum()
+
+        sources = rng.choice(num_candidates, num_transfers, p=p)
+        targets = rng.choice(num_candidates, num_transfers, p=p)
+        collisions = np.flatnonzero(sources == targets)
+        while len(collisions):
+            targets[collisions] = rng.choice(num_candidates, len(collisions), p=p)
+            collisions = collisions[sources[collisions] == targets[collisions]]
+        return sources, targets
+
+
+class LocalityWorkload(Workload):
+    """
+    Uniform sources with targets close to them in identifier space. Targets are found by walking a
+    geometrically distributed number of steps (given mean) in either direction along the ring of
+    candidates sorted by UID.
+    """
+
+    def __init__(self, mean_offset: float = 10.0, rate: float = 1.0):
+        Workload.__init__(self, rate)
+        self.mean_offset = mean_offset
+
+    def endpoints(
+            self, uids: np.array, num_transfers: int, rng: np.random.Generator
+    ) -> Tuple[np.array, np.array]:
+        num_candidates = len(uids)
+        order = np.argsort(uids)
+        ring_sources = rng.integers(num_candidates, size=num_transfers)
+        offsets = np.minimum(
+            rng.geometric(1 / self.mean_offset, num_transfers), num_candidates - 1
+        )
+        offsets *= rng.choice([-1, 1], num_transfers)
+        ring_targets = (ring_sources + offsets) % num_candidates
+        return order[ring_sources], order[ring_targets]
+
+
+class BurstyWorkload(Workload):
+    """
+    Endpoints of another workload with bursty arrivals. Time alternates between bursts and quiet
+    periods of geometrically distributed lengths (in transfers). Arrivals during bursts are
+    `burst_factor` times as frequent.
+    """
+
+    def __init__(
+            self,
+            workload: Workload,
+            mean_burst_length: float = 50.0,
+            mean_quiet_length: float = 50.0,
+            burst_factor: float = 20.0
+    ):
+        Workload.__init__(self, workload.rate)
+        self.workload = workload
+        self.mean_burst_length = mean_burst_length
+        self.mean_quiet_length = mean_quiet_length
+        self.burst_factor = burst_factor
+
+    def endpoints(
+            self, uids: np.array, num_transfers: int, rng: np.random.Generator
+    ) -> Tuple[np.array, np.array]:
+        return self.workload.endpoints(uids, num_transfers, rng)
+
+    def timestamps(self, num_transfers: int, rng: np.random.Generator) -> np.array:
+        # Enough alternating periods to cover all transfers in most cases, extended if not.
+        mean_period = self.mean_burst_length + self.mean_quiet_length
+        num_periods = 2 * (int(num_transfers / mean_period) + 1)
+        lengths = np.zeros(0, dtype=np.int64)
+        while lengths.sum() < num_transfers:
+            bursts = rng.geometric(1 / self.mean_burst_length, num_periods)
+            quiets = rng.geometric(1 / self.mean_quiet_length, num_periods)
+            lengths = np.concatenate([lengths, np.column_stack([bursts, quiets]).ravel()])
+        rates = np.tile([self.rate * self.burst_factor, self.rate], len(lengths) // 2)
+        rates = np.repeat(rates, lengths)[:num_transfers]
+        return np.cumsum(rng.exponential(1 / rates))
+
+
+def generate_trace(
+        net: Network,
+        workload: Workload,
+        num_transfers: int,
+        transfer_value: Union[int, Distribution],
+        path: str,
+        channel_types: int = ChannelType.ALL
+) -> np.array:
+    """
+    Generates a transfer trace once for a built network and stores it as a `TRACE_DTYPE` .npy file.
+    Returns the trace memory-mapped read-only so it can be replayed by any number of simulations.
+
+    Transfer values are either constant or drawn from a distribution, rounded to positive integers.
+    A distribution is reseeded from the network's workload stream. Candidates are the current
+    transfer endpoints, i.e. nodes with an active outgoing channel of the given types that can
+    carry the smallest value.
+    """
+    print('Generating trace of {} transfers.'.format(num_transfers))
+    if isinstance(transfer_value, Distribution):
+        transfer_value.reseed(child_seed(net.streams.seed_sequence('workload'), 0))
+        values = np.maximum(np.rint(transfer_value.sample(num_transfers)), 1).astype(np.int64)
+    else:
+        values = np.full(num_transfers, transfer_value, dtype=np.int64)
+
+    raw = net.raw
+    candidates = raw.node_arrays.indices(raw.endpoints(int(values.min()), channel_types).nodes)
+    if len(candidates) < 2:
+        raise ValueError('Only {} transfer endpoint(s) available.'.format(len(candidates)))
+    rng = net.streams.workload
+
+    sources, targets = workload.endpoints(
+        raw.node_arrays['uid'][candidates], num_transfers, rng
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    trace = open_memmap(path, mode='w+', dtype=TRACE_DTYPE, shape=(num_transfers,))
+    trace['source'] = candidates[sources]
+    trace['target'] = candidates[targets]
+    trace['value'] = values
+    trace['timestamp'] = workload.timestamps(num_transfers, rng)
+    trace.flush()
+    return load_trace(path)
+
+
+def load_trace(path: str) -> np.array:
+    return np.load(path, mmap_mode='r')
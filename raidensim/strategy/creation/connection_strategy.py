@@ -1,5 +1,9 @@
-from typing import Callable
+from typing import Callable, List, Iterator, Tuple
 
+import numpy as np
+
+from raidensim.network.channel_type import ChannelType
+from raidensim.network.csr_network import EdgeStreamWriter
 from raidensim.network.node import Node
 from raidensim.network.raw_network import RawNetwork
 from raidensim.types import Fullness
@@ -18,33 +22,89 @@ class BidirectionalConnectionStrategy(ConnectionStrategy):
     """
     Creates a bidirectional channel using two DiGraph edges and tracks information about the number
     of initiated, incoming (unidirectional), outgoing (unidirectional), and accepted channels for
-    both nodes.
+    both nodes. Channels are tagged with the given `ChannelType` code.
     """
 
-    def __init__(self, deposit_mapping: Callable[[Fullness], int]):
+    def __init__(
+            self,
+            deposit_mapping: Callable[[Fullness], int],
+            channel_type: int = ChannelType.GENERIC
+    ):
         self.deposit_mapping = deposit_mapping
+        self.channel_type = channel_type
 
     def connect(self, raw: RawNetwork, a: Node, b: Node):
-        raw.setup_channel(a, b, self.deposit_mapping(a.fullness))
-        raw.setup_channel(b, a, self.deposit_mapping(b.fullness))
-        a['num_initiated_channels'] += 1
-        a['num_incoming_channels'] += 1
-        a['num_outgoing_channels'] += 1
-        b['num_accepted_channels'] += 1
-        b['num_incoming_channels'] += 1
-        b['num_outgoing_channels'] += 1
+        arrays = raw.node_arrays
+        raw.setup_channel(a, b, arrays.value(self.deposit_mapping, a), self.channel_type)
+        raw.setup_channel(b, a, arrays.value(self.deposit_mapping, b), self.channel_type)
+        arrays.increment(a, 'num_initiated_channels')
+        arrays.increment(a, 'num_incoming_channels')
+        arrays.increment(a, 'num_outgoing_channels')
+        arrays.increment(b, 'num_accepted_channels')
+        arrays.increment(b, 'num_incoming_channels')
+        arrays.increment(b, 'num_outgoing_channels')
+
+    def connect_bulk(
+            self, raw: RawNetwork, nodes: List[Node], initiators: np.array, partners: np.array
+    ):
+        """
+        Same as calling `connect` for nodes[initiators[k]] and nodes[partners[k]] in order.
+        """
+        node_indices = raw.node_arrays.indices(nodes)
+        deposits = raw.node_arrays.mapped(self.deposit_mapping)[node_indices]
+        raw.setup_channels_bulk(nodes, initiators, partners, deposits, self.channel_type)
+
+        num_initiated = np.bincount(initiators, minlength=len(nodes))
+        num_accepted = np.bincount(partners, minlength=len(nodes))
+        num_channels = num_initiated + num_accepted
+
+        for name, counts in [
+            ('num_initiated_channels', num_initiated),
+            ('num_accepted_channels', num_accepted),
+            ('num_incoming_channels', num_channels),
+            ('num_outgoing_channels', num_channels)
+        ]:
+            raw.node_arrays.columns[name][node_indices] += counts
+
+        for node, initiated, accepted, channels in zip(
+                nodes, num_initiated.tolist(), num_accepted.tolist(), num_channels.tolist()
+        ):
+            if initiated:
+                node['num_initiated_channels'] += initiated
+            if accepted:
+                node['num_accepted_channels'] += accepted
+            if channels:
+                node['num_incoming_channels'] += channels
+                node['num_outgoing_channels'] += channels
+
+    def connect_stream(
+            self,
+            writer: EdgeStreamWriter,
+            fullness: np.array,
+            channels: Iterator[Tuple[np.array, np.array]]
+    ):
+        """
+        Streams chunks of (initiators, partners) node indices to disk. Deposits are resolved once
+        per node. Channel counters are not tracked since there are no node objects.
+        """
+        deposits = np.array([self.deposit_mapping(f) for f in fullness.tolist()], dtype=np.int64)
+        for initiators, partners in channels:
+            writer.append_channels(
+                initiators, partners, deposits[initiators], deposits[partners]
+            )
 
 
 class LatticeConnectionStrategy(ConnectionStrategy):
     """
-    Creates channels without adding to the channel limits.
+    Creates lattice channels without adding to the channel limits.
     """
 
     def __init__(self, deposit_mapping: Callable[[Fullness], int]):
         self.deposit_mapping = deposit_mapping
 
     def connect(self, raw: RawNetwork, a: Node, b: Node):
-        raw.setup_channel(a, b, self.deposit_mapping(a.fullness))
-        raw.setup_channel(b, a, self.deposit_mapping(b.fullness))
+        arrays = raw.node_arrays
+        raw.setup_channel(a, b, arrays.value(self.deposit_mapping, a), ChannelType.LATTICE)
+        raw.setup_channel(b, a, arrays.value(self.deposit_mapping, b), ChannelType.LATTICE)
         a['num_lattice_channels'] += 1
         b['num_lattice_channels'] += 1
@@ -3,6 +3,8 @@ from typing import Callable
 
 import math
 
+import numpy as np
+
 from raidensim.network.node import Node
 from raidensim.network.raw_network import RawNetwork
 from raidensim.strategy.position_strategy import PositionStrategy
@@ -17,6 +19,18 @@ class FilterStrategy(object):
     def filter(self, raw: RawNetwork, a: Node, b: Node) -> bool:
         raise NotImplementedError
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array) -> np.array:
+        """
+        Vectorized `filter` over candidate nodes given as indices into `raw.node_arrays`. Returns a
+        boolean array. Filters without a vectorized implementation call `filter` per candidate.
+        """
+        nodes = raw.node_arrays.nodes
+        return np.fromiter(
+            (self.filter(raw, a, nodes[i]) for i in candidates.tolist()),
+            dtype=bool,
+            count=len(candidates)
+        )
+
 
 class IdentityFilterStrategy(FilterStrategy):
     """
@@ -26,6 +40,9 @@ class IdentityFilterStrategy(FilterStrategy):
     def filter(self, raw: RawNetwork, a: Node, b: Node):
         return a != b
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        return candidates != raw.node_arrays.index[a]
+
 
 class NotConnectedFilterStrategy(FilterStrategy):
     """
@@ -35,6 +52,13 @@ class NotConnectedFilterStrategy(FilterStrategy):
     def filter(self, raw: RawNetwork, a: Node, b: Node):
         return not raw.has_edge(a, b)
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        partners = raw.node_arrays.indices(raw.successors(a))
+        if len(partners) > 64:
+            return ~np.isin(candidates, partners)
+        # Joining nodes have few partners, where broadcasting beats np.isin's overhead.
+        return (candidates[:, np.newaxis] != partners).all(axis=1)
+
 
 class DistanceFilterStrategy(FilterStrategy):
     """
@@ -48,6 +72,9 @@ class DistanceFilterStrategy(FilterStrategy):
     def filter(self, raw: RawNetwork, a: Node, b: Node):
         return self.position_strategy.distance(a, b) <= self.max_distance
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        return self.position_strategy.distances(raw, a, candidates) <= self.max_distance
+
 
 class FullerFilterStrategy(FilterStrategy):
     """
@@ -57,6 +84,9 @@ class FullerFilterStrategy(FilterStrategy):
     def filter(self, raw: RawNetwork, a: Node, b: Node):
         return a.fullness <= b.fullness
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        return a.fullness <= raw.node_arrays['fullness'][candidates]
+
 
 class MinIncomingDepositFilterStrategy(FilterStrategy):
     """
@@ -73,6 +103,11 @@ class MinIncomingDepositFilterStrategy(FilterStrategy):
         deposit_b = self.deposit_mapping(b.fullness)
         return deposit_a >= self.min_incoming_deposit * deposit_b
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        deposits = raw.node_arrays.mapped(self.deposit_mapping)
+        deposit_a = deposits[raw.node_arrays.index[a]]
+        return deposit_a >= self.min_incoming_deposit * deposits[candidates]
+
 
 class MinMutualDepositFilterStrategy(FilterStrategy):
     """
@@ -90,6 +125,13 @@ class MinMutualDepositFilterStrategy(FilterStrategy):
         return deposit_a >= self.min_incoming_deposit * deposit_b and \
             deposit_b >= self.min_incoming_deposit * deposit_a
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        deposits = raw.node_arrays.mapped(self.deposit_mapping)
+        deposit_a = deposits[raw.node_arrays.index[a]]
+        deposits_b = deposits[candidates]
+        return (deposit_a >= self.min_incoming_deposit * deposits_b) & \
+            (deposits_b >= self.min_incoming_deposit * deposit_a)
+
 
 class IncomingLimitsFilterStrategy(FilterStrategy):
     """
@@ -105,6 +147,11 @@ class IncomingLimitsFilterStrategy(FilterStrategy):
         max_incoming_channels = self.max_incoming_channels_mapping(b.fullness)
         return b['num_incoming_channels'] < max_incoming_channels
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        num_incoming_channels = raw.node_arrays['num_incoming_channels'][candidates]
+        max_incoming_channels = raw.node_arrays.mapped(self.max_incoming_channels_mapping)
+        return num_incoming_channels < max_incoming_channels[candidates]
+
 
 class AcceptedLimitsFilterStrategy(FilterStrategy):
     """
@@ -118,6 +165,11 @@ class AcceptedLimitsFilterStrategy(FilterStrategy):
         max_accepted_channels = self.max_accepted_channels_mapping(b.fullness)
         return b['num_accepted_channels'] < max_accepted_channels
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        num_accepted_channels = raw.node_arrays['num_accepted_channels'][candidates]
+        max_accepted_channels = raw.node_arrays.mapped(self.max_accepted_channels_mapping)
+        return num_accepted_channels < max_accepted_channels[candidates]
+
 
 class TotalLimitsFilterStrategy(FilterStrategy):
     """
@@ -134,6 +186,16 @@ class TotalLimitsFilterStrategy(FilterStrategy):
         return a['num_incoming_channels'] + a['num_outgoing_channels'] < a_max_total_channels and \
                b['num_incoming_channels'] + b['num_outgoing_channels'] < b_max_total_channels
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        arrays = raw.node_arrays
+        max_total_channels = arrays.mapped(self.max_total_channels_mapping)
+        if a['num_incoming_channels'] + a['num_outgoing_channels'] >= \
+                max_total_channels[arrays.index[a]]:
+            return np.zeros(len(candidates), dtype=bool)
+        num_total_channels = arrays['num_incoming_channels'][candidates] + \
+            arrays['num_outgoing_channels'][candidates]
+        return num_total_channels < max_total_channels[candidates]
+
 
 class TotalBidirectionalLimitsFilterStrategy(TotalLimitsFilterStrategy):
     """
@@ -201,6 +263,12 @@ class KademliaFilterStrategy(FilterStrategy):
         distance = self.position_strategy.distance(a, b)
         return max(0, int(math.log2(distance)) - self.num_buckets_merged)
 
+    def _get_buckets(self, raw: RawNetwork, a: Node, candidates: np.array) -> np.array:
+        distances = self.position_strategy.distances(raw, a, candidates)
+        # frexp yields floor(log2(distance)) + 1 exactly for integer distances.
+        log_distances = np.frexp(np.maximum(distances, 1))[1] - 1
+        return np.maximum(0, log_distances - self.num_buckets_merged)
+
     def filter(self, raw: RawNetwork, a: Node, b: Node):
         buckets = [0] * self.num_buckets
         target_bucket = self._get_bucket(a, b)
@@ -209,6 +277,14 @@ class KademliaFilterStrategy(FilterStrategy):
         _, first_emptiest_bucket = min((buckets[i], i) for i in range(self.num_buckets))
         return target_bucket == first_emptiest_bucket
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        partners = raw.node_arrays.indices(raw.neighbors(a))
+        buckets = np.bincount(
+            self._get_buckets(raw, a, partners), minlength=self.num_buckets
+        )[:self.num_buckets]
+        first_emptiest_bucket = int(np.argmin(buckets))
+        return self._get_buckets(raw, a, candidates) == first_emptiest_bucket
+
 
 class MicroRaidenServerFilterStrategy(FilterStrategy):
     """
@@ -217,3 +293,6 @@ class MicroRaidenServerFilterStrategy(FilterStrategy):
 
     def filter(self, raw: RawNetwork, a: Node, b: Node):
         return b.fullness > 0
+
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array):
+        return raw.node_arrays['fullness'][candidates] > 0
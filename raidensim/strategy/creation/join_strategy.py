@@ -1,11 +1,13 @@
-import random
-from itertools import cycle
-from typing import Callable, Tuple
+from itertools import cycle, chain
+from typing import Callable, Tuple, List, Iterator, Dict
 
 import numpy as np
 from collections import defaultdict
 
 from raidensim.network.annulus import Annulus
+from raidensim.network.channel_type import ChannelType
+from raidensim.network.csr_network import EdgeStreamWriter
+from raidensim.network.hyperbolic_disk import HyperbolicDisk
 from raidensim.network.lattice import WovenLattice
 from raidensim.network.node import Node
 from raidensim.network.raw_network import RawNetwork
@@ -48,6 +50,26 @@ class JoinStrategy(object):
     def join(self, raw: RawNetwork, node: Node):
         raise NotImplementedError
 
+    def build_bulk(self, raw: RawNetwork, nodes: List[Node]):
+        """
+        Joins all given nodes at once. The result must be identical to joining them one by one.
+        Only available for strategies whose topology is fully determined by the number of nodes.
+        """
+        raise NotImplementedError
+
+    def build_stream(self, writer: EdgeStreamWriter, fullness: np.array):
+        """
+        Same channels as `build_bulk` for nodes with the given fullness values, but streamed to
+        disk in chunks without creating node objects or a networkx graph.
+        """
+        raise NotImplementedError
+
+    def print_stats(self):
+        """
+        Prints join statistics collected by the strategy, if any.
+        """
+        pass
+
     @property
     def num_required_channels(self):
         raise NotImplementedError
@@ -69,7 +91,7 @@ class DefaultJoinStrategy(JoinStrategy):
         self.connection_strategy = connection_strategy
 
     def join(self, raw: RawNetwork, node: Node):
-        max_initiated_channels = self.initiated_channels_mapping(node.fullness)
+        max_initiated_channels = raw.node_arrays.value(self.initiated_channels_mapping, node)
         targets = None
         if node['num_initiated_channels'] < max_initiated_channels:
             targets = self.selection_strategy.targets(raw, node)
@@ -81,6 +103,9 @@ class DefaultJoinStrategy(JoinStrategy):
         except StopIteration:
             pass
 
+    def print_stats(self):
+        self.selection_strategy.print_stats()
+
     @property
     def num_required_channels(self):
         return 0
@@ -94,7 +119,8 @@ class SimpleJoinStrategy(DefaultJoinStrategy):
     def __init__(
             self,
             max_initiated_channels: IntRange,
-            deposit: IntRange
+            deposit: IntRange,
+            adaptive_filter_order: bool = False
     ):
         def initiated_channels_mapping(fullness: Fullness):
             return linear_int(*max_initiated_channels, fullness)
@@ -110,7 +136,10 @@ class SimpleJoinStrategy(DefaultJoinStrategy):
         DefaultJoinStrategy.__init__(
             self,
             initiated_channels_mapping=initiated_channels_mapping,
-            selection_strategy=FirstMatchSelectionStrategy(filter_strategies=filter_strategies),
+            selection_strategy=FirstMatchSelectionStrategy(
+                filter_strategies=filter_strategies,
+                adaptive_order=adaptive_filter_order
+            ),
             connection_strategy=BidirectionalConnectionStrategy(deposit_mapping)
         )
 
@@ -126,7 +155,8 @@ class RaidenKademliaJoinStrategy(DefaultJoinStrategy):
             kademlia_bucket_limits: IntRange,
             max_initiated_channels: IntRange,
             max_accepted_channels: IntRange,
-            deposit: IntRange
+            deposit: IntRange,
+            adaptive_filter_order: bool = False
     ):
         def initiated_channels_mapping(fullness: Fullness):
             return linear_int(*max_initiated_channels, fullness)
@@ -148,13 +178,18 @@ class RaidenKademliaJoinStrategy(DefaultJoinStrategy):
             MinIncomingDepositFilterStrategy(deposit_mapping, min_partner_deposit)
         ]
 
-        selection_strategy = FirstMatchSelectionStrategy(filter_strategies=filter_strategies)
+        selection_strategy = FirstMatchSelectionStrategy(
+            filter_strategies=filter_strategies,
+            adaptive_order=adaptive_filter_order
+        )
 
         DefaultJoinStrategy.__init__(
             self,
             initiated_channels_mapping=initiated_channels_mapping,
             selection_strategy=selection_strategy,
-            connection_strategy=BidirectionalConnectionStrategy(deposit_mapping)
+            connection_strategy=BidirectionalConnectionStrategy(
+                deposit_mapping, ChannelType.KADEMLIA
+            )
         )
 
 
@@ -165,9 +200,11 @@ class MicroRaidenJoinStrategy(DefaultJoinStrategy):
     """
 
     def __init__(self, max_initiated_channels: IntRange, deposit: int):
+        self.rng = None
+
         def initiated_channels_mapping(fullness: Fullness):
             if fullness == 0:
-                return random.randint(*max_initiated_channels)
+                return int(self.rng.integers(*max_initiated_channels, endpoint=True))
             else:
                 return 0
 
@@ -186,9 +223,16 @@ class MicroRaidenJoinStrategy(DefaultJoinStrategy):
             self,
             initiated_channels_mapping=initiated_channels_mapping,
             selection_strategy=selection_strategy,
-            connection_strategy=BidirectionalConnectionStrategy(deposit_mapping)
+            connection_strategy=BidirectionalConnectionStrategy(
+                deposit_mapping, ChannelType.MICRORAIDEN
+            )
         )
 
+    def join(self, raw: RawNetwork, node: Node):
+        # Client channel counts are drawn from the network's join stream.
+        self.rng = raw.streams.join
+        DefaultJoinStrategy.join(self, raw, node)
+
 
 class RaidenLatticeJoinStrategy(DefaultJoinStrategy):
     """
@@ -226,17 +270,18 @@ class RaidenLatticeJoinStrategy(DefaultJoinStrategy):
             self,
             initiated_channels_mapping=initiated_channels_mapping,
             selection_strategy=selection_strategy,
-            connection_strategy=BidirectionalConnectionStrategy(deposit_mapping)
+            connection_strategy=BidirectionalConnectionStrategy(deposit_mapping, ChannelType.AUX)
         )
 
     def join(self, raw: RawNetwork, node: Node):
         coord = self.lattice.get_free_coord()
         self.lattice.add_node(node, coord)
 
-        neighbors = list(self.lattice.coord_neighbors(coord))
-        neighbors = [neighbor for neighbor in neighbors if (node, neighbor) not in raw.edges]
-        for partner in neighbors:
-            self.lattice_connection_strategy.connect(raw, node, partner)
+        neighbor_indices = self.lattice.neighbor_indices(coord)[0]
+        for index in neighbor_indices[neighbor_indices >= 0].tolist():
+            partner = self.lattice.index_to_node[index]
+            if not raw.has_edge(node, partner):
+                self.lattice_connection_strategy.connect(raw, node, partner)
 
         DefaultJoinStrategy.join(self, raw, node)
 
@@ -259,11 +304,7 @@ class FullAnnulusJoinStrategy(JoinStrategy):
         self.i = 0
 
     def join(self, raw: RawNetwork, node: Node):
-        if self.i == self.num_ring_nodes:
-            self.r += 1
-            self.num_ring_nodes = 2 ** self.r
-            self.i = 0
-
+        self._next_slot()
         coord = np.array([self.r, self.i], dtype=int)
         self.annulus.add_node(node, coord)
         for partner in self.annulus.coord_partners(coord):
@@ -271,6 +312,82 @@ class FullAnnulusJoinStrategy(JoinStrategy):
 
         self.i += 1
 
+    def bulk_channels(self, num_nodes: int) -> Tuple[np.array, np.array]:
+        """
+        Returns the channels created by joining `num_nodes` nodes into an empty annulus as two
+        arrays of node indices (initiator, partner) in the exact order `join` would create them.
+        Node indices are join order, which equals slot order since rings are filled in order.
+        For the same reason a joining node always finds all of its inward partners present and
+        none of its outward partners.
+        """
+        ring_channels = list(self._ring_channels(num_nodes))
+        if not ring_channels:
+            return np.empty(0, dtype=int), np.empty(0, dtype=int)
+        initiators, partners = zip(*ring_channels)
+        return np.concatenate(initiators), np.concatenate(partners)
+
+    def _ring_channels(self, num_nodes: int) -> Iterator[Tuple[np.array, np.array]]:
+        """
+        Same as `bulk_channels`, one ring of initiating nodes at a time.
+        """
+        min_ring = self.annulus.min_ring
+        max_ring = self.annulus.max_ring
+        if num_nodes > 2 ** (max_ring + 1) - 2 ** min_ring:
+            raise ValueError('{} nodes exceed annulus capacity.'.format(num_nodes))
+
+        def ring_offset(ring: int) -> int:
+            return 2 ** ring - 2 ** min_ring
+
+        r = min_ring + 1
+        while r <= max_ring and ring_offset(r) < num_nodes:
+            num_ring_nodes = min(2 ** r, num_nodes - ring_offset(r))
+            i = np.arange(num_ring_nodes)
+
+            # Same iteration as the inward part of `Annulus.partner_coords`, for a whole ring.
+            blocks = []
+            rt = r - 1
+            it = i
+            num_connections = 2 ** (max_ring - r)
+            num_ring_slots = 2 ** rt
+            while num_connections > 0 and rt >= min_ring:
+                first = (it - num_connections + 1) // 2
+                block = (first[:, None] + np.arange(num_connections)[None, :]) % num_ring_slots
+                blocks.append(block + ring_offset(rt))
+                rt -= 1
+                it = it // 2
+                num_connections //= 2
+                num_ring_slots //= 2
+
+            ring_partners = np.hstack(blocks)
+            yield np.repeat(i + ring_offset(r), ring_partners.shape[1]), ring_partners.ravel()
+            r += 1
+
+    def build_bulk(self, raw: RawNetwork, nodes: List[Node]):
+        if self.annulus.node_to_coord:
+            raise ValueError('Bulk construction requires an empty annulus.')
+
+        print('Building {} annulus nodes in bulk.'.format(len(nodes)))
+        initiators, partners = self.bulk_channels(len(nodes))
+
+        for node in nodes:
+            self._next_slot()
+            self.annulus.add_node(node, (self.r, self.i))
+            self.i += 1
+
+        self.connection_strategy.connect_bulk(raw, nodes, initiators, partners)
+
+    def build_stream(self, writer: EdgeStreamWriter, fullness: np.array):
+        print('Streaming {} annulus nodes.'.format(len(fullness)))
+        self.connection_strategy.connect_stream(
+            writer, fullness, self._ring_channels(len(fullness))
+        )
+
+    def _next_slot(self):
+        if self.i == self.num_ring_nodes:
+            self.r += 1
+            self.num_ring_nodes = 2 ** self.r
+            self.i = 0
+
     @property
     def num_required_channels(self):
         return 0
@@ -339,4 +456,156 @@ class SmartAnnulusJoinStrategy(JoinStrategy):
 
     @property
     def num_required_channels(self):
-        return 0
\ No newline at end of file
+        return 0
+
+
+class HyperbolicDiskJoinStrategy(JoinStrategy):
+    """
+    Places nodes on the rings of a hyperbolic disk, fuller nodes further inward, and connects them
+    to all present nodes within the disk radius. Rings are filled in bit-reversed slot order to
+    spread nodes evenly around each ring. If the preferred ring is full, the next outer ring is
+    used, then the next inner ring.
+    """
+    def __init__(self, disk: HyperbolicDisk, deposit: IntRange):
+        self.disk = disk
+
+        def deposit_mapping(fullness: Fullness):
+            return linear_int(*deposit, fullness)
+
+        self.connection_strategy = BidirectionalConnectionStrategy(deposit_mapping)
+        self.ring_fill = defaultdict(int)
+
+    @staticmethod
+    def _bit_reverse(i: int, num_bits: int) -> int:
+        return int('{:0{}b}'.format(i, num_bits)[::-1], 2) if num_bits else 0
+
+    def _next_coord(self, fullness: Fullness, ring_fill: Dict[int, int] = None) -> Tuple[int, int]:
+        """
+        Claims the next free slot in `ring_fill`, which defaults to the fill of the disk.
+        """
+        if ring_fill is None:
+            ring_fill = self.ring_fill
+        min_ring, max_ring = self.disk.rings
+        r_preferred = max_ring - int(round(fullness * (max_ring - min_ring)))
+        for r in chain(range(r_preferred, max_ring + 1), range(r_preferred - 1, min_ring - 1, -1)):
+            num_filled = ring_fill[r]
+            if num_filled < 2 ** r:
+                ring_fill[r] += 1
+                return r, self._bit_reverse(num_filled, r)
+        raise ValueError('All rings full.')
+
+    def join(self, raw: RawNetwork, node: Node):
+        coord = self._next_coord(node.fullness)
+        partners = self.disk.partner_indices(coord)
+        self.disk.add_node(node, coord)
+        for index in partners.tolist():
+            self.connection_strategy.connect(raw, node, self.disk.index_to_node[index])
+
+    def bulk_channels(self) -> Tuple[np.array, np.array]:
+        """
+        Returns all channels between the nodes on the disk as two arrays of node indices
+        (initiator, partner) in the order `join` would have created them, i.e., each node
+        initiates channels to all earlier nodes in range of its partner query.
+        """
+        disk = self.disk
+        coords = np.array([disk.node_to_coord[node] for node in disk.index_to_node])
+        occupied = self._occupied_slots(disk.slot_indices)
+        return self._block_channels(coords, occupied, np.arange(len(coords)))
+
+    def _occupied_slots(self, slot_indices: List[np.array]) -> List[Tuple[np.array, np.array]]:
+        """
+        Occupied slots of every ring and the node indices in them.
+        """
+        occupied = []
+        for indices in slot_indices:
+            slots = np.flatnonzero(indices >= 0)
+            occupied.append((slots, indices[slots]))
+        return occupied
+
+    def _block_channels(
+            self,
+            coords: np.array,
+            occupied: List[Tuple[np.array, np.array]],
+            node_indices: np.array
+    ) -> Tuple[np.array, np.array]:
+        """
+        Channels initiated by the given nodes, ordered as in `bulk_channels`.
+        """
+        disk = self.disk
+        ring_range = np.arange(disk.rings[0], disk.rings[1] + 1)
+        los, his = disk.partner_ranges(coords[node_indices], ring_range)
+
+        initiators = []
+        partners = []
+        sort_keys = []
+        positions = []
+        for col, r in enumerate(ring_range.tolist()):
+            num_ring_slots = 2 ** r
+            occupied_slots, occupied_indices = occupied[r]
+            begin = los[:, col] % num_ring_slots
+            end = begin + np.maximum(his[:, col] - los[:, col] + 1, 0)
+
+            # Unwrapped range [begin, end) splits into [begin, n) and [0, end - n).
+            pieces = [
+                (begin, np.minimum(end, num_ring_slots)),
+                (np.zeros_like(begin), np.maximum(end - num_ring_slots, 0))
+            ]
+            for piece, (piece_begin, piece_end) in enumerate(pieces):
+                starts = np.searchsorted(occupied_slots, piece_begin)
+                counts = np.searchsorted(occupied_slots, piece_end) - starts
+                owners = np.repeat(node_indices, counts)
+                offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                piece_positions = np.repeat(starts, counts) + offsets
+                piece_partners = occupied_indices[piece_positions]
+
+                # Only earlier nodes were present at join time. Also excludes the node itself.
+                earlier = piece_partners < owners
+                initiators.append(owners[earlier])
+                partners.append(piece_partners[earlier])
+                positions.append(piece_positions[earlier])
+                sort_keys.append(np.full(earlier.sum(), 2 * col + piece))
+
+        initiators = np.concatenate(initiators)
+        partners = np.concatenate(partners)
+        order = np.lexsort((np.concatenate(positions), np.concatenate(sort_keys), initiators))
+        return initiators[order], partners[order]
+
+    def build_bulk(self, raw: RawNetwork, nodes: List[Node]):
+        if self.disk.index_to_node or self.ring_fill:
+            raise ValueError('Bulk construction requires an empty disk.')
+
+        print('Building {} hyperbolic disk nodes in bulk.'.format(len(nodes)))
+        for node in nodes:
+            self.disk.add_node(node, self._next_coord(node.fullness))
+
+        initiators, partners = self.bulk_channels()
+        self.connection_strategy.connect_bulk(raw, nodes, initiators, partners)
+
+    def build_stream(self, writer: EdgeStreamWriter, fullness: np.array, block_size: int = 2**16):
+        """
+        Places nodes like `build_bulk` but only keeps their coordinates, then streams the channels
+        of `block_size` initiating nodes at a time. The disk and its ring fill stay untouched.
+        """
+        if self.disk.index_to_node or self.ring_fill:
+            raise ValueError('Streamed construction requires an empty disk.')
+
+        print('Streaming {} hyperbolic disk nodes.'.format(len(fullness)))
+        ring_fill = defaultdict(int)
+        coords = np.array([self._next_coord(f, ring_fill) for f in fullness.tolist()], dtype=int)
+        slot_indices = [np.full(2 ** r, -1, dtype=int) for r in range(self.disk.rings[1] + 1)]
+        for index, (r, i) in enumerate(coords.tolist()):
+            slot_indices[r][i] = index
+        occupied = self._occupied_slots(slot_indices)
+
+        blocks = (
+            self._block_channels(coords, occupied, np.arange(start, stop))
+            for start, stop in (
+                (start, min(start + block_size, len(coords)))
+                for start in range(0, len(coords), block_size)
+            )
+        )
+        self.connection_strategy.connect_stream(writer, fullness, blocks)
+
+    @property
+    def num_required_channels(self):
+        return 0
@@ -1,45 +1,152 @@
-import random
+import time
 from typing import Iterator
 
+import numpy as np
+
 from raidensim.network.lattice import WovenLattice
 from raidensim.network.node import Node
 from raidensim.network.raw_network import RawNetwork
 from .filter_strategy import FilterStrategy
 
 
+class FilterStats(object):
+    """
+    Evaluation statistics of a single filter within a selection strategy.
+    """
+    def __init__(self, filter_strategy: FilterStrategy):
+        self.filter_strategy = filter_strategy
+        self.num_evaluated = 0
+        self.num_rejected = 0
+        self.time = 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.num_rejected / self.num_evaluated if self.num_evaluated else 0
+
+    @property
+    def cost_per_rejection(self) -> float:
+        return self.time / self.num_rejected if self.num_rejected else float('inf')
+
+
 class SelectionStrategy(object):
-    def __init__(self, filter_strategies: Iterator[FilterStrategy]):
+    # Number of candidates filtered at once when matching lazily. Grows on chunks without a match.
+    MIN_CHUNK_SIZE = 16
+    MAX_CHUNK_SIZE = 4096
+    # Number of mask evaluations between reorderings of the filter chain in adaptive mode.
+    REORDER_INTERVAL = 256
+
+    def __init__(self, filter_strategies: Iterator[FilterStrategy], adaptive_order: bool = False):
+        """
+        In adaptive mode, the filters are periodically reordered by ascending time spent per
+        rejected candidate. Filters are pure predicates, so this does not change the result.
+        """
         self.filter_strategies = filter_strategies
+        self.adaptive_order = adaptive_order
+        self.filter_stats = [FilterStats(filter_strategy) for filter_strategy in filter_strategies]
+        self.num_masks = 0
+
+    def reorder_filters(self):
+        self.filter_stats.sort(key=lambda stats: stats.cost_per_rejection)
+
+    def print_stats(self):
+        print('Filter statistics ({} evaluations):'.format(self.num_masks))
+        print('{:<40} {:>12} {:>10} {:>10} {:>14}'.format(
+            'Filter', 'Evaluated', 'Rejected', 'Time [s]', 'Time/Reject'
+        ))
+        for stats in self.filter_stats:
+            print('{:<40} {:>12} {:>9.1f}% {:>10.3f} {:>14.3g}'.format(
+                stats.filter_strategy.__class__.__name__,
+                stats.num_evaluated,
+                stats.rejection_rate * 100,
+                stats.time,
+                stats.cost_per_rejection
+            ))
 
     def match(self, raw: RawNetwork, a: Node, b: Node):
         return all(filter_strategy.filter(raw, a, b) for filter_strategy in self.filter_strategies)
 
+    def mask(self, raw: RawNetwork, a: Node, candidates: np.array) -> np.array:
+        """
+        Vectorized `match` over node array indices. Each filter only sees the candidates accepted
+        by all previous filters.
+        """
+        remaining = np.arange(len(candidates))
+        for stats in self.filter_stats:
+            if len(remaining) == 0:
+                break
+            tic = time.perf_counter()
+            filter_mask = stats.filter_strategy.mask(raw, a, candidates[remaining])
+            stats.time += time.perf_counter() - tic
+            stats.num_evaluated += len(remaining)
+            remaining = remaining[filter_mask]
+            stats.num_rejected += len(filter_mask) - len(remaining)
+
+        self.num_masks += 1
+        if self.adaptive_order and self.num_masks % self.REORDER_INTERVAL == 0:
+            self.reorder_filters()
+
+        mask = np.zeros(len(candidates), dtype=bool)
+        mask[remaining] = True
+        return mask
+
+    def matches(self, raw: RawNetwork, a: Node, candidates: np.array) -> Iterator[Node]:
+        """
+        Lazily yields the candidates matching at the time they are reached, in order. Masks are
+        evaluated chunk-wise and recomputed after every yielded node because the caller may connect
+        to it, changing the state the filters depend on.
+        """
+        nodes = raw.node_arrays.nodes
+        start = 0
+        chunk_size = self.MIN_CHUNK_SIZE
+        while start < len(candidates):
+            chunk = candidates[start:start + chunk_size]
+            matches = np.flatnonzero(self.mask(raw, a, chunk))
+            if len(matches) == 0:
+                start += len(chunk)
+                chunk_size = min(2 * chunk_size, self.MAX_CHUNK_SIZE)
+                continue
+            yield nodes[chunk[matches[0]]]
+            start += matches[0] + 1
+            chunk_size = self.MIN_CHUNK_SIZE
+
     def targets(self, raw: RawNetwork, node: Node) -> Iterator[Node]:
         raise NotImplementedError
 
 
 class FirstMatchSelectionStrategy(SelectionStrategy):
     def targets(self, raw: RawNetwork, node: Node) -> Iterator[Node]:
-        return (target for target in raw.nodes if self.match(raw, node, target))
+        return self.matches(raw, node, raw.node_arrays.active_indices())
 
 
 class RandomSelectionStrategy(SelectionStrategy):
     """
-    Warning: inefficient. Filters and shuffles all nodes on each call.
+    Filters all nodes once per call and yields the matches in random order.
     """
     def targets(self, raw: RawNetwork, node: Node) -> Iterator[Node]:
-        nodes = [target for target in raw.nodes if self.match(raw, node, target)]
-        random.shuffle(nodes)
-        while nodes:
-            yield nodes.pop(0)
+        candidates = raw.node_arrays.active_indices()
+        candidates = candidates[self.mask(raw, node, candidates)]
+        raw.streams.join.shuffle(candidates)
+        nodes = raw.node_arrays.nodes
+        return (nodes[i] for i in candidates.tolist())
 
 
 class RandomAuxLatticeSelectionStrategy(SelectionStrategy):
-    def __init__(self, lattice: WovenLattice, filter_strategies: Iterator[FilterStrategy]):
-        SelectionStrategy.__init__(self, filter_strategies)
+    def __init__(
+            self,
+            lattice: WovenLattice,
+            filter_strategies: Iterator[FilterStrategy],
+            adaptive_order: bool = False
+    ):
+        SelectionStrategy.__init__(self, filter_strategies, adaptive_order)
         self.lattice = lattice
 
     def targets(self, raw: RawNetwork, node: Node) -> Iterator[Node]:
-        aux_neighbors = list(self.lattice.aux_node_neighbors(node))
-        random.shuffle(aux_neighbors)
-        return (target for target in aux_neighbors if self.match(raw, node, target))
+        coord = self.lattice.node_to_coord.get(node)
+        if coord is None:
+            return iter(())
+        aux_indices = self.lattice.aux_neighbor_indices(coord)[0]
+        aux_neighbors = [
+            self.lattice.index_to_node[index] for index in aux_indices[aux_indices >= 0].tolist()
+        ]
+        raw.streams.join.shuffle(aux_neighbors)
+        return self.matches(raw, node, raw.node_arrays.indices(aux_neighbors))
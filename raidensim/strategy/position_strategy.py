@@ -8,6 +8,7 @@ from raidensim.network.annulus import Annulus
 from raidensim.network.hyperbolic_disk import HyperbolicDisk
 from raidensim.network.lattice import Lattice
 from raidensim.network.node import Node
+from raidensim.network.raw_network import RawNetwork
 from raidensim.types import FloatRange
 
 
@@ -26,6 +27,13 @@ class PositionStrategy(object):
     def distance(self, a: Node, b: Node):
         raise NotImplementedError
 
+    def distances(self, raw: RawNetwork, a: Node, candidates: np.array) -> np.array:
+        """
+        Distances from node a to the nodes at the given node array indices.
+        """
+        nodes = raw.node_arrays.nodes
+        return np.array([self.distance(a, nodes[i]) for i in candidates.tolist()])
+
     def label(self, a: Node) -> str:
         return a.uid
 
@@ -53,6 +61,10 @@ class RingPositionStrategy(PositionStrategy):
     def distance(self, a: Node, b: Node) -> int:
         return min((a.uid - b.uid) % self.max_id, (b.uid - a.uid) % self.max_id)
 
+    def distances(self, raw: RawNetwork, a: Node, candidates: np.array) -> np.array:
+        uids = raw.node_arrays['uid'][candidates]
+        return np.minimum((a.uid - uids) % self.max_id, (uids - a.uid) % self.max_id)
+
     @property
     def plot_limits(self) -> Tuple[FloatRange, FloatRange]:
         return (-2, 2), (-2, 2)
@@ -1,7 +1,5 @@
 from typing import List, Callable
 
-import networkx as nx
-
 from raidensim.network.node import Node
 from raidensim.network.raw_network import RawNetwork
 from raidensim.strategy.fee_strategy import FeeStrategy
@@ -15,11 +13,8 @@ class GlobalRoutingStrategy(RoutingStrategy):
 
     def route(self, raw: RawNetwork, source: Node, target: Node, value: int) -> (Path, List[Path]):
         def edge_cost(u: Node, v: Node, e: dict):
-            if e['capacity'] > value:
+            if e['capacity'] > value and raw.is_active(u) and raw.is_active(v):
                 return self.fee_strategy.get_fee(u, v, e, value)
             return None
 
-        try:
-            return nx.dijkstra_path(raw, source, target, weight=edge_cost), []
-        except nx.NetworkXNoPath:
-            return [], []
+        return raw.cheapest_path(source, target, edge_cost), []
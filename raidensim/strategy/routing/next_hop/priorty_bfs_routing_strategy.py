@@ -43,8 +43,8 @@ class PriorityBFSRoutingStrategy(RoutingStrategy):
             if len(path_history) >= self.max_paths:
                 return [], path_history
 
-            for v, e in raw[u].items():
-                if v not in visited and e['capacity'] >= value:
+            for v, e in raw.eligible_partners(u, value):
+                if v not in visited:
                     new_path = path + [v]
                     priority = self.priority_strategy.priority(u, v, e, target, value)
                     i += 1
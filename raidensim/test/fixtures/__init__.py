@@ -1,3 +1,4 @@
 from .network import (
-    network_2_nodes
+    network_2_nodes,
+    kademlia_network
 )
@@ -2,8 +2,11 @@ import pytest
 
 from raidensim.network.network import Network
 from raidensim.network.config import NetworkConfiguration
-from raidensim.network.dist import Distribution
-from raidensim.strategy.creation.join_strategy import SimpleJoinStrategy
+from raidensim.network.dist import Distribution, BetaDistribution
+from raidensim.strategy.creation.join_strategy import (
+    SimpleJoinStrategy,
+    RaidenKademliaJoinStrategy
+)
 from raidensim.strategy.position_strategy import RingPositionStrategy
 
 
@@ -35,3 +38,22 @@ def network_2_nodes() -> Network:
     )
     return Network(config)
 
+
+def kademlia_network(num_nodes: int, seed: int = 0) -> Network:
+    max_id = 2**32
+    config = NetworkConfiguration(
+        num_nodes=num_nodes,
+        max_id=max_id,
+        fullness_dist=BetaDistribution(0.5, 2),
+        position_strategy=RingPositionStrategy(max_id),
+        join_strategy=RaidenKademliaJoinStrategy(
+            max_id=max_id,
+            min_partner_deposit=0.2,
+            kademlia_bucket_limits=(25, 30),
+            max_initiated_channels=(1, 12),
+            max_accepted_channels=(5, 20),
+            deposit=(5, 40)
+        ),
+        seed=seed
+    )
+    return Network(config)
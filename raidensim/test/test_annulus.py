@@ -1,7 +1,14 @@
 import pytest
 
+import numpy as np
+
 from raidensim.network.annulus import Annulus
+from raidensim.network.config import NetworkConfiguration
+from raidensim.network.dist import ConstantDistribution
+from raidensim.network.network import Network
 from raidensim.network.node import Node
+from raidensim.strategy.creation.join_strategy import FullAnnulusJoinStrategy
+from raidensim.strategy.position_strategy import AnnulusPositionStrategy
 from raidensim.strategy.routing.next_hop.priority_strategy import AnnulusPriorityStrategy
 from raidensim.types import DiskCoord
 
@@ -383,3 +390,28 @@ def test_priority_strategy():
 
     assert priority_strategy.priority(None, nodes[6, 60], {}, nodes[7, 114], 0) == (1, 17, 2)
     assert priority_strategy.priority(None, nodes[8, 233], {}, nodes[7, 114], 0) == (1, 17, 1)
+
+
+def test_full_annulus_bulk():
+    for max_ring, num_nodes in [(4, 20), (7, 100), (8, 480)]:
+        nets = []
+        for bulk in [False, True]:
+            annulus = Annulus(max_ring)
+            config = NetworkConfiguration(
+                num_nodes=num_nodes,
+                max_id=2**32,
+                fullness_dist=ConstantDistribution(1),
+                position_strategy=AnnulusPositionStrategy(annulus),
+                join_strategy=FullAnnulusJoinStrategy(annulus)
+            )
+            nets.append(Network(config, bulk=bulk))
+
+        incremental, bulk = nets
+        assert list(incremental.raw.nodes) == list(bulk.raw.nodes)
+        assert list(incremental.raw.edges(data=True)) == list(bulk.raw.edges(data=True))
+        for a, b in zip(incremental.raw.nodes, bulk.raw.nodes):
+            assert dict(a) == dict(b)
+            assert np.array_equal(
+                incremental.config.join_strategy.annulus.node_to_coord[a],
+                bulk.config.join_strategy.annulus.node_to_coord[b]
+            )
@@ -0,0 +1,48 @@
+import numpy as np
+
+from raidensim.network.config import NetworkConfiguration
+from raidensim.network.dist import BetaDistribution
+from raidensim.network.lattice import WovenLattice
+from raidensim.network.network import Network
+from raidensim.strategy.creation.join_strategy import RaidenLatticeJoinStrategy
+from raidensim.strategy.position_strategy import LatticePositionStrategy
+
+
+def test_capacity_index():
+    lattice = WovenLattice(num_dims=2, weave_base_factor=2, min_order=1, max_order=3)
+    config = NetworkConfiguration(
+        num_nodes=100,
+        max_id=2**32,
+        fullness_dist=BetaDistribution(0.5, 2),
+        position_strategy=LatticePositionStrategy(lattice),
+        join_strategy=RaidenLatticeJoinStrategy(
+            lattice=lattice,
+            max_initiated_aux_channels=(2, 4),
+            max_accepted_aux_channels=(2, 4),
+            deposit=(10, 20)
+        )
+    )
+    raw = Network(config).raw
+    raw.index_capacities()
+    rng = np.random.default_rng(0)
+    nodes = list(raw.nodes)
+    for _ in range(500):
+        u = nodes[rng.integers(len(nodes))]
+        partners = list(raw[u])
+        v = partners[rng.integers(len(partners))]
+        if raw[u][v]['capacity'] >= 5:
+            raw.do_transfer([u, v], 5)
+    raw.freeze_nodes(nodes[:10])
+
+    for u in nodes[10:]:
+        for value in [0, 1, 7, 8, 16, 33]:
+            expected = {v for v, e in raw.active_partners(u) if e['capacity'] >= value}
+            assert {v for v, e in raw.eligible_partners(u, value)} == expected
+
+    # Values and capacities may be numpy integers, e.g. when replayed from a trace.
+    u = nodes[10]
+    v, e = next(raw.active_partners(u))
+    e['capacity'] = np.int64(e['capacity'])
+    raw.capacity_index.update_channel(u, v, e)
+    expected = {v for v, e in raw.active_partners(u) if e['capacity'] >= 7}
+    assert {v for v, e in raw.eligible_partners(u, np.int64(7))} == expected
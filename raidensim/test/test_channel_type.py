@@ -0,0 +1,31 @@
+from raidensim.network.channel_type import ChannelType
+from raidensim.network.config import NetworkConfiguration
+from raidensim.network.dist import BetaDistribution
+from raidensim.network.lattice import WovenLattice
+from raidensim.network.network import Network
+from raidensim.strategy.creation.join_strategy import RaidenLatticeJoinStrategy
+from raidensim.strategy.position_strategy import LatticePositionStrategy
+
+
+def test_lattice_channel_types():
+    lattice = WovenLattice(num_dims=2, weave_base_factor=2, min_order=1, max_order=3)
+    position_strategy = LatticePositionStrategy(lattice)
+    config = NetworkConfiguration(
+        num_nodes=100,
+        max_id=2**32,
+        fullness_dist=BetaDistribution(0.5, 2),
+        position_strategy=position_strategy,
+        join_strategy=RaidenLatticeJoinStrategy(
+            lattice=lattice,
+            max_initiated_aux_channels=(2, 4),
+            max_accepted_aux_channels=(2, 4),
+            deposit=(10, 20)
+        )
+    )
+    raw = Network(config).raw
+    lattice_channels = list(raw.active_edges(ChannelType.LATTICE))
+    aux_channels = list(raw.active_edges(ChannelType.AUX))
+    assert len(lattice_channels) + len(aux_channels) == raw.number_of_edges()
+    assert all(position_strategy.distance(u, v) == 1 for u, v, e in lattice_channels)
+    assert aux_channels
+    assert all(e['type'] == raw[v][u]['type'] for u, v, e in raw.edges(data=True))
@@ -0,0 +1,47 @@
+import numpy as np
+
+from raidensim.simulation.churn import ChurnScheduler
+from raidensim.test.fixtures import kademlia_network
+
+
+def test_churn_scheduler():
+    net = kademlia_network(200)
+    raw = net.raw
+    num_nodes = raw.number_of_nodes()
+    churn = ChurnScheduler(net, offline_rate=0.5, online_rate=0.25, join_rate=0.1)
+    for _ in range(100):
+        churn.step()
+
+    assert churn.num_offline > 0
+    assert churn.num_online > 0
+    assert churn.num_joined > 0
+    assert raw.number_of_nodes() == num_nodes + churn.num_joined
+    assert len(raw.frozen_nodes) == churn.num_offline - churn.num_online
+
+    # Incremental indexes agree with a full scan.
+    active_nodes = {node for node in raw.nodes if node not in raw.frozen_nodes}
+    assert set(raw.active_node_set) == active_nodes
+    assert set(raw.active_nodes) == active_nodes
+    assert len(raw.node_arrays.present_indices()) == raw.number_of_nodes()
+    present = raw.node_arrays.present_indices()
+    assert np.array_equal(
+        raw.node_arrays['num_outgoing_channels'][present],
+        [raw.out_degree(raw.node_arrays.nodes[index]) for index in present]
+    )
+
+
+def test_balanced_churn_rates():
+    net = kademlia_network(100)
+    num_active = len(net.raw.active_node_set)
+    churn = ChurnScheduler.balanced(net, 0.01, num_transfers=1000)
+    assert np.allclose(churn.rates, [num_active * 1e-5, num_active * 1e-5, 0])
+
+
+def test_churn_sample_distinct():
+    net = kademlia_network(200)
+    churn = ChurnScheduler(net)
+    nodes = net.raw.active_node_set
+    sample = churn._sample(nodes, 50)
+    assert len(set(sample)) == 50
+    assert all(node in nodes for node in sample)
+    assert set(churn._sample(nodes, len(nodes) + 10)) == set(nodes)
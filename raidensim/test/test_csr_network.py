@@ -0,0 +1,163 @@
+import os
+
+import numpy as np
+import pytest
+
+from raidensim.network.annulus import Annulus
+from raidensim.network.config import NetworkConfiguration
+from raidensim.network.csr_network import CsrNetwork
+from raidensim.network.dist import BetaDistribution
+from raidensim.network.hyperbolic_disk import HyperbolicDisk
+from raidensim.network.network import Network
+from raidensim.strategy.creation.join_strategy import (
+    FullAnnulusJoinStrategy,
+    HyperbolicDiskJoinStrategy
+)
+from raidensim.strategy.fee_strategy import ConstantFeeStrategy
+from raidensim.strategy.position_strategy import (
+    AnnulusPositionStrategy,
+    HyperbolicPositionStrategy,
+    RingPositionStrategy
+)
+from raidensim.strategy.routing.global_routing_strategy import GlobalRoutingStrategy
+from raidensim.strategy.routing.next_hop.greedy_routing_strategy import GreedyRoutingStrategy
+from raidensim.strategy.routing.next_hop.priority_strategy import DistancePriorityStrategy
+
+
+def configs():
+    annulus = Annulus(7)
+    yield NetworkConfiguration(
+        num_nodes=200,
+        max_id=2**32,
+        fullness_dist=BetaDistribution(0.5, 2),
+        position_strategy=AnnulusPositionStrategy(annulus),
+        join_strategy=FullAnnulusJoinStrategy(annulus)
+    )
+    disk = HyperbolicDisk((2, 9), 12)
+    yield NetworkConfiguration(
+        num_nodes=500,
+        max_id=2**32,
+        fullness_dist=BetaDistribution(0.5, 2),
+        position_strategy=HyperbolicPositionStrategy(disk),
+        join_strategy=HyperbolicDiskJoinStrategy(disk, (10, 20))
+    )
+
+
+def test_out_of_core_matches_bulk(tmpdir):
+    for k, (bulk_config, stream_config) in enumerate(zip(configs(), configs())):
+        bulk = Network(bulk_config, join_nodes=False)
+        bulk.join_nodes_bulk()
+        csr = Network(stream_config, join_nodes=False).join_nodes_out_of_core(
+            str(tmpdir.join(str(k))), chunk_size=64
+        )
+
+        raw = bulk.raw
+        nodes = raw.node_arrays.nodes
+        assert csr.uids.tolist() == [node.uid for node in nodes]
+        assert csr.fullness.tolist() == [node.fullness for node in nodes]
+        assert csr.num_edges == raw.number_of_edges()
+        for index, node in enumerate(nodes):
+            edges = csr.out_edges(index)
+            assert csr.targets[edges].tolist() == raw.node_arrays.indices(raw[node]).tolist()
+            assert csr.deposits[edges].tolist() == [e['deposit'] for e in raw[node].values()]
+        assert np.all(csr.targets[csr.reverse] == csr.edge_sources(np.arange(csr.num_edges)))
+
+
+def test_transfers(tmpdir):
+    config = next(configs())
+    csr = Network(config, join_nodes=False).join_nodes_out_of_core(str(tmpdir))
+    rng = np.random.default_rng(0)
+
+    path = csr.find_path(0, csr.num_nodes - 1, 10)
+    assert path[0] == 0 and path[-1] == csr.num_nodes - 1
+    edges = [csr.find_edge(u, v) for u, v in zip(path[:-1], path[1:])]
+    csr.do_transfer(path, 4)
+    assert csr.capacities(np.array(edges)).tolist() == [6] * len(edges)
+    assert csr.capacities(csr.reverse[edges]).tolist() == [14] * len(edges)
+
+    hops = csr.simulate_transfers(200, 5, rng)
+    assert np.all(hops != 0)
+    assert np.all(csr.capacities(np.arange(csr.num_edges)) >= 0)
+
+
+def test_rebuild_resets_balances(tmpdir):
+    directory = str(tmpdir)
+    config = next(configs())
+    csr = Network(config, join_nodes=False).join_nodes_out_of_core(directory)
+    csr.simulate_transfers(100, 1, np.random.default_rng(0))
+    assert np.any(csr.balances != 0)
+
+    # Same directory, different network.
+    num_edges = csr.num_edges
+    config = list(configs())[1]
+    csr = Network(config, join_nodes=False).join_nodes_out_of_core(directory)
+    assert csr.num_edges != num_edges
+    assert len(csr.balances) == csr.num_edges
+    assert not np.any(csr.balances)
+
+
+def test_mismatching_balances(tmpdir):
+    directory = str(tmpdir)
+    csr = Network(next(configs()), join_nodes=False).join_nodes_out_of_core(directory)
+    np.save(os.path.join(directory, 'balances.npy'), np.zeros(csr.num_edges + 1, dtype=np.int64))
+    with pytest.raises(ValueError):
+        CsrNetwork(directory)
+
+
+def test_stream_keeps_join_strategy_state(tmpdir):
+    disk_config = list(configs())[1]
+    Network(disk_config, join_nodes=False).join_nodes_out_of_core(str(tmpdir))
+    join_strategy = disk_config.join_strategy
+    assert not join_strategy.ring_fill
+
+    # The same strategy can still build a network afterwards, identical to a fresh one.
+    bulk = Network(disk_config, join_nodes=False)
+    bulk.join_nodes_bulk()
+    fresh = Network(list(configs())[1], join_nodes=False)
+    fresh.join_nodes_bulk()
+    def coords(net: Network):
+        disk = net.config.join_strategy.disk
+        return [tuple(np.ravel(disk.node_to_coord[node])) for node in net.raw.node_arrays.nodes]
+
+    assert coords(bulk) == coords(fresh)
+
+    with pytest.raises(ValueError):
+        join_strategy.build_stream(None, np.zeros(10))
+
+
+def test_channel_uids(tmpdir):
+    csr = Network(next(configs()), join_nodes=False).join_nodes_out_of_core(
+        str(tmpdir), chunk_size=64
+    )
+    edges = np.arange(csr.num_edges)
+    assert np.array_equal(csr.channel_uids[csr.reverse], csr.channel_uids)
+    assert np.array_equal(np.bincount(csr.channel_uids), np.full(csr.num_edges // 2, 2))
+    assert csr.edge_data(0)['uid'] == csr.channel_uids[0]
+    assert sorted(set(csr.channel_uids[edges].tolist())) == list(range(csr.num_edges // 2))
+
+
+def test_routing_strategies(tmpdir):
+    bulk_config, stream_config = next(configs()), next(configs())
+    bulk = Network(bulk_config, join_nodes=False)
+    bulk.join_nodes_bulk()
+    csr = Network(stream_config, join_nodes=False).join_nodes_out_of_core(str(tmpdir))
+    nodes = bulk.raw.node_arrays.nodes
+
+    # Global routing finds equally cheap paths on both representations.
+    routing_strategy = GlobalRoutingStrategy(ConstantFeeStrategy())
+    for source, target in [(0, csr.num_nodes - 1), (5, 17), (30, 2)]:
+        raw_path, _ = routing_strategy.route(bulk.raw, nodes[source], nodes[target], 1)
+        csr_path, _ = routing_strategy.route(csr, csr.node(source), csr.node(target), 1)
+        assert csr_path[0] == nodes[source] and csr_path[-1] == nodes[target]
+        assert len(csr_path) == len(raw_path)
+
+    # Next-hop routing with uid-based positions, including transfers.
+    position_strategy = RingPositionStrategy(2**32)
+    routing_strategy = GreedyRoutingStrategy(DistancePriorityStrategy(position_strategy))
+    hops = csr.simulate_transfers(100, 5, np.random.default_rng(0), routing_strategy)
+    assert np.any(hops > 0)
+    assert np.all(csr.capacities(np.arange(csr.num_edges)) >= 0)
+    source = csr.node(0)
+    for v, e in csr.eligible_partners(source, 5):
+        assert e['capacity'] >= 5
+        assert e == csr.get_edge_data(source, v)
@@ -0,0 +1,55 @@
+import pytest
+
+import numpy as np
+
+from raidensim.network.dist import (
+    ConstantDistribution,
+    UniformDistribution,
+    ParetoDistribution,
+    CircleDistribution,
+    BetaDistribution,
+    MicroRaidenDistribution
+)
+
+
+def test_sample_bounds():
+    dists = [
+        (ConstantDistribution(0.3), 0.3, 0.3),
+        (UniformDistribution(2, 5), 2, 5),
+        (ParetoDistribution(3, 1, 4), 1, 4),
+        (CircleDistribution(1, 3), 1, 3),
+        (BetaDistribution(0.5, 2), 0, 1),
+        (MicroRaidenDistribution(0.9, BetaDistribution(0.5, 2)), 0, 1)
+    ]
+    for dist, min_value, max_value in dists:
+        values = dist.sample(10000)
+        assert values.shape == (10000,)
+        assert np.all(values >= min_value)
+        assert np.all(values <= max_value)
+
+
+def test_sample_moments():
+    values = BetaDistribution(0.5, 2, 1, 3).sample(100000)
+    assert abs(values.mean() - (1 + 2 * 0.5 / 2.5)) < 0.01
+
+    # Quarter circle has mean 4 / (3 * pi).
+    values = CircleDistribution().sample(100000)
+    assert abs(values.mean() - 4 / (3 * np.pi)) < 0.01
+
+    values = MicroRaidenDistribution(0.9, ConstantDistribution(1)).sample(100000)
+    assert abs(np.count_nonzero(values == 0) / len(values) - 0.9) < 0.01
+    assert np.all((values == 0) | (values == 1))
+
+
+def test_random_buffer():
+    dist = BetaDistribution(0.5, 2)
+    num_values = dist.BUFFER_SIZE * 2 + 5
+    values = [dist.random() for _ in range(num_values)]
+    assert all(isinstance(value, float) for value in values)
+
+    dist.reset()
+    expected = np.concatenate([dist.sample(dist.BUFFER_SIZE) for _ in range(3)])
+    assert np.array_equal(values, expected[:num_values])
+
+    dist.reset()
+    assert dist.random() == values[0]
@@ -0,0 +1,25 @@
+from raidensim.network.channel_type import ChannelType
+from raidensim.simulation.churn import ChurnScheduler
+from raidensim.test.fixtures import kademlia_network
+
+
+def test_endpoint_sampler_under_churn():
+    net = kademlia_network(200)
+    raw = net.raw
+    value = 10
+
+    def valid(node):
+        return raw.is_active(node) and any(
+            e['capacity'] >= value and e['type'] & ChannelType.KADEMLIA
+            for v, e in raw.active_partners(node)
+        )
+
+    churn = ChurnScheduler(net, offline_rate=0.2, online_rate=0.1, join_rate=0.05)
+    for _ in range(200):
+        churn.step()
+        source, target = raw.get_available_nodes(value, ChannelType.KADEMLIA)
+        assert source != target
+        assert valid(source) and valid(target)
+        raw.do_transfer([source, next(v for v, e in raw.active_partners(source))], 1)
+
+    assert set(raw.endpoint_sampler.nodes) == {node for node in raw.nodes if valid(node)}
@@ -0,0 +1,101 @@
+import numpy as np
+
+from raidensim.network.config import NetworkConfiguration
+from raidensim.network.dist import BetaDistribution
+from raidensim.network.network import Network
+from raidensim.strategy.creation.filter_strategy import (
+    IdentityFilterStrategy,
+    NotConnectedFilterStrategy,
+    DistanceFilterStrategy,
+    FullerFilterStrategy,
+    MinIncomingDepositFilterStrategy,
+    MinMutualDepositFilterStrategy,
+    IncomingLimitsFilterStrategy,
+    AcceptedLimitsFilterStrategy,
+    TotalBidirectionalLimitsFilterStrategy,
+    KademliaFilterStrategy,
+    MicroRaidenServerFilterStrategy
+)
+from raidensim.strategy.creation.join_strategy import RaidenKademliaJoinStrategy, linear_int
+from raidensim.strategy.creation.selection_strategy import FirstMatchSelectionStrategy
+from raidensim.strategy.position_strategy import RingPositionStrategy
+
+
+def kademlia_network(max_id: int, position_strategy: RingPositionStrategy) -> Network:
+    config = NetworkConfiguration(
+        num_nodes=300,
+        max_id=max_id,
+        fullness_dist=BetaDistribution(0.5, 2),
+        position_strategy=position_strategy,
+        join_strategy=RaidenKademliaJoinStrategy(
+            max_id=max_id,
+            min_partner_deposit=0.2,
+            kademlia_bucket_limits=(25, 30),
+            max_initiated_channels=(1, 12),
+            max_accepted_channels=(5, 20),
+            deposit=(5, 40)
+        )
+    )
+    return Network(config)
+
+
+def test_masks_match_filters():
+    max_id = 2**32
+    position_strategy = RingPositionStrategy(max_id)
+    raw = kademlia_network(max_id, position_strategy).raw
+
+    def deposit_mapping(fullness):
+        return linear_int(5, 40, fullness)
+
+    def limit_mapping(fullness):
+        return linear_int(2, 10, fullness)
+
+    filter_strategies = [
+        IdentityFilterStrategy(),
+        NotConnectedFilterStrategy(),
+        DistanceFilterStrategy(position_strategy, max_id // 8),
+        FullerFilterStrategy(),
+        MinIncomingDepositFilterStrategy(deposit_mapping, 0.5),
+        MinMutualDepositFilterStrategy(deposit_mapping, 0.5),
+        IncomingLimitsFilterStrategy(limit_mapping),
+        AcceptedLimitsFilterStrategy(limit_mapping),
+        TotalBidirectionalLimitsFilterStrategy(limit_mapping),
+        KademliaFilterStrategy(position_strategy, (25, 30)),
+        MicroRaidenServerFilterStrategy()
+    ]
+
+    nodes = raw.node_arrays.nodes
+    present = raw.node_arrays.present_indices().tolist()
+    for a in [nodes[i] for i in present[::10]]:
+        # The Kademlia filter is undefined for a node and itself.
+        candidates = np.array([i for i in present if nodes[i] != a])
+        for filter_strategy in filter_strategies:
+            expected = [filter_strategy.filter(raw, a, nodes[i]) for i in candidates]
+            assert filter_strategy.mask(raw, a, candidates).tolist() == expected
+
+
+def test_adaptive_filter_order():
+    max_id = 2**32
+    position_strategy = RingPositionStrategy(max_id)
+    raw = kademlia_network(max_id, position_strategy).raw
+    filter_strategies = [
+        NotConnectedFilterStrategy(),
+        KademliaFilterStrategy(position_strategy, (25, 30)),
+        IdentityFilterStrategy(),
+        FullerFilterStrategy()
+    ]
+    fixed = FirstMatchSelectionStrategy(filter_strategies)
+    adaptive = FirstMatchSelectionStrategy(filter_strategies, adaptive_order=True)
+    adaptive.REORDER_INTERVAL = 1
+
+    candidates = raw.node_arrays.present_indices()
+    for i in candidates.tolist():
+        a = raw.node_arrays.nodes[i]
+        assert fixed.mask(raw, a, candidates).tolist() == \
+            adaptive.mask(raw, a, candidates).tolist()
+
+    assert adaptive.num_masks == len(candidates)
+    assert sum(stats.num_rejected for stats in adaptive.filter_stats) == \
+        sum(stats.num_rejected for stats in fixed.filter_stats)
+    costs = [stats.cost_per_rejection for stats in adaptive.filter_stats]
+    assert costs == sorted(costs)
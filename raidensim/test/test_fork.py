@@ -0,0 +1,59 @@
+import pytest
+
+from raidensim.simulation.churn import ChurnScheduler
+from raidensim.test.fixtures import kademlia_network
+
+
+def test_fork_revert():
+    net = kademlia_network(200)
+    raw = net.raw
+    raw.freeze_random_nodes(10)
+    stats = raw.track_stats()
+    baseline = {(u, v): dict(e) for u, v, e in raw.edges(data=True)}
+    baseline_stats = stats.snapshot()
+    baseline_frozen = set(raw.frozen_nodes)
+    fork = net.fork()
+
+    pairs = []
+    for run in range(2):
+        churn = ChurnScheduler(net, offline_rate=0.2, online_rate=0.2)
+        run_pairs = []
+        for _ in range(100):
+            churn.step()
+            source, target = raw.get_available_nodes(1)
+            run_pairs.append((source, target))
+            partner = next(v for v, e in raw.active_partners(source) if e['capacity'] >= 1)
+            raw.do_transfer([source, partner], 1)
+        pairs.append(run_pairs)
+        assert fork.num_touched_channels > 0
+        fork.revert()
+
+        assert fork.num_touched_channels == 0
+        assert {(u, v): e for u, v, e in raw.edges(data=True)} == baseline
+        assert set(raw.frozen_nodes) == baseline_frozen
+        assert stats.capacities == baseline_stats.capacities
+        assert stats.net_balances == baseline_stats.net_balances
+
+    assert pairs[0] == pairs[1]
+    fork.close()
+    assert raw.balance_journal is None
+
+
+def test_fork_revert_after_joins():
+    net = kademlia_network(200)
+    raw = net.raw
+    fork = net.fork()
+    churn = ChurnScheduler(net, offline_rate=0.2, online_rate=0.2, join_rate=0.1)
+    for _ in range(100):
+        churn.step()
+    assert churn.num_joined > 0
+    with pytest.raises(ValueError):
+        fork.revert()
+
+    # Without joins, reverting works as before.
+    fork = net.fork()
+    churn = ChurnScheduler(net, offline_rate=0.2, online_rate=0.2)
+    for _ in range(100):
+        churn.step()
+    fork.revert()
+    assert raw.number_of_nodes() == fork.num_nodes
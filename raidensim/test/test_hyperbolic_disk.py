@@ -3,7 +3,12 @@ import pytest
 
 import numpy as np
 
+from raidensim.network.config import NetworkConfiguration
+from raidensim.network.dist import BetaDistribution
 from raidensim.network.hyperbolic_disk import HyperbolicDisk
+from raidensim.network.network import Network
+from raidensim.strategy.creation.join_strategy import HyperbolicDiskJoinStrategy
+from raidensim.strategy.position_strategy import HyperbolicPositionStrategy
 
 
 def test_coord_to_polar():
@@ -116,3 +121,49 @@ def test_outer_partners():
 def test_partner_count():
     disk = HyperbolicDisk((0, 6), 16)
 
+
+
+def test_partner_ranges():
+    for rings, radius in [((0, 5), 1), ((0, 6), 3), ((2, 7), 5.5), ((0, 6), 16)]:
+        disk = HyperbolicDisk(rings, radius)
+        ring_range = np.arange(rings[0], rings[1] + 1)
+        coords = np.array([(r, i) for r in ring_range for i in range(2 ** r)])
+        los, his = disk.partner_ranges(coords, ring_range)
+        for coord, lo, hi in zip(coords, los, his):
+            for r, lo_r, hi_r in zip(ring_range, lo, hi):
+                in_range = {i % 2 ** r for i in range(lo_r, hi_r + 1)}
+                assert len(in_range) == max(0, hi_r - lo_r + 1)
+                expected = {
+                    i for i in range(2 ** r)
+                    if disk.coord_distance(coord, [r, i]) <= radius + 1e-9
+                }
+                assert in_range == expected
+
+            partners = [tuple(partner) for partner in disk.partner_coords(coord, rings)]
+            assert len(partners) == len(set(partners))
+            assert tuple(coord) not in partners
+            assert len(partners) == sum(max(0, h - l + 1) for l, h in zip(lo, hi)) - 1
+
+
+def test_join_strategy_bulk():
+    for rings, radius, num_nodes in [((0, 6), 4, 100), ((0, 8), 8, 400), ((2, 9), 12, 700)]:
+        nets = []
+        for bulk in [False, True]:
+            disk = HyperbolicDisk(rings, radius)
+            config = NetworkConfiguration(
+                num_nodes=num_nodes,
+                max_id=2**32,
+                fullness_dist=BetaDistribution(0.5, 2),
+                position_strategy=HyperbolicPositionStrategy(disk),
+                join_strategy=HyperbolicDiskJoinStrategy(disk, (10, 20))
+            )
+            nets.append(Network(config, bulk=bulk))
+
+        incremental, bulk = nets
+        assert list(incremental.raw.nodes) == list(bulk.raw.nodes)
+        assert list(incremental.raw.edges(data=True)) == list(bulk.raw.edges(data=True))
+        assert all(dict(a) == dict(b) for a, b in zip(incremental.raw.nodes, bulk.raw.nodes))
+
+        disk = bulk.config.join_strategy.disk
+        for u, v in bulk.raw.edges:
+            assert disk.node_distance(u, v) <= radius + 1e-9
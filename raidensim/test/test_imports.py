@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+# Import time budget of a headless simulation worker in seconds. Measured without interpreter
+# startup. Currently about 0.3 seconds, most of it spent in networkx and numpy.
+IMPORT_BUDGET = 1.0
+
+WORKER_MODULES = [
+    'raidensim.network.network',
+    'raidensim.simulation',
+    'raidensim.simulation.sweep',
+    'raidensim.simulation.replication',
+    'raidensim.strategy.creation.join_strategy',
+    'raidensim.strategy.routing.global_routing_strategy',
+    'raidensim.strategy.routing.next_hop.greedy_routing_strategy',
+    'raidensim.animation.animation_generator'
+]
+
+LAZY_MODULES = ['matplotlib', 'imageio', 'scipy']
+
+
+def measure_imports(modules):
+    """
+    Imports the given modules in a fresh interpreter. Returns the import time and all lazy modules
+    that were imported anyway.
+    """
+    script = (
+        'import importlib, sys, time\n'
+        'tic = time.perf_counter()\n'
+        'for module in sys.argv[1:]:\n'
+        '    importlib.import_module(module)\n'
+        'print(time.perf_counter() - tic)\n'
+        'print(" ".join(m for m in {} if m in sys.modules))\n'.format(LAZY_MODULES)
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script] + modules, check=True, stdout=subprocess.PIPE
+    ).stdout.decode().split('\n')
+    return float(output[0]), output[1].split()
+
+
+def test_lazy_imports():
+    assert measure_imports(WORKER_MODULES)[1] == []
+
+
+def test_import_budget():
+    # Best of three to be robust against a busy machine.
+    duration = min(measure_imports(WORKER_MODULES)[0] for _ in range(3))
+    assert duration < IMPORT_BUDGET
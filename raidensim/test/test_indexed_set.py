@@ -0,0 +1,16 @@
+import numpy as np
+
+from raidensim.network.indexed_set import IndexedSet
+
+
+def test_indexed_set():
+    items = IndexedSet(range(5))
+    items.discard(1)
+    items.discard(7)
+    items.add(3)
+    assert len(items) == 4
+    assert set(items) == {0, 2, 3, 4}
+    assert all(items[items.positions[item]] == item for item in items)
+
+    rng = np.random.default_rng(0)
+    assert {items.sample(rng) for _ in range(100)} == {0, 2, 3, 4}
@@ -2,7 +2,7 @@ import pytest
 
 import numpy as np
 
-from raidensim.network.lattice import Lattice
+from raidensim.network.lattice import Lattice, WovenLattice
 from raidensim.network.node import Node
 
 
@@ -86,3 +86,73 @@ def test_free_coords():
     lattice.add_node(nodes[6], [-1, -1])
 
     print('\n' + lattice.ascii)
+
+
+def test_fill_order():
+    lattice = Lattice()
+    nodes = [Node(i, 0) for i in range(10)]
+
+    #   OOOOX
+    # 0 XOOOO
+    #   0
+    lattice.add_node(nodes[0], [0, 0])
+    lattice.add_node(nodes[1], [4, 1])
+    assert len(lattice.gaps) == 8
+    assert len(lattice.free_boxes) == 2
+    assert list(lattice.gaps) == [(1, 0), (2, 0), (3, 0), (4, 0), (0, 1), (1, 1), (2, 1), (3, 1)]
+
+    lattice.add_node(nodes[2], [2, 0])
+    coords = []
+    for node in nodes[3:]:
+        coord = lattice.get_free_coord()
+        coords.append(tuple(coord))
+        lattice.add_node(node, coord)
+
+    assert coords == [(1, 0), (3, 0), (4, 0), (0, 1), (1, 1), (2, 1), (3, 1)]
+    assert len(lattice.gaps) == 0
+
+    # Exhausted boxes are dropped on the next query.
+    assert all(lattice.get_free_coord() == [0, -1])
+    assert not lattice.free_boxes
+
+
+def test_free_coords_large():
+    lattice = Lattice()
+    nodes = [Node(i, 0) for i in range(5000)]
+    for node in nodes:
+        lattice.add_node(node, lattice.get_free_coord())
+
+    assert len(lattice.coord_to_node) == len(nodes)
+    assert len(lattice.gaps) == np.prod(lattice.max - lattice.min + 1) - len(nodes)
+    assert len(lattice.row_bitmaps) <= lattice.max[1] - lattice.min[1] + 1
+
+
+def test_neighbor_indices():
+    lattice = WovenLattice(2, 1, 1, 2)
+    nodes = [Node(i, 0) for i in range(60)]
+    for node in nodes:
+        lattice.add_node(node, lattice.get_free_coord())
+
+    coords = np.array([lattice.node_to_coord[node] for node in nodes] + [[100, 100]])
+
+    neighbor_indices = lattice.neighbor_indices(coords)
+    assert neighbor_indices.shape == (len(coords), 4)
+    for coord, indices in zip(coords, neighbor_indices):
+        expected = [
+            lattice.coord_to_node.get(tuple(neighbor_coord))
+            for neighbor_coord in lattice.neighbor_coords(coord)
+        ]
+        actual = [lattice.index_to_node[index] if index >= 0 else None for index in indices]
+        assert actual == expected
+
+    aux_indices = lattice.aux_neighbor_indices(coords)
+    assert aux_indices.shape == (len(coords), 4)
+    for coord, indices in zip(coords, aux_indices):
+        hop_dim = sum(coord) % 2
+        expected = []
+        for distance in [2, -2, 4, -4]:
+            aux_coord = coord.copy()
+            aux_coord[hop_dim] += distance
+            expected.append(lattice.coord_to_node.get(tuple(aux_coord)))
+        actual = [lattice.index_to_node[index] if index >= 0 else None for index in indices]
+        assert actual == expected
@@ -0,0 +1,43 @@
+import math
+from collections import Counter
+
+from raidensim.simulation.churn import ChurnScheduler
+from raidensim.test.fixtures import kademlia_network
+
+
+def test_live_stats_under_churn():
+    net = kademlia_network(200)
+    raw = net.raw
+    stats = raw.track_stats()
+    churn = ChurnScheduler(net, offline_rate=0.2, online_rate=0.1, join_rate=0.05)
+    for _ in range(200):
+        churn.step()
+        source, target = raw.get_available_nodes(1)
+        partner = next(v for v, e in raw.active_partners(source) if e['capacity'] >= 1)
+        raw.do_transfer([source, partner], 1)
+
+    assert stats.capacities == Counter(e['capacity'] for u, v, e in raw.active_edges())
+    net_balances = [abs(e['net_balance']) for u, v, e in raw.active_bi_edges]
+    imbalances = [abs(e['imbalance']) for u, v, e in raw.active_bi_edges]
+    assert stats.net_balances == Counter(net_balances)
+    assert stats.imbalances == Counter(imbalances)
+    assert stats.num_channels_uni == len(list(raw.active_edges()))
+    assert stats.net_balance_sum_squares == sum(x ** 2 for x in net_balances)
+    assert stats.imbalance_sum_squares == sum(x ** 2 for x in imbalances)
+    assert math.isclose(
+        stats.net_balance_channel_stdev,
+        math.sqrt(sum(x ** 2 for x in net_balances) / len(net_balances))
+    )
+
+    snapshot = stats.snapshot()
+    raw.reset_channels()
+    assert stats.net_balances == Counter({0: len(net_balances)})
+    assert snapshot.net_balances == Counter(net_balances)
+
+
+def test_live_stats_without_channels():
+    raw = kademlia_network(50).raw
+    stats = raw.track_stats()
+    raw.freeze_nodes(list(raw.nodes))
+    assert stats.num_channels_uni == 0
+    assert math.isnan(stats.net_balance_channel_stdev)
@@ -51,3 +51,85 @@ def test_channel_attributes(network_2_nodes: Network):
     assert ba['net_balance'] == 1
     assert ba['capacity'] == 19
     assert ba['imbalance'] == -3
+
+
+def test_random_streams():
+    from raidensim.network.random_streams import RandomStreams
+    a, b, c = RandomStreams(1), RandomStreams(1), RandomStreams(2)
+    assert a.uid.integers(2**32, size=8).tolist() == b.uid.integers(2**32, size=8).tolist()
+    assert a.join.integers(2**32) != c.join.integers(2**32)
+
+    # Streams are independent: consuming one component does not shift another.
+    b.freeze.random(100)
+    assert a.transfer.integers(2**32, size=8).tolist() == \
+        b.transfer.integers(2**32, size=8).tolist()
+
+    a.reset('transfer')
+    first = a.transfer.random()
+    a.reset('transfer')
+    assert a.transfer.random() == first
+
+
+def test_sample_node_pair(network_2_nodes: Network):
+    raw = network_2_nodes.raw
+    nodes = list(raw.nodes)
+    for _ in range(10):
+        source, target = raw.sample_node_pair(nodes)
+        assert source != target
+
+
+def test_node_arrays_mapped(network_2_nodes: Network):
+    arrays = network_2_nodes.raw.node_arrays
+    calls = []
+
+    def mapping(fullness):
+        calls.append(fullness)
+        return int(fullness * 10) + 1
+
+    assert sorted(arrays.mapped(mapping).tolist()) == [1, 11]
+    assert arrays.mapped(mapping).dtype.kind == 'i'
+    assert len(calls) == 2
+
+    from raidensim.network.node import Node
+    node = Node(3, 0.5)
+    network_2_nodes.raw.add_node(node)
+    assert arrays.value(mapping, node) == 6
+    arrays.mapped(mapping)
+    assert len(calls) == 3
+
+
+def test_freeze_nodes(network_2_nodes: Network):
+    raw = network_2_nodes.raw
+    a = next(node for node in raw.nodes if node.fullness == 0)
+    b = next(node for node in raw.nodes if node.fullness == 1)
+    ab = raw[a][b]
+
+    raw.freeze_nodes([b])
+    assert not raw.is_active(b)
+    assert raw.active_nodes == [a]
+    assert list(raw.active_edges()) == []
+    assert list(raw.active_partners(a)) == []
+    assert raw.number_of_edges() == 2
+
+    raw.unfreeze_nodes()
+    assert raw.is_active(b)
+    assert raw[a][b] is ab
+    assert list(raw.active_partners(a)) == [(b, ab)]
+
+    raw.freeze_random_nodes(1)
+    assert len(raw.active_nodes) == 1
+    assert len(raw.frozen_nodes) == 1
+
+
+def test_active_node_set(network_2_nodes: Network):
+    raw = network_2_nodes.raw
+    a = next(node for node in raw.nodes if node.fullness == 0)
+    b = next(node for node in raw.nodes if node.fullness == 1)
+    assert set(raw.active_node_set) == {a, b}
+
+    raw.freeze_nodes([a])
+    assert set(raw.active_node_set) == {b}
+    raw.remove_node(a)
+    assert a not in raw.frozen_nodes
+    raw.add_node(a)
+    assert set(raw.active_node_set) == {a, b}
@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+
+from raidensim.simulation.replication import (
+    RunningMean,
+    ReplicationStats,
+    t_quantile,
+    wilson_interval,
+    replicate
+)
+from raidensim.strategy.fee_strategy import SigmoidNetBalanceFeeStrategy
+from raidensim.strategy.routing.next_hop.greedy_routing_strategy import GreedyRoutingStrategy
+from raidensim.strategy.routing.next_hop.priority_strategy import DistancePriorityStrategy
+from raidensim.test.fixtures import kademlia_network
+
+
+def seeded_network(seed: int):
+    return kademlia_network(100, seed)
+
+
+def build_strategies(config):
+    return SigmoidNetBalanceFeeStrategy(), GreedyRoutingStrategy(
+        DistancePriorityStrategy(config.position_strategy)
+    )
+
+
+def test_running_mean():
+    values = np.random.default_rng(0).normal(3, 2, 1000)
+    running = RunningMean()
+    for batch in np.array_split(values, 7):
+        running.add(batch)
+    assert running.count == 1000
+    assert math.isclose(running.mean, values.mean())
+    assert math.isclose(running.variance, values.var(ddof=1))
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(0, 100, 1.96)
+    assert low == 0 and 0 < high < 0.05
+    low, high = wilson_interval(50, 100, 1.96)
+    assert math.isclose(low + high, 1)
+    assert math.isclose(high - low, 2 * 0.0962, abs_tol=1e-3)
+    assert wilson_interval(0, 0, 1.96) == (0.0, 1.0)
+
+
+def test_t_quantile():
+    for dof, expected in [(1, 12.706), (2, 4.303), (3, 3.182), (4, 2.776), (9, 2.262), (30, 2.042)]:
+        assert math.isclose(t_quantile(0.95, dof), expected, rel_tol=0.01)
+
+
+def test_replication_samples():
+    # Precision depends on the spread between replications, not on the number of transfers.
+    stats = ReplicationStats()
+    for success_rate in [0.5, 0.9, 0.6, 0.8]:
+        stats.add({
+            'num_transfers': 100000,
+            'num_successful': int(success_rate * 100000),
+            'success_rate': success_rate,
+            'mean_hops': 4.0
+        })
+    assert math.isclose(stats.success_rates.mean, 0.7)
+    assert stats.success_half_width > 0.1
+    assert not stats.is_precise(0.01, 1)
+    pooled_low, pooled_high = stats.pooled_success_interval
+    assert pooled_high - pooled_low < 0.01
+    assert stats.hops_half_width == 0
+
+
+def test_replicate_stops_early():
+    stats, outcomes = replicate(
+        seeded_network,
+        build_strategies,
+        num_transfers=30,
+        transfer_value=1,
+        success_precision=0.5,
+        hops_precision=10,
+        max_replications=20,
+        max_workers=2
+    )
+    assert 4 <= stats.num_replications < 20
+    assert len(outcomes) == stats.num_replications
+    assert stats.num_transfers == 30 * stats.num_replications
+    low, high = stats.success_interval
+    assert low <= stats.summary()['success_rate'] <= high
+
+
+def test_replicate_max_replications():
+    stats, outcomes = replicate(
+        seeded_network,
+        build_strategies,
+        num_transfers=30,
+        transfer_value=1,
+        success_precision=0,
+        hops_precision=0,
+        max_replications=3,
+        max_workers=2
+    )
+    assert [outcome['seed'] for outcome in outcomes] == [0, 1, 2]
+    # Independent seeds give different networks and transfers.
+    assert len({outcome['mean_hops'] for outcome in outcomes}) == 3
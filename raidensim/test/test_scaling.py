@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from raidensim.network.network import Network
+from raidensim.simulation.scaling import simulate_transfers, simulate_scaling, load_results
+from raidensim.simulation.transfer_log import TransferLog
+from raidensim.strategy.fee_strategy import SigmoidNetBalanceFeeStrategy
+from raidensim.strategy.routing.next_hop.greedy_routing_strategy import GreedyRoutingStrategy
+from raidensim.strategy.routing.next_hop.priority_strategy import DistancePriorityStrategy
+from raidensim.test.fixtures import kademlia_network
+
+
+def run_transfers(num_transfers: int, net: Network = None, **kwargs):
+    if net is None:
+        net = kademlia_network(200)
+    position_strategy = net.config.position_strategy
+    routing_strategy = GreedyRoutingStrategy(DistancePriorityStrategy(position_strategy))
+    stats = simulate_transfers(
+        net.raw,
+        num_transfers,
+        1,
+        position_strategy,
+        routing_strategy,
+        SigmoidNetBalanceFeeStrategy(),
+        True,
+        0,
+        'test',
+        **kwargs
+    )
+    return net, stats
+
+
+def test_checkpoints():
+    net, stats = run_transfers(250, checkpoint_interval=100)
+    checkpoints = stats.checkpoints
+    assert checkpoints['transfer'].tolist() == [100, 200]
+
+    failed = np.flatnonzero(~stats.records['success'])
+    assert checkpoints['failure_rate'][0] == np.count_nonzero(failed < 100) / 100
+    assert np.all(checkpoints['mean_hops'] >= 1)
+
+    live_stats = net.raw.live_stats
+    assert checkpoints['depleted_fraction'][-1] <= 1
+    assert live_stats.num_depleted_channels == sum(
+        1 for u, v, e in net.raw.active_edges() if e['capacity'] == 0
+    )
+
+
+def test_transfer_log(tmpdir):
+    path = str(tmpdir.join('transfers.bin'))
+    net, stats = run_transfers(300, log_path=path)
+    records = TransferLog.load(path)
+    assert len(records) == 300
+    assert np.array_equal(records, stats.records)
+
+    success = records['success']
+    assert stats.num_failed == np.count_nonzero(~success)
+    assert stats.avg_transfer_hops == records['hops'][success].mean()
+    assert np.all(records['hops'][~success] == 0)
+    assert np.all(records['source'] != records['target'])
+    nodes = net.raw.node_arrays.nodes
+    assert all(nodes[i] in net.raw for i in records['source'].tolist())
+
+
+def test_transfer_log_chunks(tmpdir):
+    path = str(tmpdir.join('transfers.bin'))
+    log = TransferLog(path, chunk_size=4)
+    for i in range(10):
+        log.append(i, i + 1, i % 2 == 0, False, i, 0.5 * i, 1.0, 2, 0.1)
+    assert log.num_flushed == 8
+    assert len(log) == 10
+    records = log.records()
+    assert records['source'].tolist() == list(range(10))
+    assert records['success'].tolist() == [i % 2 == 0 for i in range(10)]
+
+
+def run_headless(out_dir: str):
+    net = kademlia_network(200)
+    position_strategy = net.config.position_strategy
+    dirpath = simulate_scaling(
+        net,
+        out_dir,
+        num_transfers=200,
+        transfer_value=1,
+        fee_strategy=SigmoidNetBalanceFeeStrategy(),
+        position_strategy=position_strategy,
+        routing_strategy=GreedyRoutingStrategy(DistancePriorityStrategy(position_strategy)),
+        name='headless',
+        max_recorded_failures=1,
+        checkpoint_interval=50,
+        headless=True
+    )
+    return net, dirpath
+
+
+def test_headless_results(tmpdir):
+    net, dirpath = run_headless(str(tmpdir))
+    assert sorted(os.listdir(dirpath)) == [
+        'checkpoints.npy', 'layout.npz', 'summary.json', 'transfers.bin'
+    ]
+
+    results = load_results(dirpath)
+    live_stats = net.raw.live_stats
+    post_stats = results['post_stats']
+    assert post_stats.capacities == live_stats.capacities
+    assert post_stats.net_balance_stdev == live_stats.net_balance_stdev
+    assert results['sim_stats'].num_transfers == 200
+    assert len(results['checkpoints']) == 4
+
+    layout = results['layout']
+    assert len(layout['channels']) == live_stats.num_channels_uni
+    assert len(layout['active_nodes']) == len(net.raw.active_nodes)
+
+
+def test_headless_without_matplotlib(tmpdir):
+    script = (
+        'import sys\n'
+        'from raidensim.test.test_scaling import run_headless\n'
+        'run_headless(sys.argv[1])\n'
+        'assert "matplotlib" not in sys.modules\n'
+    )
+    subprocess.run([sys.executable, '-c', script, str(tmpdir)], check=True)
@@ -0,0 +1,74 @@
+import csv
+import os
+
+from raidensim.simulation.sweep import grid, run_sweep
+from raidensim.strategy.fee_strategy import SigmoidNetBalanceFeeStrategy
+from raidensim.strategy.routing.next_hop.greedy_routing_strategy import GreedyRoutingStrategy
+from raidensim.strategy.routing.next_hop.priority_strategy import (
+    DistancePriorityStrategy,
+    DistanceFeePriorityStrategy
+)
+from raidensim.test.fixtures import kademlia_network
+
+
+def build_network(num_nodes: int):
+    return kademlia_network(num_nodes)
+
+
+def build_strategies(config, routing: str, fee_weight: float):
+    fee_strategy = SigmoidNetBalanceFeeStrategy()
+    if routing == 'distance':
+        priority_strategy = DistancePriorityStrategy(config.position_strategy)
+    else:
+        priority_strategy = DistanceFeePriorityStrategy(
+            config.position_strategy, fee_strategy, (1.0, fee_weight)
+        )
+    return fee_strategy, GreedyRoutingStrategy(priority_strategy)
+
+
+def test_grid():
+    points = grid({'b': [1, 2], 'a': ['x']})
+    assert points == [{'a': 'x', 'b': 1}, {'a': 'x', 'b': 2}]
+    assert grid({}) == [{}]
+
+
+def test_sweep(tmpdir):
+    out_dir = str(tmpdir)
+    rows = run_sweep(
+        build_network,
+        build_strategies,
+        {'num_nodes': [100, 150]},
+        {'routing': ['distance', 'fee'], 'fee_weight': [0.1]},
+        num_transfers=50,
+        transfer_value=1,
+        out_dir=out_dir,
+        max_workers=2
+    )
+    assert len(rows) == 4
+    assert [(row['num_nodes'], row['routing']) for row in rows] == [
+        (100, 'distance'), (100, 'fee'), (150, 'distance'), (150, 'fee')
+    ]
+    assert all(row['num_transfers'] == 50 for row in rows)
+
+    with open(os.path.join(out_dir, 'results.csv')) as f:
+        table = list(csv.DictReader(f))
+    assert len(table) == 4
+    assert table[0]['num_nodes'] == '100'
+    assert float(table[0]['failure_rate']) == rows[0]['failure_rate']
+
+
+def test_sweep_replays_same_baseline(tmpdir):
+    # The same routing twice on one build must give identical results after reverting.
+    rows = run_sweep(
+        build_network,
+        build_strategies,
+        {'num_nodes': [100]},
+        {'routing': ['distance', 'distance'], 'fee_weight': [0.1]},
+        num_transfers=50,
+        transfer_value=1,
+        out_dir=str(tmpdir),
+        max_workers=1,
+        memory_budget=0
+    )
+    assert rows[0]['num_failed'] == rows[1]['num_failed']
+    assert rows[0]['avg_transfer_hops'] == rows[1]['avg_transfer_hops']
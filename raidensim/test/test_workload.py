@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from raidensim.network.channel_type import ChannelType
+from raidensim.network.dist import ParetoDistribution
+
+from raidensim.simulation.workload import (
+    generate_trace,
+    UniformWorkload,
+    ZipfWorkload,
+    LocalityWorkload,
+    BurstyWorkload
+)
+from raidensim.test.fixtures import kademlia_network
+from raidensim.test.test_scaling import run_transfers
+
+
+def test_workload_endpoints():
+    rng = np.random.default_rng(0)
+    uids = rng.permutation(1000)
+    for workload in [UniformWorkload(), ZipfWorkload(1.2), LocalityWorkload(5)]:
+        sources, targets = workload.endpoints(uids, 10000, rng)
+        assert np.all(sources != targets)
+        assert sources.min() >= 0 and sources.max() < 1000
+        assert targets.min() >= 0 and targets.max() < 1000
+
+    sources, targets = ZipfWorkload(1.2).endpoints(uids, 10000, rng)
+    assert np.bincount(sources).max() > 1000
+
+    sources, targets = LocalityWorkload(5).endpoints(uids, 10000, rng)
+    uid_distances = np.abs(uids[sources] - uids[targets])
+    uid_distances = np.minimum(uid_distances, 1000 - uid_distances)
+    assert np.median(uid_distances) <= 5
+
+
+def test_bursty_timestamps():
+    rng = np.random.default_rng(0)
+    workload = BurstyWorkload(UniformWorkload(), burst_factor=50)
+    timestamps = workload.timestamps(10000, rng)
+    assert len(timestamps) == 10000
+    gaps = np.diff(timestamps)
+    assert np.all(gaps >= 0)
+    # Burst arrivals are much denser than quiet ones.
+    assert np.percentile(gaps, 90) > 10 * np.percentile(gaps, 25)
+
+
+def test_trace_replay(tmpdir):
+    path = str(tmpdir.join('trace.npy'))
+    net = kademlia_network(200)
+    trace = generate_trace(net, ZipfWorkload(), 100, 1, path)
+    assert len(trace) == 100
+    assert np.all(np.diff(trace['timestamp']) > 0)
+
+    logs = []
+    for _ in range(2):
+        net, stats = run_transfers(100, trace=trace)
+        logs.append(stats.records)
+    for column in ['source', 'target', 'success', 'hops']:
+        assert np.array_equal(logs[0][column], logs[1][column])
+    assert np.array_equal(logs[0]['source'], trace['source'])
+
+
+def test_trace_skips_unavailable_endpoints(tmpdir):
+    net = kademlia_network(200)
+    trace = generate_trace(net, UniformWorkload(), 200, 1, str(tmpdir.join('trace.npy')))
+    nodes = net.raw.node_arrays.nodes
+    frozen = {nodes[i] for i in np.unique(trace['source'][:20]).tolist()}
+    net.raw.freeze_nodes(frozen)
+
+    net, stats = run_transfers(200, net=net, trace=trace, checkpoint_interval=100)
+    records = stats.records
+    skipped = records['skipped']
+    assert np.all(skipped[:20])
+    assert not np.any(records['success'][skipped])
+    assert stats.num_skipped == np.count_nonzero(skipped)
+    assert stats.num_failed == np.count_nonzero(~records['success'] & ~skipped)
+    summary = stats.summary()
+    assert summary['failure_rate'] == stats.num_failed / (200 - stats.num_skipped)
+    assert stats.checkpoints['failure_rate'][0] == (
+        np.count_nonzero(~records['success'][:100] & ~skipped[:100]) /
+        np.count_nonzero(~skipped[:100])
+    )
+
+
+def test_trace_value_distribution(tmpdir):
+    net = kademlia_network(200)
+    values = ParetoDistribution(2, 1, 20)
+    trace = generate_trace(net, UniformWorkload(), 1000, values, str(tmpdir.join('trace.npy')))
+    assert trace['value'].min() >= 1
+    assert trace['value'].max() <= 20
+    assert len(np.unique(trace['value'])) > 1
+
+    net, stats = run_transfers(1000, trace=trace, index_capacities=True)
+    assert np.all(stats.records['source'] == trace['source'])
+
+
+def test_trace_keeps_transfer_stream(tmpdir):
+    net = kademlia_network(200)
+    state = net.streams.transfer.bit_generator.state
+    generate_trace(net, UniformWorkload(), 100, 1, str(tmpdir.join('trace.npy')))
+    assert net.streams.transfer.bit_generator.state == state
+    assert net.raw.endpoint_sampler.matches(net.raw, 1, ChannelType.ALL)
+
+
+def test_trace_without_endpoints(tmpdir):
+    net = kademlia_network(200)
+    with pytest.raises(ValueError):
+        generate_trace(net, UniformWorkload(), 100, 1000, str(tmpdir.join('trace.npy')))
@@ -1,7 +1,5 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import sys
-from scipy import interpolate
 
 
 class CurveEditor(object):
@@ -23,6 +21,9 @@ class CurveEditor(object):
         self.ymin = ymin
         self.ymax = ymax
 
+        # Imported on first use so that importing the animation generator stays cheap.
+        import matplotlib.pyplot as plt
+
         fig = plt.figure()
         fig.suptitle(title)
         self.ax = fig.add_subplot(111)
@@ -31,6 +32,8 @@ class CurveEditor(object):
         self.draw()
 
     def draw(self):
+        import matplotlib.pyplot as plt
+
         self.ax.cla()
         if self.points:
             x, y = np.array(self.points).transpose()
@@ -66,6 +69,8 @@ class CurveEditor(object):
             x = np.append(x, [1])
             y = np.append(y, [1])
 
+        from scipy import interpolate
+
         curve = interpolate.InterpolatedUnivariateSpline(x, y, k=min(3, len(x) - 1))
         return np.clip(curve(x_eval), 0, 1)
 